@@ -0,0 +1,606 @@
+"""Synthetic dataset generator for benchmarks
+
+Generates VisionAI/COCO/YOLO/KITTI/BDD+ datasets of configurable size, the
+generated VisionAI data is valid against the generated ontology so it can be
+used for both schema and ontology validation benchmarks.
+"""
+import json
+import os
+import random
+import uuid
+from typing import Dict, List, Optional, Tuple
+
+from PIL import Image
+
+CLASSES = ["car", "truck", "pedestrian", "cyclist", "bus", "van", "tram", "misc"]
+COLORS = ["red", "green", "blue", "white", "black"]
+SEGMENTATION_TAGS = ["background", "road", "vehicle", "people", "building"]
+BBOX_NAME = "bbox_shape"
+CUBOID_NAME = "cuboid_shape"
+IMAGE_EXT = ".jpg"
+LOCAL_CS = "iso8855-1"
+IDENTITY_4X4 = [float(row == col) for row in range(4) for col in range(4)]
+CAMERA_MATRIX_3X4 = [500.0, 0.0, 32.0, 0.0, 0.0, 500.0, 24.0, 0.0, 0.0, 0.0, 1.0, 0.0]
+KITTI_CALIB = "\n".join(
+    [
+        "P2: " + " ".join(map(str, CAMERA_MATRIX_3X4)),
+        "R0_rect: 1.0 0.0 0.0 0.0 1.0 0.0 0.0 0.0 1.0",
+        "Tr_velo_to_cam: 0.0 -1.0 0.0 0.0 0.0 0.0 -1.0 0.0 1.0 0.0 0.0 0.0",
+    ]
+)
+
+
+def _frame_key(frame_idx: int) -> str:
+    return f"{frame_idx:012d}"
+
+
+def _camera_names(n_cameras: int) -> List[str]:
+    return [f"camera{idx}" for idx in range(1, n_cameras + 1)]
+
+
+def _random_bbox(rng: random.Random, width: int, height: int) -> List[float]:
+    """[center x, center y, width, height] inside the image"""
+    w = rng.uniform(4, width / 4)
+    h = rng.uniform(4, height / 4)
+    return [
+        round(rng.uniform(w / 2, width - w / 2), 2),
+        round(rng.uniform(h / 2, height - h / 2), 2),
+        round(w, 2),
+        round(h, 2),
+    ]
+
+
+def _random_rle(rng: random.Random, width: int, height: int, n_classes: int) -> str:
+    """RLE mask with `#{count}V{class index}` runs covering the whole image"""
+    remaining = width * height
+    runs = []
+    while remaining:
+        count = min(remaining, rng.randint(1, max(1, width * 2)))
+        runs.append(f"#{count}V{rng.randrange(n_classes)}")
+        remaining -= count
+    return "".join(runs)
+
+
+def _attribute_names(n_attributes: int) -> List[Tuple[str, str]]:
+    """(name, type) of the generated bbox attributes, cycling text/num/boolean/vec"""
+    types = ["text", "num", "boolean", "vec"]
+    return [
+        (f"attr{idx}_{types[idx % 4]}", types[idx % 4]) for idx in range(n_attributes)
+    ]
+
+
+def _attribute_value(rng: random.Random, attr_type: str):
+    if attr_type == "text":
+        return rng.choice(COLORS)
+    if attr_type == "num":
+        return rng.randint(0, 100)
+    if attr_type == "boolean":
+        return rng.random() < 0.5
+    return [rng.choice(COLORS)]
+
+
+def generate_ontology(
+    n_cameras: int = 1,
+    n_lidars: int = 0,
+    n_attributes: int = 2,
+    rle: bool = False,
+) -> Dict:
+    """Ontology matching `generate_visionai` data with the same parameters"""
+    streams = {name: {"type": "camera"} for name in _camera_names(n_cameras)}
+    streams.update({f"lidar{idx}": {"type": "lidar"} for idx in range(1, n_lidars + 1)})
+    if rle:
+        return {
+            "objects": {"*segmentation_matrix": {}},
+            "tags": {tag: {} for tag in SEGMENTATION_TAGS},
+            "streams": streams,
+        }
+    attributes = {BBOX_NAME: {"type": "bbox", "value": None}}
+    if n_lidars:
+        attributes[CUBOID_NAME] = {"type": "cuboid", "value": None}
+    for attr_name, attr_type in _attribute_names(n_attributes):
+        attributes[attr_name] = {
+            "type": attr_type,
+            "value": COLORS if attr_type == "vec" else [],
+        }
+    return {
+        "objects": {cls: {"attributes": attributes} for cls in CLASSES},
+        "streams": streams,
+    }
+
+
+def generate_visionai(
+    n_frames: int = 10,
+    n_objects: int = 10,
+    n_attributes: int = 2,
+    n_cameras: int = 1,
+    n_lidars: int = 0,
+    rle: bool = False,
+    image_size: Tuple[int, int] = (64, 48),
+    uri_root: str = "",
+    sequence_name: str = "000000000000",
+    seed: int = 0,
+) -> Dict:
+    """Generate VisionAI data of a sequence
+
+    Parameters
+    ----------
+    n_frames : int, optional
+        number of frames, by default 10
+    n_objects : int, optional
+        number of objects per frame (tracked over the whole sequence), by default 10
+    n_attributes : int, optional
+        number of dynamic attributes on each bbox, by default 2
+    n_cameras : int, optional
+        number of camera sensors, by default 1
+    n_lidars : int, optional
+        number of lidar sensors, objects get a cuboid per lidar, by default 0
+    rle : bool, optional
+        generate semantic segmentation RLE masks instead of bboxes, by default False
+    image_size : Tuple[int, int], optional
+        image (width, height), by default (64, 48)
+    uri_root : str, optional
+        uri root of the sensor data, by default ""
+    sequence_name : str, optional
+        sequence folder name used in the uri, by default "000000000000"
+    seed : int, optional
+        random seed, by default 0
+
+    Returns
+    -------
+    Dict
+        VisionAI data
+    """
+    rng = random.Random(seed)
+    width, height = image_size
+    cameras = _camera_names(n_cameras)
+    lidars = [f"lidar{idx}" for idx in range(1, n_lidars + 1)]
+    attribute_names = _attribute_names(n_attributes)
+    frame_interval = [{"frame_start": 0, "frame_end": n_frames - 1}]
+
+    streams = {camera: {"type": "camera"} for camera in cameras}
+    streams.update({lidar: {"type": "lidar"} for lidar in lidars})
+    coordinate_systems = {}
+    if lidars:
+        # cameras need intrinsics to project the cuboids of lidar sensors
+        for camera in cameras:
+            streams[camera]["stream_properties"] = {
+                "intrinsics_pinhole": {
+                    "camera_matrix_3x4": CAMERA_MATRIX_3X4,
+                    "width_px": width,
+                    "height_px": height,
+                }
+            }
+        coordinate_systems[LOCAL_CS] = {
+            "type": "local_cs",
+            "parent": "",
+            "children": lidars,
+        }
+        for lidar in lidars:
+            coordinate_systems[lidar] = {
+                "type": "sensor_cs",
+                "parent": LOCAL_CS,
+                "children": cameras if lidar == lidars[0] else [],
+                "pose_wrt_parent": {"matrix4x4": IDENTITY_4X4},
+            }
+        for camera in cameras:
+            coordinate_systems[camera] = {
+                "type": "sensor_cs",
+                "parent": lidars[0],
+                "children": [],
+                "pose_wrt_parent": {"matrix4x4": IDENTITY_4X4},
+            }
+
+    object_ids = [str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(n_objects)]
+    objects = {}
+    if rle:
+        # a single segmentation matrix object holds the masks of all classes
+        object_ids = object_ids[:1] or [str(uuid.UUID(int=rng.getrandbits(128)))]
+        objects[object_ids[0]] = {
+            "name": "segment_mask",
+            "type": "*segmentation_matrix",
+            "frame_intervals": frame_interval,
+            "object_data_pointers": {
+                "semantic_mask": {"type": "binary", "frame_intervals": frame_interval}
+            },
+        }
+    else:
+        for idx, object_id in enumerate(object_ids):
+            cls = CLASSES[idx % len(CLASSES)]
+            pointers = {
+                BBOX_NAME: {
+                    "type": "bbox",
+                    "frame_intervals": frame_interval,
+                    "attributes": {name: type_ for name, type_ in attribute_names},
+                }
+            }
+            if lidars:
+                pointers[CUBOID_NAME] = {
+                    "type": "cuboid",
+                    "frame_intervals": frame_interval,
+                }
+            objects[object_id] = {
+                "name": f"{cls}{idx:03d}",
+                "type": cls,
+                "frame_intervals": frame_interval,
+                "object_data_pointers": pointers,
+            }
+
+    frames = {}
+    for frame_idx in range(n_frames):
+        frame_key = _frame_key(frame_idx)
+        frame_streams = {
+            sensor: {
+                "uri": os.path.join(
+                    uri_root,
+                    sequence_name,
+                    "data",
+                    sensor,
+                    frame_key + (IMAGE_EXT if sensor in cameras else ".pcd"),
+                )
+            }
+            for sensor in cameras + lidars
+        }
+        frame_objects = {}
+        for object_id in object_ids:
+            if rle:
+                object_data = {
+                    "binary": [
+                        {
+                            "name": "semantic_mask",
+                            "stream": camera,
+                            "encoding": "rle",
+                            "data_type": "",
+                            "val": _random_rle(
+                                rng, width, height, len(SEGMENTATION_TAGS)
+                            ),
+                        }
+                        for camera in cameras
+                    ]
+                }
+            else:
+                object_data = {"bbox": []}
+                for camera in cameras:
+                    bbox = {
+                        "name": BBOX_NAME,
+                        "stream": camera,
+                        "val": _random_bbox(rng, width, height),
+                    }
+                    if attribute_names:
+                        attributes = {}
+                        for attr_name, attr_type in attribute_names:
+                            attributes.setdefault(attr_type, []).append(
+                                {
+                                    "name": attr_name,
+                                    "val": _attribute_value(rng, attr_type),
+                                }
+                            )
+                        bbox["attributes"] = attributes
+                    object_data["bbox"].append(bbox)
+                if lidars:
+                    object_data["cuboid"] = [
+                        {
+                            "name": CUBOID_NAME,
+                            "stream": lidar,
+                            "val": [
+                                round(rng.uniform(-50, 50), 3),
+                                round(rng.uniform(-50, 50), 3),
+                                round(rng.uniform(-2, 2), 3),
+                                0.0,
+                                0.0,
+                                round(rng.uniform(-3.14, 3.14), 3),
+                                round(rng.uniform(1, 5), 3),
+                                round(rng.uniform(1, 3), 3),
+                                round(rng.uniform(1, 3), 3),
+                            ],
+                        }
+                        for lidar in lidars
+                    ]
+            frame_objects[object_id] = {"object_data": object_data}
+        frames[frame_key] = {
+            "objects": frame_objects,
+            "frame_properties": {"streams": frame_streams},
+        }
+
+    visionai = {
+        "frame_intervals": frame_interval,
+        "frames": frames,
+        "objects": objects,
+        "streams": streams,
+        "metadata": {"schema_version": "1.0.0"},
+    }
+    if coordinate_systems:
+        visionai["coordinate_systems"] = coordinate_systems
+    if rle:
+        visionai["tags"] = {
+            str(uuid.UUID(int=rng.getrandbits(128))): {
+                "ontology_uid": "",
+                "type": "semantic_segmentation_RLE",
+                "tag_data": {
+                    "vec": [{"name": "", "type": "values", "val": SEGMENTATION_TAGS}]
+                },
+            }
+        }
+    return {"visionai": visionai}
+
+
+def write_image(path: str, image_size: Tuple[int, int]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    Image.new("RGB", image_size, (128, 128, 128)).save(path)
+
+
+def write_visionai_dataset(
+    root: str,
+    n_sequences: int = 2,
+    n_frames: int = 10,
+    annotation_name: str = "groundtruth",
+    write_images: bool = True,
+    image_size: Tuple[int, int] = (64, 48),
+    seed: int = 0,
+    **kwargs,
+) -> List[str]:
+    """Write VisionAI dataset `{root}/{sequence}/annotations/{annotation_name}/visionai.json`
+    with sensor data under `{root}/{sequence}/data/{camera}/`
+
+    Returns
+    -------
+    List[str]
+        paths of the written visionai.json files
+    """
+    paths = []
+    for seq_idx in range(n_sequences):
+        sequence_name = _frame_key(seq_idx)
+        data = generate_visionai(
+            n_frames=n_frames,
+            sequence_name=sequence_name,
+            image_size=image_size,
+            seed=seed + seq_idx,
+            **kwargs,
+        )
+        folder = os.path.join(root, sequence_name, "annotations", annotation_name)
+        os.makedirs(folder, exist_ok=True)
+        path = os.path.join(folder, "visionai.json")
+        with open(path, "w") as f:
+            json.dump(data, f)
+        paths.append(path)
+        if not write_images:
+            continue
+        for frame in data["visionai"]["frames"].values():
+            for sensor, stream in frame["frame_properties"]["streams"].items():
+                if stream["uri"].endswith(IMAGE_EXT):
+                    write_image(
+                        os.path.join(root, *stream["uri"].split("/")[-4:]),
+                        image_size,
+                    )
+    return paths
+
+
+def write_coco_dataset(
+    root: str,
+    n_images: int = 10,
+    n_objects: int = 10,
+    image_size: Tuple[int, int] = (64, 48),
+    write_images: bool = True,
+    seed: int = 0,
+) -> str:
+    """Write COCO dataset `{root}/annotations/labels.json` with `{root}/images/`
+
+    Returns
+    -------
+    str
+        path of the COCO annotation file
+    """
+    rng = random.Random(seed)
+    width, height = image_size
+    images, annotations = [], []
+    for image_id in range(n_images):
+        file_name = os.path.join("images", f"{image_id:012d}{IMAGE_EXT}")
+        images.append(
+            {
+                "id": image_id,
+                "width": width,
+                "height": height,
+                "file_name": file_name,
+                "coco_url": "",
+            }
+        )
+        if write_images:
+            write_image(os.path.join(root, file_name), image_size)
+        for _ in range(n_objects):
+            center_x, center_y, w, h = _random_bbox(rng, width, height)
+            annotations.append(
+                {
+                    "id": len(annotations),
+                    "image_id": image_id,
+                    "category_id": rng.randrange(len(CLASSES)),
+                    "bbox": [center_x - w / 2, center_y - h / 2, w, h],
+                    "area": w * h,
+                    "iscrowd": 0,
+                }
+            )
+    coco = {
+        "info": {},
+        "licenses": [],
+        "categories": [{"id": idx, "name": cls} for idx, cls in enumerate(CLASSES)],
+        "images": images,
+        "annotations": annotations,
+    }
+    path = os.path.join(root, "annotations", "labels.json")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(coco, f)
+    return path
+
+
+def write_yolo_dataset(
+    root: str,
+    n_images: int = 10,
+    n_objects: int = 10,
+    image_size: Tuple[int, int] = (64, 48),
+    seed: int = 0,
+) -> str:
+    """Write YOLO dataset `{root}/images/`, `{root}/labels/` and `{root}/classes.txt`"""
+    rng = random.Random(seed)
+    width, height = image_size
+    os.makedirs(os.path.join(root, "labels"), exist_ok=True)
+    with open(os.path.join(root, "classes.txt"), "w") as f:
+        f.write("\n".join(CLASSES))
+    for image_idx in range(n_images):
+        name = f"{image_idx:012d}"
+        write_image(os.path.join(root, "images", name + IMAGE_EXT), image_size)
+        lines = []
+        for _ in range(n_objects):
+            center_x, center_y, w, h = _random_bbox(rng, width, height)
+            lines.append(
+                f"{rng.randrange(len(CLASSES))} {center_x / width:.6f} "
+                + f"{center_y / height:.6f} {w / width:.6f} {h / height:.6f}"
+            )
+        with open(os.path.join(root, "labels", name + ".txt"), "w") as f:
+            f.write("\n".join(lines))
+    return root
+
+
+def write_kitti_dataset(
+    root: str,
+    n_images: int = 10,
+    n_objects: int = 10,
+    image_size: Tuple[int, int] = (64, 48),
+    seed: int = 0,
+) -> str:
+    """Write KITTI dataset `{root}/data/`, `{root}/labels/`, `{root}/calib/`
+    and `{root}/pcd/` (the pcd files are placeholders)"""
+    rng = random.Random(seed)
+    width, height = image_size
+    for folder in ("labels", "calib", "pcd"):
+        os.makedirs(os.path.join(root, folder), exist_ok=True)
+    for image_idx in range(n_images):
+        name = f"{image_idx:06d}"
+        write_image(os.path.join(root, "data", name + IMAGE_EXT), image_size)
+        with open(os.path.join(root, "calib", name + ".txt"), "w") as f:
+            f.write(KITTI_CALIB)
+        with open(os.path.join(root, "pcd", name + ".pcd"), "wb") as f:
+            f.write(b"")
+        lines = []
+        for _ in range(n_objects):
+            center_x, center_y, w, h = _random_bbox(rng, width, height)
+            # type truncated occluded alpha left top right bottom h w l x y z rot_y
+            lines.append(
+                " ".join(
+                    str(v)
+                    for v in [
+                        rng.choice(CLASSES),
+                        0.0,
+                        0,
+                        0.0,
+                        round(center_x - w / 2, 2),
+                        round(center_y - h / 2, 2),
+                        round(center_x + w / 2, 2),
+                        round(center_y + h / 2, 2),
+                        round(rng.uniform(1, 3), 2),
+                        round(rng.uniform(1, 3), 2),
+                        round(rng.uniform(1, 5), 2),
+                        round(rng.uniform(-20, 20), 2),
+                        round(rng.uniform(-2, 2), 2),
+                        round(rng.uniform(5, 50), 2),
+                        round(rng.uniform(-3.14, 3.14), 2),
+                    ]
+                )
+            )
+        with open(os.path.join(root, "labels", name + ".txt"), "w") as f:
+            f.write("\n".join(lines))
+    return root
+
+
+def generate_bdd(
+    n_sequences: int = 2,
+    n_frames: int = 10,
+    n_objects: int = 10,
+    n_attributes: int = 2,
+    image_size: Tuple[int, int] = (64, 48),
+    storage: str = "storage",
+    dataset: str = "dataset",
+    seed: int = 0,
+) -> Dict:
+    """Generate BDD+ data with `n_objects` tracked box2d labels per frame"""
+    rng = random.Random(seed)
+    width, height = image_size
+    attribute_names = _attribute_names(n_attributes)
+    frame_list = []
+    for seq_idx in range(n_sequences):
+        object_ids = [
+            str(uuid.UUID(int=rng.getrandbits(128))) for _ in range(n_objects)
+        ]
+        for frame_idx in range(n_frames):
+            labels = []
+            for obj_idx, object_id in enumerate(object_ids):
+                center_x, center_y, w, h = _random_bbox(rng, width, height)
+                attributes = {"cameraIndex": 0, "INSTANCE_ID": obj_idx}
+                for attr_name, attr_type in attribute_names:
+                    attributes[attr_name] = _attribute_value(rng, attr_type)
+                labels.append(
+                    {
+                        "category": CLASSES[obj_idx % len(CLASSES)],
+                        "attributes": attributes,
+                        "box2d": {
+                            "x1": round(center_x - w / 2, 2),
+                            "y1": round(center_y - h / 2, 2),
+                            "x2": round(center_x + w / 2, 2),
+                            "y2": round(center_y + h / 2, 2),
+                        },
+                        "uuid": object_id,
+                    }
+                )
+            frame_list.append(
+                {
+                    "name": _frame_key(frame_idx) + IMAGE_EXT,
+                    "storage": storage,
+                    "dataset": dataset,
+                    "sequence": _frame_key(seq_idx),
+                    "labels": labels,
+                }
+            )
+    return {"frame_list": frame_list}
+
+
+def write_bdd_dataset(
+    root: str,
+    write_images: bool = True,
+    image_size: Tuple[int, int] = (64, 48),
+    **kwargs,
+) -> str:
+    """Write BDD+ file `{root}/bdd.json` with images under
+    `{root}/{storage}/{sequence}/{dataset}/{name}`
+
+    Returns
+    -------
+    str
+        path of the BDD+ file
+    """
+    data = generate_bdd(image_size=image_size, **kwargs)
+    if write_images:
+        for frame in data["frame_list"]:
+            write_image(
+                os.path.join(
+                    root,
+                    frame["storage"],
+                    frame["sequence"],
+                    frame["dataset"],
+                    frame["name"],
+                ),
+                image_size,
+            )
+    path = os.path.join(root, "bdd.json")
+    os.makedirs(root, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(data, f)
+    return path
+
+
+def dataset_size(path: str) -> Optional[int]:
+    """total size in bytes of a file or folder"""
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(
+        os.path.getsize(os.path.join(folder, file_name))
+        for folder, _, file_names in os.walk(path)
+        for file_name in file_names
+    )
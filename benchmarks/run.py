@@ -0,0 +1,412 @@
+"""Benchmark validators and converters on synthetic datasets
+
+Each scenario runs in a fresh process, so the reported peak RSS only contains
+the memory used by that scenario (input loading included).
+
+Usage:
+    pip install -e .
+    python benchmarks/run.py --frames 200 --objects 50
+    python benchmarks/run.py --scenario vai_model validate_with_ontology --repeat 5
+    python benchmarks/run.py --sequences 4 --output result.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from queue import Empty
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+import generator
+
+# scenario name -> (dataset name, unit of items, setup function)
+SCENARIOS: Dict[str, Tuple[str, str, Callable]] = {}
+
+
+class Context(NamedTuple):
+    args: argparse.Namespace
+    dataset_path: str
+    output_path: str
+
+    @property
+    def n_frames(self) -> int:
+        return self.args.sequences * self.args.frames
+
+
+def scenario(name: str, dataset: str, unit: str = "frames"):
+    """register setup function of a scenario, which returns the timed callable"""
+
+    def wrap(func):
+        SCENARIOS[name] = (dataset, unit, func)
+        return func
+
+    return wrap
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes on linux
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def _load_json(path: str) -> Dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+def _first_visionai(ctx: Context) -> str:
+    return os.path.join(
+        ctx.dataset_path, f"{0:012d}", "annotations", "groundtruth", "visionai.json"
+    )
+
+
+def _run_converter(ctx: Context, input_format: str, output_format: str, **kwargs):
+    from visionai_data_format.convert_dataset import DatasetConverter
+
+    def run():
+        shutil.rmtree(ctx.output_path, ignore_errors=True)
+        DatasetConverter.run(
+            input_format=input_format,
+            output_format=output_format,
+            image_annotation_type="2d_bounding_box",
+            output_dest_folder=ctx.output_path,
+            uri_root="",
+            camera_sensor_name="camera1",
+            copy_sensor_data=ctx.args.copy_sensor_data,
+            **kwargs,
+        )
+
+    return run
+
+
+@scenario("vai_model", dataset="visionai")
+def vai_model(ctx: Context) -> Tuple[Callable, int]:
+    from visionai_data_format.schemas.visionai_schema import VisionAIModel
+
+    data = _load_json(_first_visionai(ctx))
+    return lambda: VisionAIModel(**data), ctx.args.frames
+
+
+@scenario("vai_model_json", dataset="visionai")
+def vai_model_json(ctx: Context) -> Tuple[Callable, int]:
+    from visionai_data_format.utils.validator import validate_vai_json
+
+    with open(_first_visionai(ctx), "rb") as f:
+        content = f.read()
+    return lambda: validate_vai_json(content), ctx.args.frames
+
+
+@scenario("validate_with_ontology", dataset="visionai")
+def validate_with_ontology(ctx: Context) -> Tuple[Callable, int]:
+    from visionai_data_format.schemas.ontology import Ontology
+    from visionai_data_format.schemas.visionai_schema import VisionAIModel
+
+    model = VisionAIModel(**_load_json(_first_visionai(ctx)))
+    ontology = Ontology(
+        **_load_json(os.path.join(ctx.dataset_path, "ontology.json"))
+    ).model_dump(exclude_unset=True)
+
+    def run():
+        errors = model.validate_with_ontology(ontology=ontology)
+        assert not errors, errors
+        return errors
+
+    return run, ctx.args.frames
+
+
+@scenario("convert_vai_to_bdd", dataset="visionai")
+def convert_vai_to_bdd(ctx: Context) -> Tuple[Callable, int]:
+    from visionai_data_format.utils.converter import convert_vai_to_bdd
+
+    def run():
+        return convert_vai_to_bdd(
+            folder_name=ctx.dataset_path,
+            company_code=1,
+            storage_name="storage",
+            container_name="container",
+        )
+
+    return run, ctx.n_frames
+
+
+@scenario("vai_to_coco", dataset="visionai")
+def vai_to_coco(ctx: Context) -> Tuple[Callable, int]:
+    return (
+        _run_converter(ctx, "vision_ai", "coco", source_data_root=ctx.dataset_path),
+        ctx.n_frames,
+    )
+
+
+@scenario("vai_to_yolo", dataset="visionai")
+def vai_to_yolo(ctx: Context) -> Tuple[Callable, int]:
+    return (
+        _run_converter(ctx, "vision_ai", "yolo", source_data_root=ctx.dataset_path),
+        ctx.n_frames,
+    )
+
+
+@scenario("coco_to_vai", dataset="coco")
+def coco_to_vai(ctx: Context) -> Tuple[Callable, int]:
+    return (
+        _run_converter(
+            ctx,
+            "coco",
+            "vision_ai",
+            source_data_root=ctx.dataset_path,
+            input_annotation_path=os.path.join(
+                ctx.dataset_path, "annotations", "labels.json"
+            ),
+        ),
+        ctx.n_frames,
+    )
+
+
+@scenario("yolo_to_vai", dataset="yolo")
+def yolo_to_vai(ctx: Context) -> Tuple[Callable, int]:
+    return (
+        _run_converter(ctx, "yolo", "vision_ai", source_data_root=ctx.dataset_path),
+        ctx.n_frames,
+    )
+
+
+@scenario("kitti_to_vai", dataset="kitti")
+def kitti_to_vai(ctx: Context) -> Tuple[Callable, int]:
+    return (
+        _run_converter(
+            ctx,
+            "kitti",
+            "vision_ai",
+            source_data_root=ctx.dataset_path,
+            lidar_sensor_name="lidar1",
+        ),
+        ctx.n_frames,
+    )
+
+
+@scenario("bdd_to_vai", dataset="bdd")
+def bdd_to_vai(ctx: Context) -> Tuple[Callable, int]:
+    return (
+        _run_converter(
+            ctx,
+            "bddp",
+            "vision_ai",
+            source_data_root=ctx.dataset_path,
+            input_annotation_path=os.path.join(ctx.dataset_path, "bdd.json"),
+        ),
+        ctx.n_frames,
+    )
+
+
+def generate_dataset(name: str, path: str, args: argparse.Namespace) -> None:
+    """generate dataset `name` under `path` from the command line arguments"""
+    image_size = (args.width, args.height)
+    n_images = args.sequences * args.frames
+    if name == "visionai":
+        visionai_kwargs = dict(
+            n_objects=args.objects,
+            n_attributes=args.attributes,
+            n_cameras=args.cameras,
+            n_lidars=args.lidars,
+            rle=args.rle,
+        )
+        generator.write_visionai_dataset(
+            path,
+            n_sequences=args.sequences,
+            n_frames=args.frames,
+            image_size=image_size,
+            **visionai_kwargs,
+        )
+        visionai_kwargs.pop("n_objects")
+        with open(os.path.join(path, "ontology.json"), "w") as f:
+            json.dump(generator.generate_ontology(**visionai_kwargs), f)
+    elif name == "coco":
+        generator.write_coco_dataset(
+            path, n_images=n_images, n_objects=args.objects, image_size=image_size
+        )
+    elif name == "yolo":
+        generator.write_yolo_dataset(
+            path, n_images=n_images, n_objects=args.objects, image_size=image_size
+        )
+    elif name == "kitti":
+        generator.write_kitti_dataset(
+            path, n_images=n_images, n_objects=args.objects, image_size=image_size
+        )
+    elif name == "bdd":
+        generator.write_bdd_dataset(
+            path,
+            n_sequences=args.sequences,
+            n_frames=args.frames,
+            n_objects=args.objects,
+            n_attributes=args.attributes,
+            image_size=image_size,
+        )
+
+
+def run_scenario(name: str, ctx: Context) -> Dict:
+    """run scenario `name`, this function is executed in a child process"""
+    _, unit, setup = SCENARIOS[name]
+    run, n_items = setup(ctx)
+    setup_rss = _peak_rss_mb()
+    durations = []
+    for _ in range(ctx.args.repeat):
+        start = time.perf_counter()
+        run()
+        durations.append(time.perf_counter() - start)
+    median = statistics.median(durations)
+    return {
+        "scenario": name,
+        "items": n_items,
+        "unit": unit,
+        "min_s": min(durations),
+        "median_s": median,
+        "throughput": n_items / median if median else float("inf"),
+        "setup_peak_rss_mb": setup_rss,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+
+def _child(name: str, ctx: Context, queue) -> None:
+    try:
+        queue.put(run_scenario(name, ctx))
+    except Exception as e:
+        queue.put({"scenario": name, "error": f"{type(e).__name__}: {e}"})
+
+
+def run_isolated(name: str, ctx: Context) -> Dict:
+    mp_context = multiprocessing.get_context("spawn")
+    queue = mp_context.Queue()
+    process = mp_context.Process(target=_child, args=(name, ctx, queue))
+    process.start()
+    # poll the queue, a child killed by the OS (i.e out of memory) never puts a result
+    while True:
+        try:
+            result = queue.get(timeout=1)
+            break
+        except Empty:
+            if process.is_alive():
+                continue
+            try:
+                result = queue.get(timeout=1)
+            except Empty:
+                result = {
+                    "scenario": name,
+                    "error": f"process exited with code {process.exitcode}",
+                }
+            break
+    process.join()
+    return result
+
+
+def format_results(results: List[Dict]) -> str:
+    header = (
+        f"{'scenario':<24}{'items':>8}{'median s':>12}{'min s':>12}"
+        + f"{'items/s':>12}{'peak RSS MB':>14}"
+    )
+    lines = [header, "-" * len(header)]
+    for result in results:
+        if "error" in result:
+            lines.append(f"{result['scenario']:<24}  failed: {result['error']}")
+            continue
+        lines.append(
+            f"{result['scenario']:<24}{result['items']:>8}"
+            + f"{result['median_s']:>12.4f}{result['min_s']:>12.4f}"
+            + f"{result['throughput']:>12.1f}{result['peak_rss_mb']:>14.1f}"
+        )
+    return "\n".join(lines)
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[0])
+    parser.add_argument(
+        "--scenario",
+        nargs="+",
+        choices=sorted(SCENARIOS),
+        default=sorted(SCENARIOS),
+        help="scenarios to run (default: all)",
+    )
+    parser.add_argument("--sequences", type=int, default=2, help="number of sequences")
+    parser.add_argument(
+        "--frames", type=int, default=50, help="number of frames per sequence"
+    )
+    parser.add_argument(
+        "--objects", type=int, default=20, help="number of objects per frame"
+    )
+    parser.add_argument(
+        "--attributes", type=int, default=2, help="number of attributes per bbox"
+    )
+    parser.add_argument("--cameras", type=int, default=1, help="number of cameras")
+    parser.add_argument("--lidars", type=int, default=0, help="number of lidars")
+    parser.add_argument(
+        "--rle",
+        action="store_true",
+        help="generate RLE segmentation masks instead of bboxes for VisionAI",
+    )
+    parser.add_argument("--width", type=int, default=64, help="image width")
+    parser.add_argument("--height", type=int, default=48, help="image height")
+    parser.add_argument(
+        "--repeat", type=int, default=3, help="number of timed runs per scenario"
+    )
+    parser.add_argument(
+        "--copy_sensor_data",
+        action="store_true",
+        help="copy sensor data in converter scenarios",
+    )
+    parser.add_argument(
+        "--workdir",
+        type=str,
+        default="",
+        help="folder for generated datasets and outputs (default: temporary folder)",
+    )
+    parser.add_argument(
+        "--output", type=str, default="", help="save results as json to this path"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict]:
+    args = parse_args(argv)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="visionai_benchmark_")
+    results = []
+    try:
+        generated = set()
+        for name in args.scenario:
+            dataset = SCENARIOS[name][0]
+            if (
+                args.rle
+                and dataset == "visionai"
+                and name.startswith(("vai_to", "convert"))
+            ):
+                # converters only export bboxes
+                print(f"skip {name}: not supported with --rle")
+                continue
+            dataset_path = os.path.join(workdir, "datasets", dataset)
+            if dataset not in generated:
+                shutil.rmtree(dataset_path, ignore_errors=True)
+                generate_dataset(dataset, dataset_path, args)
+                generated.add(dataset)
+            ctx = Context(
+                args=args,
+                dataset_path=dataset_path,
+                output_path=os.path.join(workdir, "outputs", name),
+            )
+            results.append(run_isolated(name, ctx))
+            print(format_results(results[-1:]).split("\n")[-1], flush=True)
+    finally:
+        if not args.workdir:
+            shutil.rmtree(workdir, ignore_errors=True)
+
+    print()
+    print(format_results(results))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"args": vars(args), "results": results}, f, indent=4)
+    return results
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import json
+import os
+
+from visionai_data_format.converters.bdd_to_vai import BDDtoVAI
+from visionai_data_format.utils.converter import convert_vai_to_bdd_single
+
+
+def _convert_bdd(tmp_path, frame_list):
+    bdd_file = tmp_path / "bdd.json"
+    bdd_file.write_text(json.dumps({"frame_list": frame_list}))
+    BDDtoVAI.convert(
+        input_annotation_path=str(bdd_file),
+        output_dest_folder=str(tmp_path / "visionai"),
+        camera_sensor_name="camera1",
+        lidar_sensor_name="",
+        source_data_root=str(tmp_path),
+        uri_root="",
+        copy_sensor_data=False,
+    )
+    visionai_file = (
+        tmp_path
+        / "visionai"
+        / "000000000000"
+        / "annotations"
+        / "groundtruth"
+        / "visionai.json"
+    )
+    return json.loads(visionai_file.read_text())["visionai"]
+
+
+def test_bdd_to_vai_polygons(tmp_path):
+    vai_data = {
+        "streams": {"camera1": {"type": "camera"}},
+        "objects": {"poly": {"type": "road"}, "point": {"type": "light"}},
+        "frames": {
+            "000000000000": {
+                "objects": {
+                    "poly": {
+                        "object_data": {
+                            "poly2d": [
+                                {
+                                    "name": "poly2d_shape",
+                                    "val": [0, 0, 10, 0, 10, 5.5],
+                                    "stream": "camera1",
+                                    "closed": True,
+                                }
+                            ]
+                        }
+                    },
+                    "point": {
+                        "object_data": {
+                            "point2d": [
+                                {
+                                    "name": "point2d_shape",
+                                    "val": [7, 8],
+                                    "stream": "camera1",
+                                }
+                            ]
+                        }
+                    },
+                }
+            }
+        },
+    }
+    frame_list = convert_vai_to_bdd_single(vai_data, "000001", "storage", "container")
+
+    visionai = _convert_bdd(tmp_path, frame_list)
+
+    frame_objects = visionai["frames"]["000000000000"]["objects"]
+    shapes = {
+        visionai["objects"][obj_uuid]["type"]: obj["object_data"]
+        for obj_uuid, obj in frame_objects.items()
+    }
+    poly2d = shapes["road"]["poly2d"]
+    assert [(poly["val"], poly["closed"]) for poly in poly2d] == [
+        ([0.0, 0.0, 10.0, 0.0, 10.0, 5.5], True)
+    ]
+    assert [point["val"] for point in shapes["light"]["point2d"]] == [[7.0, 8.0]]
+    assert poly2d[0]["name"] == "poly2d_shape"
+    pointers = {
+        obj["type"]: obj["object_data_pointers"] for obj in visionai["objects"].values()
+    }
+    assert pointers["road"]["poly2d_shape"]["type"] == "poly2d"
+    assert pointers["light"]["point2d_shape"]["type"] == "point2d"
+
+
+def test_bdd_to_vai_tracks(tmp_path):
+    def bdd_frame(name, labels):
+        return {
+            "name": name,
+            "storage": "storage",
+            "dataset": "container",
+            "sequence": "000001/data/camera1",
+            "labels": labels,
+        }
+
+    def car(x1):
+        return {
+            "category": "car",
+            "uuid": "car-track",
+            "box2d": {"x1": x1, "y1": 0, "x2": x1 + 10, "y2": 10},
+            "attributes": {"occluded": True},
+        }
+
+    frame_list = [
+        bdd_frame("0.jpg", [car(0)]),
+        bdd_frame("1.jpg", [car(1)]),
+        bdd_frame("2.jpg", []),
+        bdd_frame("3.jpg", [car(3)]),
+    ]
+
+    visionai = _convert_bdd(tmp_path, frame_list)
+
+    intervals = [
+        {"frame_start": 0, "frame_end": 1},
+        {"frame_start": 3, "frame_end": 3},
+    ]
+    car_object = visionai["objects"]["car-track"]
+    assert list(visionai["objects"]) == ["car-track"]
+    assert car_object["frame_intervals"] == intervals
+    assert car_object["object_data_pointers"]["bbox_shape"] == {
+        "type": "bbox",
+        "frame_intervals": intervals,
+        "attributes": {"occluded": "boolean"},
+    }
+    frames = visionai["frames"]
+    assert [bool(frames[key].get("objects")) for key in sorted(frames)] == [
+        True,
+        True,
+        False,
+        True,
+    ]
+
+
+def test_bdd_to_vai_sequences(tmp_path):
+    frame_list = [
+        {
+            "name": f"{idx}.jpg",
+            "storage": "storage",
+            "dataset": "container",
+            "sequence": f"{sequence}/data/camera1",
+            "labels": [],
+        }
+        for idx, sequence in enumerate(["a", "b", "a", "b", "a"])
+    ]
+    bdd_file = tmp_path / "bdd.json"
+    bdd_file.write_text(json.dumps({"frame_list": frame_list}, indent=2))
+
+    BDDtoVAI.convert(
+        input_annotation_path=str(bdd_file),
+        output_dest_folder=str(tmp_path / "visionai"),
+        camera_sensor_name="camera1",
+        lidar_sensor_name="",
+        source_data_root=str(tmp_path),
+        uri_root="",
+        copy_sensor_data=False,
+        n_frame=4,
+    )
+
+    # frames are grouped by sequence in order of appearance, up to `n_frame`
+    n_frames = {}
+    for sequence_name in sorted(os.listdir(tmp_path / "visionai")):
+        visionai_file = (
+            tmp_path
+            / "visionai"
+            / sequence_name
+            / "annotations"
+            / "groundtruth"
+            / "visionai.json"
+        )
+        visionai = json.loads(visionai_file.read_text())["visionai"]
+        n_frames[sequence_name] = len(visionai["frames"])
+    assert n_frames == {"000000000000": 3, "000000000001": 1}
@@ -0,0 +1,126 @@
+import json
+
+import numpy as np
+import pytest
+
+from visionai_data_format.exceptions import VisionAIException
+from visionai_data_format.utils.columnar import (
+    columnar_to_visionai,
+    load_columnar,
+    save_as_columnar,
+    visionai_to_columnar,
+)
+
+
+def test_columnar_round_trip(
+    fake_objects_visionai_data, fake_objects_semantic_segmentation
+):
+    for data in (fake_objects_visionai_data, fake_objects_semantic_segmentation):
+        columns = visionai_to_columnar(data)
+        assert json.dumps(columnar_to_visionai(columns), sort_keys=True) == json.dumps(
+            data, sort_keys=True
+        )
+
+
+def test_columnar_poly2d_with_extra_keys():
+    element = {
+        "name": "poly2d_shape",
+        "val": [1, 2.5, 3, 4],
+        "stream": "camera1",
+        "closed": True,
+        "mode": "MODE_POLY2D_ABSOLUTE",
+        "confidence_score": 0.5,
+    }
+    data = {
+        "visionai": {
+            "frames": {
+                "000000000000": {
+                    "objects": {"obj": {"object_data": {"poly2d": [element]}}},
+                    "frame_properties": {"streams": {"camera1": {"uri": ""}}},
+                }
+            }
+        }
+    }
+    columns = visionai_to_columnar(data)
+
+    assert columns["shape"].tolist() == [3]
+    assert columns["coords"].tolist() == [1.0, 2.5, 3.0, 4.0]
+    assert columnar_to_visionai(columns) == data
+
+
+def test_save_and_load_columnar(tmp_path, fake_objects_visionai_data):
+    save_as_columnar(
+        fake_objects_visionai_data, file_name="visionai.npz", folder_name=tmp_path
+    )
+
+    assert load_columnar(str(tmp_path / "visionai.npz")) == fake_objects_visionai_data
+
+    columns = visionai_to_columnar(fake_objects_visionai_data)
+    columns["version"] = np.array([0], dtype=np.int32)
+    np.savez(str(tmp_path / "old.npz"), **columns)
+    with pytest.raises(VisionAIException, match="unsupported format version 0"):
+        load_columnar(str(tmp_path / "old.npz"))
+
+
+@pytest.mark.parametrize(
+    "objects",
+    [
+        {"a": {"object_data": {}}},
+        {"a": {"object_data": {"bbox": []}}},
+        {
+            "a": {"object_data": {}},
+            "b": {"object_data": {"bbox": [{"name": "bbox_shape", "val": [1, 2]}]}},
+        },
+    ],
+)
+def test_columnar_round_trip_empty_objects(objects):
+    data = {"visionai": {"frames": {"0": {"objects": objects}}}}
+
+    assert columnar_to_visionai(visionai_to_columnar(data)) == data
+
+
+def test_columnar_large_integer_coordinates():
+    val = [2**53 + 1, -(2**63), 2**63 - 1, 0.5]
+    big_val = [2**64, 1]
+    data = {
+        "visionai": {
+            "frames": {
+                "0": {
+                    "objects": {
+                        "a": {"object_data": {"point2d": [{"val": val}]}},
+                        "b": {"object_data": {"point2d": [{"val": big_val}]}},
+                    }
+                }
+            }
+        }
+    }
+    columns = visionai_to_columnar(data)
+
+    assert columns["int_coords"].tolist() == val[:3]
+    assert columnar_to_visionai(columns) == data
+
+
+def test_columnar_integer_confidence_score():
+    bbox = [
+        {"name": "bbox_shape", "val": [1, 2, 3, 4], "confidence_score": 1},
+        {"name": "bbox_shape", "val": [5, 6, 7, 8], "confidence_score": 0.5},
+    ]
+    point2d = [{"name": "point2d_shape", "val": [1, 2], "confidence_score": 0.5}]
+    data = {
+        "visionai": {
+            "frames": {
+                "0": {
+                    "objects": {
+                        "a": {"object_data": {"bbox": bbox, "point2d": point2d}}
+                    }
+                }
+            }
+        }
+    }
+    columns = visionai_to_columnar(data)
+
+    # only the shape list with an integer score is kept in the skeleton
+    assert columns["shape"].tolist() == [2]
+    assert json.dumps(columnar_to_visionai(columns), sort_keys=True) == json.dumps(
+        data, sort_keys=True
+    )
@@ -0,0 +1,132 @@
+import json
+import os
+
+import pytest
+
+from visionai_data_format.schemas.bdd_schema import BDDSchema, FrameSchema
+from visionai_data_format.utils.converter import (
+    BDDStreamWriter,
+    convert_vai_to_bdd,
+    convert_vai_to_bdd_single,
+    iter_vai_to_bdd_frames,
+)
+from visionai_data_format.vai_to_bdd import vai_to_bdd
+
+
+def _write_sequences(root, visionai_data, sequence_names):
+    for sequence_name in sequence_names:
+        annotation_folder = root / sequence_name / "annotations" / "groundtruth"
+        os.makedirs(annotation_folder)
+        (annotation_folder / "visionai.json").write_text(json.dumps(visionai_data))
+
+
+def test_vai_to_bdd_streaming(tmp_path, fake_objects_data_single_lidar):
+    source = tmp_path / "visionai"
+    _write_sequences(source, fake_objects_data_single_lidar, ["000001", "000002"])
+    bdd_file = tmp_path / "bdd" / "bdd.json"
+
+    vai_to_bdd(str(source), str(bdd_file), 99, "storage", "container", "groundtruth")
+
+    bdd = BDDSchema(**json.loads(bdd_file.read_text()))
+    assert bdd.company_code == "99"
+    assert [frame.sequence for frame in bdd.frame_list] == [
+        "000001/data/camera1",
+        "000002/data/camera1",
+    ]
+    assert [len(frame.labels) for frame in bdd.frame_list] == [1, 1]
+    assert not (tmp_path / "bdd" / "bdd.json.partial").exists()
+
+    # unvalidated frames are the frames of convert_vai_to_bdd
+    frames = list(
+        iter_vai_to_bdd_frames(str(source), "storage", "container", validate=False)
+    )
+    assert frames == list(
+        iter_vai_to_bdd_frames(
+            str(source),
+            "storage",
+            "container",
+            validate=False,
+            validate_visionai=False,
+            workers=2,
+        )
+    )
+    assert (
+        frames
+        == convert_vai_to_bdd(str(source), 99, "storage", "container")["frame_list"]
+    )
+
+
+def test_bdd_stream_writer_failure(tmp_path):
+    bdd_file = tmp_path / "bdd.json"
+
+    def frames():
+        yield {"name": "000000000000.jpg"}
+        raise ValueError("broken sequence")
+
+    with pytest.raises(ValueError):
+        with BDDStreamWriter(str(bdd_file)) as writer:
+            writer.write_frames(frames())
+    # no partial BDD+ file is left
+    assert os.listdir(tmp_path) == []
+
+
+def test_convert_vai_to_bdd_single_polygons():
+    vai_data = {
+        "streams": {"camera1": {"type": "camera"}},
+        "objects": {"poly": {"type": "road"}, "point": {"type": "light"}},
+        "frames": {
+            "000000000000": {
+                "objects": {
+                    "poly": {
+                        "object_data": {
+                            "poly2d": [
+                                {
+                                    "name": "poly2d_shape",
+                                    "val": [0, 0, 10, 0, 10, 5.5],
+                                    "stream": "camera1",
+                                    "closed": True,
+                                },
+                                {
+                                    "name": "poly2d_shape",
+                                    "val": [1, 2, 3, 4],
+                                    "stream": "camera1",
+                                    "closed": False,
+                                    "confidence_score": 0.5,
+                                },
+                            ]
+                        }
+                    },
+                    "point": {
+                        "object_data": {
+                            "point2d": [
+                                {
+                                    "name": "point2d_shape",
+                                    "val": [7, 8],
+                                    "stream": "camera1",
+                                }
+                            ]
+                        }
+                    },
+                }
+            }
+        },
+    }
+
+    frames = convert_vai_to_bdd_single(vai_data, "000001", "storage", "container")
+
+    labels = frames[0]["labels"]
+    assert [label["category"] for label in labels] == ["road", "road", "light"]
+    assert labels[0]["poly2d"] == [
+        {
+            "vertices": [[0.0, 0.0], [10.0, 0.0], [10.0, 5.5]],
+            "closed": True,
+            "types": "LLL",
+        }
+    ]
+    assert labels[1]["poly2d"][0]["closed"] is False
+    assert labels[1]["meta_ds"] == {"score": 0.5}
+    assert labels[2]["point2d"] == [
+        {"vertices": [[7.0, 8.0]], "closed": False, "types": "L"}
+    ]
+    assert [label["attributes"]["INSTANCE_ID"] for label in labels] == [0, 1, 2]
+    FrameSchema(**frames[0])
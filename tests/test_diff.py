@@ -0,0 +1,72 @@
+import copy
+import json
+
+import pytest
+
+from visionai_data_format.exceptions import VisionAIException
+from visionai_data_format.utils.diff import (
+    apply_patch,
+    diff_visionai,
+    frame_fingerprints,
+    summarize_patch,
+)
+
+OBJECT_UUID = "893ac389-7782-4bc3-8f61-09a8e48c819f"
+
+
+def test_diff_and_apply_patch(fake_objects_data_single_lidar):
+    old = copy.deepcopy(fake_objects_data_single_lidar)
+    new = copy.deepcopy(old)
+    visionai = new["visionai"]
+    frame = visionai["frames"]["000000000000"]
+    frame["objects"][OBJECT_UUID]["object_data"]["bbox"][0]["val"] = [1, 2, 3, 4]
+    visionai["frames"]["000000000001"] = copy.deepcopy(frame)
+    visionai["frame_intervals"] = [{"frame_start": 0, "frame_end": 1}]
+    visionai["objects"][OBJECT_UUID]["frame_intervals"] = [
+        {"frame_start": 0, "frame_end": 1}
+    ]
+    del visionai["objects"][OBJECT_UUID]["object_data_pointers"]["cuboid_shape"]
+
+    patch = diff_visionai(old, new)
+
+    assert json.loads(json.dumps(patch)) == patch
+    assert summarize_patch(patch) == {
+        "frames": {"added": 1, "removed": 0, "modified": 1},
+        "objects": {"added": 0, "removed": 0, "modified": 1},
+        "contexts": {"added": 0, "removed": 0, "modified": 0},
+    }
+    object_node = patch["visionai"]["modified"]["objects"]["modified"][OBJECT_UUID]
+    assert object_node["modified"]["object_data_pointers"] == {
+        "removed": ["cuboid_shape"]
+    }
+    # only the changed box list of the modified frame is in the patch
+    frame_node = patch["visionai"]["modified"]["frames"]["modified"]["000000000000"]
+    assert frame_node == {
+        "modified": {
+            "objects": {
+                "modified": {
+                    OBJECT_UUID: {
+                        "modified": {
+                            "object_data": {
+                                "set": {
+                                    "bbox": frame["objects"][OBJECT_UUID][
+                                        "object_data"
+                                    ]["bbox"]
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+
+    assert apply_patch(old, patch) == new
+    assert old == fake_objects_data_single_lidar
+    assert diff_visionai(new, new)["visionai"] == {}
+
+    # the old frame fingerprints can be reused
+    assert diff_visionai(old, new, old_fingerprints=frame_fingerprints(old)) == patch
+
+    with pytest.raises(VisionAIException):
+        apply_patch(new, patch)
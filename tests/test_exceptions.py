@@ -0,0 +1,73 @@
+import json
+import pickle
+
+from visionai_data_format.exceptions import (
+    ValidationReport,
+    VisionAIErrorCode,
+    VisionAIException,
+)
+from visionai_data_format.schemas.ontology import Ontology
+from visionai_data_format.schemas.visionai_schema import VisionAIModel
+
+
+def test_exception_message_is_lazy_and_summarized():
+    interval_list = list(range(10000))
+    exc = VisionAIException(
+        error_code=VisionAIErrorCode.VAI_ERR_036,
+        message_kwargs={"attribute_name": "uuid", "interval_list": interval_list},
+    )
+    assert exc._error_message is None
+
+    message = exc.error_message
+    assert "[0, 1, 2," in message
+    assert "(10000 items)" in message
+    assert "9999" not in message
+    assert str(exc) == message
+    # kwargs are kept as is
+    assert exc.message_kwargs["interval_list"] is interval_list
+
+
+def test_exception_small_collections_and_pickle():
+    exc = VisionAIException(
+        error_code=VisionAIErrorCode.VAI_ERR_012,
+        message_kwargs={"sensor_name": {"lidar2"}, "sensor_type": "camera or lidar"},
+    )
+    assert "{'lidar2'}" in exc.error_message
+
+    unpickled = pickle.loads(pickle.dumps(exc))
+    assert unpickled.error_code == exc.error_code
+    assert unpickled.message_kwargs == exc.message_kwargs
+    assert unpickled.error_message == exc.error_message
+
+
+def test_validation_report(
+    fake_visionai_ontology,
+    fake_objects_data_single_lidar_wrong_visionai_frame_intervals,
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    errors = VisionAIModel(
+        **fake_objects_data_single_lidar_wrong_visionai_frame_intervals
+    ).validate_with_ontology(ontology=ontology)
+
+    report = ValidationReport.from_exceptions(errors, sequence="000000000001")
+    data = json.loads(report.to_json())
+    assert data["sequence"] == "000000000001"
+    assert not data["valid"]
+    assert data["counts"] == {"VAI_ERR_024": 1, "VAI_ERR_037": 2}
+    assert all(
+        issue["location"].startswith("objects/")
+        for issue in data["issues"]
+        if issue["error_code"] == "VAI_ERR_037"
+    )
+    assert ValidationReport.from_dict(data).to_dict() == data
+
+    aggregated = ValidationReport.aggregate(
+        [report, ValidationReport(sequence="000000000002"), report]
+    )
+    assert aggregated.to_dict() == {
+        "valid": False,
+        "counts": {"VAI_ERR_024": 2, "VAI_ERR_037": 4},
+        "issues": [],
+        "n_sequences": 3,
+        "invalid_sequences": ["000000000001", "000000000001"],
+    }
@@ -0,0 +1,53 @@
+import pytest
+
+from visionai_data_format.exceptions import VisionAIException
+from visionai_data_format.schemas.visionai_schema import Bbox, Poly2D
+from visionai_data_format.utils.geometry import (
+    BboxRecord,
+    Poly2DRecord,
+    record_from_dict,
+    records_to_object_data,
+)
+
+
+def test_geometry_record_round_trip(fake_objects_visionai_data):
+    for frame in fake_objects_visionai_data["visionai"]["frames"].values():
+        for object_under_frame in frame.get("objects", {}).values():
+            object_data = object_under_frame.get("object_data", {})
+            records = [
+                record_from_dict(shape, element)
+                for shape in ("bbox", "cuboid", "point2d", "poly2d")
+                for element in object_data.get(shape, [])
+            ]
+            for shape, elements in records_to_object_data(records).items():
+                assert elements == object_data[shape]
+
+
+def test_geometry_record_keeps_number_types():
+    record = BboxRecord(name="bbox_shape", val=[1, 2.5, 3, 4.0], stream="camera1")
+
+    assert record.val == [1, 2.5, 3, 4.0]
+    assert [type(v) for v in record.val] == [int, float, int, float]
+    assert record.as_array().tolist() == [1.0, 2.5, 3.0, 4.0]
+    assert record.to_model() == Bbox(
+        name="bbox_shape", val=[1, 2.5, 3, 4.0], stream="camera1"
+    )
+
+
+def test_geometry_record_validate():
+    with pytest.raises(VisionAIException) as bbox_error:
+        BboxRecord(name="bbox_shape", val=[1, 2, 3], stream="camera1").validate()
+    with pytest.raises(VisionAIException) as model_error:
+        Bbox(name="bbox_shape", val=[1, 2, 3], stream="camera1")
+    assert bbox_error.value.error_code == "VAI_ERR_013"
+    assert str(bbox_error.value) in str(model_error.value)
+
+    poly2d = Poly2DRecord(
+        name="poly2d_shape", val=[1, 2, 3], stream="camera1", closed=True
+    )
+    with pytest.raises(VisionAIException, match="even number"):
+        poly2d.validate()
+
+    poly2d.val = [0, 0, 1, 0, 1, 1]
+    assert poly2d.validate().vertices().tolist() == [[0, 0], [1, 0], [1, 1]]
+    assert poly2d.to_model() == Poly2D(**poly2d.to_dict())
@@ -0,0 +1,105 @@
+import copy
+
+import pytest
+
+from visionai_data_format.exceptions import VisionAIException
+from visionai_data_format.schemas.ontology import Ontology
+from visionai_data_format.schemas.utils.incremental import IncrementalValidator
+from visionai_data_format.schemas.visionai_schema import VisionAIModel
+
+OBJECT_UUID = "893ac389-7782-4bc3-8f61-09a8e48c819f"
+
+
+def _error_keys(errors):
+    return [(error.error_code, error.location) for error in errors]
+
+
+def _full_validation(validator, ontology):
+    model = VisionAIModel(visionai=copy.deepcopy(validator.visionai))
+    return model.validate_with_ontology(ontology=ontology)
+
+
+def _extend_object(visionai_object, frame_end):
+    visionai_object = copy.deepcopy(visionai_object)
+    interval = [{"frame_start": 0, "frame_end": frame_end}]
+    visionai_object["frame_intervals"] = interval
+    for data_pointer in visionai_object["object_data_pointers"].values():
+        data_pointer["frame_intervals"] = interval
+    return visionai_object
+
+
+def test_incremental_validator_appended_frames(
+    fake_visionai_ontology, fake_objects_data_single_lidar
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    visionai = fake_objects_data_single_lidar["visionai"]
+    frame = visionai["frames"]["000000000000"]
+    validator = IncrementalValidator(
+        VisionAIModel(**fake_objects_data_single_lidar), ontology
+    )
+    assert validator.errors == []
+
+    # a valid append: new frame, its frame intervals and the object intervals
+    errors = validator.apply(
+        frames={"000000000001": copy.deepcopy(frame)},
+        objects={OBJECT_UUID: _extend_object(visionai["objects"][OBJECT_UUID], 1)},
+        frame_intervals=[{"frame_start": 0, "frame_end": 1}],
+    )
+    assert errors == _full_validation(validator, ontology) == []
+
+    # frame intervals of the sequence and of the object are not updated
+    errors = validator.apply(frames={"000000000002": copy.deepcopy(frame)})
+    assert errors
+    assert _error_keys(errors) == _error_keys(_full_validation(validator, ontology))
+
+    # a frame with an unknown stream
+    wrong_frame = copy.deepcopy(frame)
+    wrong_frame["frame_properties"]["streams"]["camera9"] = {"uri": "camera9.png"}
+    errors = validator.apply(
+        frames={"000000000002": wrong_frame},
+        objects={OBJECT_UUID: _extend_object(visionai["objects"][OBJECT_UUID], 2)},
+        frame_intervals=[{"frame_start": 0, "frame_end": 2}],
+    )
+    assert [error.location for error in errors] == [
+        "frames/000000000002/frame_properties/streams"
+    ]
+    assert _error_keys(errors) == _error_keys(_full_validation(validator, ontology))
+
+    # removing the wrong frame makes the sequence valid again
+    errors = validator.apply(
+        objects={OBJECT_UUID: _extend_object(visionai["objects"][OBJECT_UUID], 1)},
+        frame_intervals=[{"frame_start": 0, "frame_end": 1}],
+        removed_frames=["000000000002"],
+    )
+    assert errors == _full_validation(validator, ontology) == []
+
+
+def test_incremental_validator_changed_object_class(
+    fake_visionai_ontology, fake_objects_data_single_lidar
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    visionai_object = copy.deepcopy(
+        fake_objects_data_single_lidar["visionai"]["objects"][OBJECT_UUID]
+    )
+    visionai_object["type"] = "unknown_class"
+    validator = IncrementalValidator(fake_objects_data_single_lidar, ontology)
+
+    errors = validator.apply(objects={OBJECT_UUID: visionai_object})
+    assert [error.error_code for error in errors] == ["VAI_ERR_020"]
+    assert _error_keys(errors) == _error_keys(_full_validation(validator, ontology))
+
+
+def test_incremental_validator_invalid_delta(
+    fake_visionai_ontology, fake_objects_data_single_lidar
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    validator = IncrementalValidator(fake_objects_data_single_lidar, ontology)
+    frame = fake_objects_data_single_lidar["visionai"]["frames"]["000000000000"]
+
+    with pytest.raises(VisionAIException):
+        validator.apply(frames={"1": copy.deepcopy(frame)})
+    with pytest.raises(VisionAIException):
+        validator.apply(removed_objects=[OBJECT_UUID])
+    # the sequence is unchanged by invalid deltas
+    assert list(validator.visionai["frames"]) == ["000000000000"]
+    assert list(validator.visionai["objects"]) == [OBJECT_UUID]
@@ -0,0 +1,130 @@
+import json
+import os
+
+from PIL import Image
+
+from visionai_data_format.convert_dataset import DatasetConverter
+from visionai_data_format.utils.instrumentation import MetricsRecorder, incr, phase
+
+
+def test_metrics_recorder_phases_and_counters():
+    events = []
+    metrics = MetricsRecorder(callback=lambda *event: events.append(event))
+
+    # no active recorder: module level helpers do nothing
+    with phase("json_read"):
+        incr("bytes_read", 10)
+    assert metrics.summary()["counters"] == {}
+
+    with metrics.activate():
+        for _ in range(2):
+            with phase("json_read", items=3):
+                incr("bytes_read", 10)
+
+    summary = metrics.summary()
+    assert summary["phases"]["json_read"]["calls"] == 2
+    assert summary["phases"]["json_read"]["items"] == 6
+    assert summary["counters"] == {"bytes_read": 20}
+    assert [kind for kind, _, _ in events] == ["counter", "phase"] * 2
+
+    other = MetricsRecorder()
+    other.merge(metrics)
+    other.merge(metrics.summary())
+    assert other.summary()["counters"] == {"bytes_read": 40}
+
+    prometheus = metrics.to_prometheus()
+    assert 'visionai_phase_calls_total{phase="json_read"} 2' in prometheus
+    assert "visionai_bytes_read_total 20" in prometheus
+
+
+def test_dataset_converter_metrics(tmp_path):
+    coco = {
+        "images": [
+            {
+                "id": i,
+                "file_name": f"{i:012d}.jpg",
+                "coco_url": f"{i:012d}.jpg",
+                "width": 640,
+                "height": 480,
+            }
+            for i in range(3)
+        ],
+        "annotations": [
+            {
+                "id": i,
+                "image_id": i % 3,
+                "category_id": 1,
+                "bbox": [10, 20, 30, 40],
+                "area": 1200,
+                "iscrowd": 0,
+                "segmentation": [],
+            }
+            for i in range(5)
+        ],
+        "categories": [{"id": 1, "name": "car"}],
+    }
+    annotation_path = tmp_path / "labels.json"
+    with open(annotation_path, "w") as f:
+        json.dump(coco, f)
+
+    metrics = MetricsRecorder()
+    DatasetConverter.run(
+        input_format="coco",
+        output_format="vision_ai",
+        image_annotation_type="2d_bounding_box",
+        source_data_root=str(tmp_path),
+        output_dest_folder=str(tmp_path / "output"),
+        uri_root="",
+        camera_sensor_name="camera1",
+        input_annotation_path=str(annotation_path),
+        copy_sensor_data=False,
+        metrics=metrics,
+    )
+
+    summary = json.loads(metrics.to_json(file_path=str(tmp_path / "metrics.json")))
+    assert {"convert", "json_read", "validation", "json_write"} <= set(
+        summary["phases"]
+    )
+    assert summary["phases"]["json_write"]["calls"] == 3
+    assert summary["counters"]["frames"] == 3
+    assert summary["counters"]["objects"] == 5
+    assert summary["counters"]["bytes_read"] == os.path.getsize(annotation_path)
+    assert summary["counters"]["bytes_written"] == sum(
+        os.path.getsize(
+            tmp_path
+            / "output"
+            / f"{i:012d}"
+            / "annotations"
+            / "groundtruth"
+            / "visionai.json"
+        )
+        for i in range(3)
+    )
+    with open(tmp_path / "metrics.json") as f:
+        assert json.load(f) == summary
+
+    # VisionAI to YOLO counts the written labels as annotations, not objects
+    for i in range(3):
+        image_folder = tmp_path / "output" / f"{i:012d}" / "data" / "camera1"
+        image_folder.mkdir(parents=True)
+        Image.new("RGB", (640, 480)).save(image_folder / "000000000000.jpg")
+    metrics = MetricsRecorder()
+    DatasetConverter.run(
+        input_format="vision_ai",
+        output_format="yolo",
+        image_annotation_type="2d_bounding_box",
+        source_data_root=str(tmp_path / "output"),
+        output_dest_folder=str(tmp_path / "yolo"),
+        uri_root="",
+        camera_sensor_name="camera1",
+        copy_sensor_data=False,
+        metrics=metrics,
+    )
+
+    counters = metrics.summary()["counters"]
+    assert counters["annotations"] == 5
+    assert "objects" not in counters
+    label_folder = tmp_path / "yolo" / "labels"
+    assert counters["bytes_written"] == sum(
+        os.path.getsize(label_folder / name) for name in os.listdir(label_folder)
+    )
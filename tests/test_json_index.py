@@ -0,0 +1,59 @@
+import json
+
+from visionai_data_format.utils.json_index import (
+    VisionAIFrameReader,
+    index_member_array,
+    iter_array_items,
+    load_frame_index,
+)
+
+
+def test_frame_reader(tmp_path, fake_objects_visionai_data):
+    file_path = str(tmp_path / "visionai.json")
+    with open(file_path, "w") as f:
+        json.dump(fake_objects_visionai_data, f, indent=4)
+    visionai = fake_objects_visionai_data["visionai"]
+
+    with VisionAIFrameReader(file_path) as reader:
+        assert reader.frame_keys == list(visionai["frames"].keys())
+        assert reader.get_section("streams") == visionai["streams"]
+        for frame_key, frame in visionai["frames"].items():
+            assert reader.get_frame(frame_key) == frame
+            assert reader.get_frame(int(frame_key)) == frame
+
+        frame_key = reader.frame_keys[0]
+        data = reader.get_frames([frame_key])
+        frame_objects = visionai["frames"][frame_key].get("objects", {})
+        assert data["frames"] == {frame_key: visionai["frames"][frame_key]}
+        assert data["objects"] == {
+            uuid: visionai["objects"][uuid] for uuid in frame_objects
+        }
+
+    # outdated index is rebuilt once the file changes
+    with open(file_path, "w") as f:
+        json.dump(fake_objects_visionai_data, f)
+    index = load_frame_index(file_path)
+    with open(file_path, "rb") as f:
+        content = f.read()
+    start, end = index["frames"][frame_key]
+    assert json.loads(content[start:end]) == visionai["frames"][frame_key]
+
+
+def test_iter_array_items():
+    content = b' [1, "a]\\"", {"b": [2, {}]}, [] , null]'
+    items = [
+        json.loads(content[start:end]) for start, end in iter_array_items(content, 1)
+    ]
+
+    assert items == [1, 'a]"', {"b": [2, {}]}, [], None]
+
+
+def test_index_member_array():
+    content = b'{"frame_list": [{"name": "a"}, {"name": "]"}], "company_code": "1"}'
+    spans = index_member_array(content, "frame_list")
+
+    assert [json.loads(content[start:end]) for start, end in spans] == [
+        {"name": "a"},
+        {"name": "]"},
+    ]
+    assert index_member_array(content, "labels") == []
@@ -0,0 +1,425 @@
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from visionai_data_format.utils.resize import (
+    EXIF_ORIENTATION_TAG,
+    compute_resize_transform,
+    resize_bbox,
+    resize_coco,
+    resize_image,
+    resize_image_file,
+    resize_json,
+    resize_visionai,
+    transform_frame_geometry,
+)
+
+
+def test_resize_json(tmp_path):
+    coco_json = {
+        "images": [
+            {"id": 1, "file_name": "images/a.jpg", "width": 1280, "height": 720},
+            {"id": 2, "file_name": "images/b.jpg", "width": 640, "height": 480},
+        ],
+        "annotations": [
+            {"id": 1, "image_id": 1, "bbox": [100.0, 50.0, 200.5, 100.3]},
+            {"id": 2, "image_id": 2, "bbox": [10, 20, 30, 40]},
+            {"id": 3, "image_id": 9, "bbox": [1, 2, 3, 4]},
+        ],
+        "categories": [{"id": 1, "name": "car"}],
+    }
+    src = tmp_path / "labels.json"
+    dst = tmp_path / "resized.json"
+    src.write_text(json.dumps(coco_json))
+
+    resize_json(str(src), str(dst), str(tmp_path / "resized" / "data"), (320, 320))
+
+    resized = json.loads(dst.read_text())
+    assert [img["file_name"] for img in resized["images"]] == [
+        "resized/a.jpg",
+        "resized/b.jpg",
+    ]
+    assert all((img["width"], img["height"]) == (320, 320) for img in resized["images"])
+    expected = coco_json["annotations"][0].copy()
+    resize_bbox(expected, 320 / 1280, 320 / 720)
+    assert resized["annotations"][0]["bbox"] == expected["bbox"]
+    assert resized["annotations"][1]["bbox"] == [5.0, 13.3, 15.0, 26.7]
+    # annotations without image are kept as is
+    assert resized["annotations"][2]["bbox"] == [1, 2, 3, 4]
+    assert all(
+        (ann["width"], ann["height"], ann["iscrowd"]) == (320, 320, 0)
+        for ann in resized["annotations"][:2]
+    )
+    assert resized["categories"] == coco_json["categories"]
+
+
+def test_resize_image(tmp_path):
+    src = tmp_path / "images"
+    dst = tmp_path / "resized"
+    src.mkdir()
+    for idx, size in enumerate([(1280, 960), (100, 80), (640, 640)]):
+        image = np.full((size[1], size[0], 3), idx * 50, dtype=np.uint8)
+        cv2.imwrite(str(src / f"{idx}.jpg"), image)
+    (src / "broken.jpg").write_bytes(b"not an image")
+
+    counts = resize_image(
+        str(src), str(dst), (64, 48), workers=2, quality=80, image_format="png"
+    )
+
+    assert counts == {"resized": 3, "skipped": 0, "failed": 1}
+    assert sorted(os.listdir(dst)) == ["0.png", "1.png", "2.png"]
+    for name in ("0.png", "1.png", "2.png"):
+        assert cv2.imread(str(dst / name)).shape == (48, 64, 3)
+
+    counts = resize_image(str(src), str(dst), (64, 48), image_format="png", resume=True)
+    assert counts == {"resized": 0, "skipped": 3, "failed": 1}
+
+
+def _write_rotated_jpeg(path, width, height):
+    # a `width` x `height` JPEG file displayed rotated by 90 degrees
+    exif = Image.Exif()
+    exif[EXIF_ORIENTATION_TAG] = 6
+    Image.new("RGB", (width, height)).save(str(path), exif=exif)
+
+
+@pytest.mark.parametrize("reduced_decode", [True, False])
+def test_resize_image_file_exif_orientation(tmp_path, reduced_decode):
+    src_file = tmp_path / "rotated.jpg"
+    _write_rotated_jpeg(src_file, 800, 400)
+
+    for mode, shape in (("shorter_side", (128, 64, 3)), ("letterbox", (64, 64, 3))):
+        dst_file = tmp_path / f"{mode}.png"
+        assert (
+            resize_image_file(
+                str(src_file),
+                str(dst_file),
+                (64, 64),
+                reduced_decode=reduced_decode,
+                mode=mode,
+            )
+            == "resized"
+        )
+        resized = cv2.imread(str(dst_file))
+        assert resized.shape == shape
+    # the rotated 400x800 image is padded on its left and right sides
+    assert resized[32, :16].min() == 114
+    assert resized[32, 16:48].max() == 0
+
+
+def test_resize_coco_letterbox(tmp_path):
+    src = tmp_path / "images"
+    src.mkdir()
+    image = np.full((100, 200, 3), 255, dtype=np.uint8)
+    cv2.imwrite(str(src / "a.png"), image)
+    coco_json = {
+        "images": [{"id": 1, "file_name": "a.png", "width": 200, "height": 100}],
+        "annotations": [
+            {
+                "id": 1,
+                "image_id": 1,
+                "bbox": [20, 10, 40, 20],
+                "area": 800,
+                "segmentation": [[20, 10, 60, 10, 60, 30]],
+                "keypoints": [30, 20, 2, 0, 0, 0],
+            }
+        ],
+    }
+    (tmp_path / "labels.json").write_text(json.dumps(coco_json))
+
+    transform = compute_resize_transform(200, 100, (64, 64), mode="letterbox")
+    assert transform == (0.32, 0.32, 0, 16, 64, 32, 64, 64)
+
+    resize_coco(
+        str(tmp_path / "labels.json"),
+        str(tmp_path / "resized.json"),
+        str(src),
+        str(tmp_path / "resized") + "/",
+        (64, 64),
+        mode="letterbox",
+    )
+
+    resized = json.loads((tmp_path / "resized.json").read_text())
+    annotation = resized["annotations"][0]
+    assert annotation["bbox"] == [6.4, 19.2, 12.8, 6.4]
+    assert annotation["area"] == 81.92
+    assert annotation["segmentation"] == [[6.4, 19.2, 19.2, 19.2, 19.2, 25.6]]
+    assert annotation["keypoints"] == [9.6, 22.4, 2, 0.0, 0.0, 0]
+    resized_image = cv2.imread(str(tmp_path / "resized" / "a.png"))
+    assert resized_image.shape == (64, 64, 3)
+    # white image content between gray padding rows
+    assert resized_image[0, 0].tolist() == [114, 114, 114]
+    assert resized_image[32, 32].tolist() == [255, 255, 255]
+
+
+def test_transform_frame_geometry():
+    transform = compute_resize_transform(200, 100, (64, 64), mode="letterbox")
+    frame = {
+        "objects": {
+            "uuid": {
+                "object_data": {
+                    "bbox": [
+                        {
+                            "name": "bbox_shape",
+                            "val": [100, 50, 20, 10],
+                            "stream": "camera1",
+                        }
+                    ],
+                    "poly2d": [
+                        {
+                            "name": "poly",
+                            "val": [0, 0, 200, 100],
+                            "stream": "camera1",
+                            "closed": False,
+                        }
+                    ],
+                    "point2d": [
+                        {"name": "point", "val": [10, 10], "stream": "camera2"}
+                    ],
+                }
+            }
+        }
+    }
+
+    assert transform_frame_geometry(frame, {"camera1": transform}) == 2
+
+    object_data = frame["objects"]["uuid"]["object_data"]
+    assert object_data["bbox"][0]["val"] == [32.0, 32.0, 6.4, 3.2]
+    assert object_data["poly2d"][0]["val"] == [0.0, 16.0, 64.0, 48.0]
+    assert object_data["point2d"][0]["val"] == [10, 10]
+
+
+def test_resize_visionai(tmp_path):
+    src = tmp_path / "source"
+    sequence = src / "000001"
+    (sequence / "data" / "camera1").mkdir(parents=True)
+    (sequence / "data" / "lidar1").mkdir(parents=True)
+    (sequence / "annotations" / "groundtruth").mkdir(parents=True)
+    cv2.imwrite(
+        str(sequence / "data" / "camera1" / "000000000000.jpg"),
+        np.zeros((100, 200, 3), dtype=np.uint8),
+    )
+    (sequence / "data" / "lidar1" / "000000000000.pcd").write_bytes(b"pcd")
+    visionai = {
+        "visionai": {
+            "frames": {
+                "000000000000": {
+                    "objects": {
+                        "uuid": {
+                            "object_data": {
+                                "bbox": [
+                                    {
+                                        "name": "bbox_shape",
+                                        "val": [100, 50, 20, 10],
+                                        "stream": "camera1",
+                                    }
+                                ],
+                                "binary": [
+                                    {
+                                        "name": "semantic_mask",
+                                        "val": "#10000V1#10000V2",
+                                        "stream": "camera1",
+                                        "encoding": "rle",
+                                        "data_type": "",
+                                    }
+                                ],
+                            }
+                        }
+                    },
+                    "frame_properties": {
+                        "streams": {
+                            "camera1": {
+                                "uri": "s3://bucket/000001/data/camera1/000000000000.jpg"
+                            },
+                            "lidar1": {
+                                "uri": "s3://bucket/000001/data/lidar1/000000000000.pcd"
+                            },
+                        }
+                    },
+                }
+            },
+            "streams": {
+                "camera1": {
+                    "type": "camera",
+                    "stream_properties": {
+                        "intrinsics_pinhole": {
+                            "camera_matrix_3x4": [
+                                *[100.0, 0.0, 100.0, 0.0],
+                                *[0.0, 100.0, 50.0, 0.0],
+                                *[0.0, 0.0, 1.0, 0.0],
+                            ],
+                            "width_px": 200,
+                            "height_px": 100,
+                        }
+                    },
+                },
+                "lidar1": {"type": "lidar"},
+            },
+        }
+    }
+    (sequence / "annotations" / "groundtruth" / "visionai.json").write_text(
+        json.dumps(visionai)
+    )
+    dst = tmp_path / "resized"
+
+    counts = resize_visionai(
+        str(src), str(dst), (64, 64), mode="letterbox", image_format="png"
+    )
+
+    assert counts == {
+        "sequences": 1,
+        "resized": 1,
+        "skipped": 0,
+        "failed": 0,
+        "failed_masks": 0,
+    }
+    resized_image = cv2.imread(
+        str(dst / "000001" / "data" / "camera1" / "000000000000.png")
+    )
+    assert resized_image.shape == (64, 64, 3)
+    assert (dst / "000001" / "data" / "lidar1" / "000000000000.pcd").is_file()
+    resized = json.loads(
+        (dst / "000001" / "annotations" / "groundtruth" / "visionai.json").read_text()
+    )["visionai"]
+    frame = resized["frames"]["000000000000"]
+    object_data = frame["objects"]["uuid"]["object_data"]
+    assert object_data["bbox"][0]["val"] == [32.0, 32.0, 6.4, 3.2]
+    # top and bottom image halves of classes 1 and 2 between padding rows
+    assert object_data["binary"][0]["val"] == "#1024V0#1024V1#1024V2#1024V0"
+    assert frame["frame_properties"]["streams"]["camera1"]["uri"] == (
+        "s3://bucket/000001/data/camera1/000000000000.png"
+    )
+    intrinsics = resized["streams"]["camera1"]["stream_properties"][
+        "intrinsics_pinhole"
+    ]
+    assert (intrinsics["width_px"], intrinsics["height_px"]) == (64, 64)
+    assert intrinsics["camera_matrix_3x4"] == [
+        *[32.0, 0.0, 32.0, 0.0],
+        *[0.0, 32.0, 32.0, 0.0],
+        *[0.0, 0.0, 1.0, 0.0],
+    ]
+
+
+def test_resize_visionai_exif_orientation(tmp_path):
+    src = tmp_path / "source"
+    sequence = src / "000001"
+    (sequence / "data" / "camera1").mkdir(parents=True)
+    (sequence / "annotations" / "groundtruth").mkdir(parents=True)
+    _write_rotated_jpeg(sequence / "data" / "camera1" / "000000000000.jpg", 800, 400)
+    visionai = {
+        "visionai": {
+            "frames": {
+                "000000000000": {
+                    "objects": {
+                        "uuid": {
+                            "object_data": {
+                                "bbox": [
+                                    {
+                                        "name": "bbox_shape",
+                                        "val": [100, 200, 40, 80],
+                                        "stream": "camera1",
+                                    }
+                                ]
+                            }
+                        }
+                    },
+                    "frame_properties": {
+                        "streams": {
+                            "camera1": {
+                                "uri": "s3://bucket/000001/data/camera1/000000000000.jpg"
+                            }
+                        }
+                    },
+                }
+            },
+            "streams": {"camera1": {"type": "camera"}},
+        }
+    }
+    (sequence / "annotations" / "groundtruth" / "visionai.json").write_text(
+        json.dumps(visionai)
+    )
+    dst = tmp_path / "resized"
+
+    resize_visionai(str(src), str(dst), (100, 100))
+
+    resized = json.loads(
+        (dst / "000001" / "annotations" / "groundtruth" / "visionai.json").read_text()
+    )["visionai"]
+    object_data = resized["frames"]["000000000000"]["objects"]["uuid"]["object_data"]
+    # the stream size is the 400x800 size of the rotated image
+    assert object_data["bbox"][0]["val"] == [25.0, 25.0, 10.0, 10.0]
+
+
+def test_resize_visionai_bad_mask(tmp_path):
+    src = tmp_path / "source"
+    for sequence_name in ("000001", "000002"):
+        sequence = src / sequence_name
+        (sequence / "data" / "camera1").mkdir(parents=True)
+        (sequence / "annotations" / "groundtruth").mkdir(parents=True)
+        cv2.imwrite(
+            str(sequence / "data" / "camera1" / "000000000000.jpg"),
+            np.zeros((100, 200, 3), dtype=np.uint8),
+        )
+        # the mask of the first sequence doesn't cover its 200x100 image
+        mask = "#5V1" if sequence_name == "000001" else "#20000V1"
+        visionai = {
+            "visionai": {
+                "frames": {
+                    "000000000000": {
+                        "objects": {
+                            "uuid": {
+                                "object_data": {
+                                    "binary": [
+                                        {
+                                            "name": "semantic_mask",
+                                            "val": mask,
+                                            "stream": "camera1",
+                                            "encoding": "rle",
+                                            "data_type": "",
+                                        }
+                                    ]
+                                }
+                            }
+                        },
+                        "frame_properties": {
+                            "streams": {
+                                "camera1": {
+                                    "uri": f"s3://bucket/{sequence_name}/data/camera1"
+                                    + "/000000000000.jpg"
+                                }
+                            }
+                        },
+                    }
+                },
+                "streams": {"camera1": {"type": "camera"}},
+            }
+        }
+        (sequence / "annotations" / "groundtruth" / "visionai.json").write_text(
+            json.dumps(visionai)
+        )
+    dst = tmp_path / "resized"
+
+    counts = resize_visionai(str(src), str(dst), (20, 10))
+
+    assert counts == {
+        "sequences": 2,
+        "resized": 2,
+        "skipped": 0,
+        "failed": 0,
+        "failed_masks": 1,
+    }
+    masks = {}
+    for sequence_name in ("000001", "000002"):
+        resized = json.loads(
+            (
+                dst / sequence_name / "annotations" / "groundtruth" / "visionai.json"
+            ).read_text()
+        )["visionai"]
+        frame = resized["frames"]["000000000000"]
+        masks[sequence_name] = frame["objects"]["uuid"]["object_data"]["binary"][0][
+            "val"
+        ]
+    assert masks == {"000001": "#5V1", "000002": "#200V1"}
@@ -1,8 +1,20 @@
+import json
+
 import pytest
 
+from visionai_data_format.schemas.adapters import (
+    get_type_adapter,
+    validate_json,
+    validate_python,
+)
 from visionai_data_format.schemas.bdd_schema import BDDSchema
 from visionai_data_format.schemas.coco_schema import COCO
 from visionai_data_format.schemas.visionai_schema import VisionAIModel
+from visionai_data_format.utils.validator import (
+    validate_bdd_json,
+    validate_coco_json,
+    validate_vai_json,
+)
 
 
 def test_coco():
@@ -85,3 +97,34 @@ def test_bdd():
         "frame_list": [],
     }
     assert BDDSchema(**input_data).model_dump() == generated_data
+
+
+def test_type_adapter(fake_objects_visionai_data, fake_generated_objects_visionai_data):
+    assert get_type_adapter(VisionAIModel) is get_type_adapter(VisionAIModel)
+
+    from_python = validate_python(VisionAIModel, fake_objects_visionai_data)
+    from_json = validate_json(
+        VisionAIModel, json.dumps(fake_objects_visionai_data).encode()
+    )
+    assert from_python == from_json
+    assert from_json.model_dump() == fake_generated_objects_visionai_data
+
+
+def test_validate_vai_json(tmp_path, fake_objects_visionai_data):
+    content = json.dumps(fake_objects_visionai_data).encode()
+    file_path = tmp_path / "visionai.json"
+    file_path.write_bytes(content)
+
+    expected = VisionAIModel(**fake_objects_visionai_data)
+    assert validate_vai_json(content) == expected
+    assert validate_vai_json(str(file_path)) == expected
+    assert validate_vai_json(file_path, return_errors=True) == (expected, [])
+
+    model, errors = validate_vai_json(b'{"visionai": {}', return_errors=True)
+    assert model is None
+    assert [error["type"] for error in errors] == ["json_invalid"]
+
+    model, errors = validate_bdd_json(b'{"frame_list": [{}]}', return_errors=True)
+    assert model is None
+    assert errors and all(error["loc"][:2] == ("frame_list", 0) for error in errors)
+    assert validate_coco_json(b"{}") is None
@@ -0,0 +1,48 @@
+import json
+import os
+
+import pytest
+
+from visionai_data_format.schemas.ontology import Ontology
+from visionai_data_format.validate_dataset import validate_dataset
+
+
+@pytest.fixture
+def dataset_root(
+    tmp_path,
+    fake_objects_data_single_lidar,
+    fake_objects_data_wrong_frame_properties_sensor,
+):
+    sequences = [
+        fake_objects_data_single_lidar,
+        fake_objects_data_wrong_frame_properties_sensor,
+        {"visionai": {"frames": {}}},
+    ]
+    for idx, data in enumerate(sequences):
+        annotation_folder = tmp_path / f"{idx:012d}" / "annotations" / "groundtruth"
+        os.makedirs(annotation_folder)
+        with open(annotation_folder / "visionai.json", "w") as f:
+            json.dump(data, f)
+    # folders without annotation are skipped
+    os.makedirs(tmp_path / "not_a_sequence")
+    return str(tmp_path)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate_dataset(dataset_root, fake_visionai_ontology, workers):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    results = []
+
+    summary = validate_dataset(
+        dataset_root, ontology, workers=workers, callback=results.append
+    )
+
+    assert summary["sequences"] == 3
+    assert summary["valid"] == 1
+    assert summary["invalid_sequences"] == [f"{1:012d}", f"{2:012d}"]
+    assert sum(summary["error_counts"].values()) == sum(
+        len(messages) for result in results for messages in result["errors"].values()
+    )
+    results = {result["sequence"]: result for result in results}
+    assert results[f"{0:012d}"]["errors"] == {}
+    assert "VAI_ERR_023" in results[f"{2:012d}"]["errors"]
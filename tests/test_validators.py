@@ -1,9 +1,11 @@
+import copy
 import re
 
 import pytest
 
 from visionai_data_format.exceptions import VisionAIException
 from visionai_data_format.schemas.ontology import Ontology
+from visionai_data_format.schemas.utils.compiled_ontology import compile_ontology
 from visionai_data_format.schemas.visionai_schema import VisionAIModel
 
 
@@ -283,3 +285,80 @@ def test_validate_single_lidar_without_camera_intrinsics_pinhole(
             ontology=ontology,
         )
         raise errors[0]
+
+
+def test_validate_with_ontology_profile(
+    fake_visionai_ontology, fake_objects_data_single_lidar
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    model = VisionAIModel(**fake_objects_data_single_lidar)
+
+    errors, profile = model.validate_with_ontology(
+        ontology=ontology, return_profile=True
+    )
+
+    assert errors == model.validate_with_ontology(ontology=ontology) == []
+    phases = profile["phases"]
+    for check in (
+        "validate_streams",
+        "validate_classes",
+        "validate_attributes",
+        "validate_frame_object_sensors_data",
+        "parse_visionai_frames_objects",
+        "validate_visionai_data",
+    ):
+        assert phases[check]["calls"] >= 1
+        assert 0 <= phases[check]["seconds"] <= profile["wall_seconds"]
+    # checked once for objects and once for contexts
+    sensors_check = phases["validate_frame_object_sensors_data"]
+    assert sensors_check["items"] == sensors_check["calls"] * len(
+        fake_objects_data_single_lidar["visionai"]["frames"]
+    )
+
+
+def test_validate_with_compiled_ontology(
+    fake_visionai_ontology, fake_objects_data_wrong_frame_properties_sensor
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    compiled_ontology = compile_ontology(ontology)
+    model = VisionAIModel(**fake_objects_data_wrong_frame_properties_sensor)
+
+    assert compile_ontology(copy.deepcopy(ontology)) is compiled_ontology
+    assert compile_ontology(compiled_ontology) is compiled_ontology
+    assert compiled_ontology.has_lidar_sensor
+    assert compiled_ontology.classes["objects"] == set(ontology["objects"])
+
+    errors = model.validate_with_ontology(ontology=compiled_ontology)
+    assert errors
+    assert [error.error_code for error in errors] == [
+        error.error_code for error in model.validate_with_ontology(ontology=ontology)
+    ]
+
+
+def test_validate_with_ontology_error_budget(
+    fake_visionai_ontology,
+    fake_objects_data_single_lidar_wrong_visionai_frame_intervals,
+):
+    ontology = Ontology(**fake_visionai_ontology).model_dump(exclude_unset=True)
+    model = VisionAIModel(
+        **fake_objects_data_single_lidar_wrong_visionai_frame_intervals
+    )
+
+    errors = model.validate_with_ontology(ontology=ontology)
+    assert len(errors) == 3
+
+    limited_errors = model.validate_with_ontology(ontology=ontology, max_errors=2)
+    assert [error.error_code for error in limited_errors] == [
+        error.error_code for error in errors[:2]
+    ]
+
+    first_error = model.validate_with_ontology(ontology=ontology, fail_fast=True)
+    assert [error.error_code for error in first_error] == [errors[0].error_code]
+    # the visionai frame intervals error stops the validation before other checks
+    _, profile = model.validate_with_ontology(
+        ontology=ontology, fail_fast=True, return_profile=True
+    )
+    assert "validate_streams" not in profile["phases"]
+
+    with pytest.raises(ValueError):
+        model.validate_with_ontology(ontology=ontology, max_errors=0)
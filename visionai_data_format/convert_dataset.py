@@ -1,11 +1,13 @@
 import argparse
 import logging
+from contextlib import nullcontext
 from typing import Optional
 
 from visionai_data_format.converters.base import ConverterFactory
 from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
 from visionai_data_format.schemas.common import AnnotationFormat, OntologyImageType
 from visionai_data_format.utils.common import YOLO_CATEGORY_FILE
+from visionai_data_format.utils.instrumentation import MetricsRecorder, phase
 
 
 class DatasetConverter:
@@ -30,6 +32,7 @@ class DatasetConverter:
         classes_file_name: str = "classes.txt",
         img_height: Optional[int] = None,
         img_width: Optional[int] = None,
+        metrics: Optional[MetricsRecorder] = None,
     ):
         """Run Dataset Converter
 
@@ -63,7 +66,10 @@ class DatasetConverter:
         classes_file_name: str, by default: "classes.txt",
         img_height: int, optional
         img_width: int, optional
-
+        metrics: MetricsRecorder, optional
+            recorder of phase timings (json_read, validation, sensor_copy,
+            image_probe, json_write ...) and counters (bytes_read, bytes_written,
+            files_copied, frames, objects ...) of this run, by default None
 
         Raises
         ------
@@ -80,23 +86,24 @@ class DatasetConverter:
         )
         if not converter:
             raise VisionAIException(error_code=VisionAIErrorCode.VAI_ERR_001)
-        converter.convert(
-            input_annotation_path=input_annotation_path,
-            output_dest_folder=output_dest_folder,
-            uri_root=uri_root,
-            camera_sensor_name=camera_sensor_name,
-            lidar_sensor_name=lidar_sensor_name,
-            sequence_idx_start=sequence_idx_start,
-            copy_sensor_data=copy_sensor_data,
-            source_data_root=source_data_root,
-            n_frame=n_frame,
-            annotation_name=annotation_name,
-            img_extension=img_extension,
-            ontology_classes=ontology_classes,
-            classes_file_name=classes_file_name,
-            img_height=img_height,
-            img_width=img_width,
-        )
+        with metrics.activate() if metrics else nullcontext(), phase("convert"):
+            converter.convert(
+                input_annotation_path=input_annotation_path,
+                output_dest_folder=output_dest_folder,
+                uri_root=uri_root,
+                camera_sensor_name=camera_sensor_name,
+                lidar_sensor_name=lidar_sensor_name,
+                sequence_idx_start=sequence_idx_start,
+                copy_sensor_data=copy_sensor_data,
+                source_data_root=source_data_root,
+                n_frame=n_frame,
+                annotation_name=annotation_name,
+                img_extension=img_extension,
+                ontology_classes=ontology_classes,
+                classes_file_name=classes_file_name,
+                img_height=img_height,
+                img_width=img_width,
+            )
 
 
 if __name__ == "__main__":
@@ -205,6 +212,19 @@ if __name__ == "__main__":
         action="store_true",
         help="enable to copy image/lidar data",
     )
+    parser.add_argument(
+        "-metrics_output",
+        type=str,
+        default="",
+        help="save phase timings and counters of the conversion to this path",
+    )
+    parser.add_argument(
+        "-metrics_format",
+        type=str,
+        choices=["json", "prometheus"],
+        default="json",
+        help="format of metrics_output",
+    )
     FORMAT = "%(asctime)s[%(process)d][%(levelname)s] %(name)-16s : %(message)s"
     DATEFMT = "[%d-%m-%Y %H:%M:%S]"
 
@@ -218,6 +238,7 @@ if __name__ == "__main__":
 
     if not args.camera_sensor_name and not args.lidar_sensor_name:
         raise VisionAIException(error_code=VisionAIErrorCode.VAI_ERR_002)
+    metrics = MetricsRecorder() if args.metrics_output else None
     DatasetConverter.run(
         input_format=args.input_format,
         output_format=args.output_format,
@@ -237,4 +258,10 @@ if __name__ == "__main__":
         classes_file_name=args.classes_file,
         img_width=args.img_width,
         img_height=args.img_height,
+        metrics=metrics,
     )
+    if metrics:
+        if args.metrics_format == "prometheus":
+            metrics.to_prometheus(file_path=args.metrics_output)
+        else:
+            metrics.to_json(file_path=args.metrics_output)
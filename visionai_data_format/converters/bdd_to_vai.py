@@ -1,14 +1,17 @@
 import json
 import logging
+import mmap
 import os
-import shutil
 import uuid
 from collections import defaultdict
+from typing import List
 
 from visionai_data_format.converters.base import Converter, ConverterFactory
 from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
-from visionai_data_format.schemas.bdd_schema import BDDSchema
+from visionai_data_format.schemas.adapters import get_type_adapter
+from visionai_data_format.schemas.bdd_schema import FrameSchema
 from visionai_data_format.schemas.common import AnnotationFormat, OntologyImageType
+from visionai_data_format.schemas.utils.validators import gen_intervals
 from visionai_data_format.schemas.visionai_schema import (
     Bbox,
     Context,
@@ -23,13 +26,18 @@ from visionai_data_format.schemas.visionai_schema import (
     ObjectDataPointer,
     ObjectType,
     ObjectUnderFrame,
+    Point2D,
+    Poly2D,
     Stream,
     StreamType,
 )
-from visionai_data_format.utils.calculation import xyxy2xywh
+from visionai_data_format.utils.calculation import vertices_to_flat, xyxy2xywh
+from visionai_data_format.utils.common import BBOX_NAME, POINT2D_NAME, POLY2D_NAME
+from visionai_data_format.utils.instrumentation import incr, phase
+from visionai_data_format.utils.json_index import index_member_array
 from visionai_data_format.utils.validator import (
+    copy_sensor_file,
     save_as_json,
-    validate_bdd,
     validate_vai,
 )
 
@@ -37,12 +45,42 @@ __all__ = ["BDDtoVAI"]
 
 logger = logging.getLogger(__name__)
 
+# object data pointer name of each converted shape
+SHAPE_NAMES = {
+    ObjectType.BBOX: BBOX_NAME,
+    ObjectType.POLY2D: POLY2D_NAME,
+    ObjectType.POINT2D: POINT2D_NAME,
+}
+
+
+def _to_frame_intervals(frame_numbers: list[int]) -> list[FrameInterval]:
+    """merge frame numbers to frame intervals, with one sort-and-sweep"""
+    return [
+        FrameInterval(frame_start=start, frame_end=end)
+        for start, end in gen_intervals(frame_numbers)
+    ]
+
 
 @ConverterFactory.register(
     from_=AnnotationFormat.BDDP,
     to_=AnnotationFormat.VISION_AI,
     image_annotation_type=OntologyImageType._2D_BOUNDING_BOX,
 )
+@ConverterFactory.register(
+    from_=AnnotationFormat.BDDP,
+    to_=AnnotationFormat.VISION_AI,
+    image_annotation_type=OntologyImageType.POLYGON,
+)
+@ConverterFactory.register(
+    from_=AnnotationFormat.BDDP,
+    to_=AnnotationFormat.VISION_AI,
+    image_annotation_type=OntologyImageType.POLYLINE,
+)
+@ConverterFactory.register(
+    from_=AnnotationFormat.BDDP,
+    to_=AnnotationFormat.VISION_AI,
+    image_annotation_type=OntologyImageType.POINT,
+)
 class BDDtoVAI(Converter):
     @classmethod
     def convert(
@@ -61,41 +99,59 @@ class BDDtoVAI(Converter):
         **kwargs,
     ) -> None:
         try:
-            raw_data = json.load(open(input_annotation_path))
-            bdd_data = validate_bdd(raw_data).model_dump()
-            # create sequence/frame/mapping
-            sequence_frames = defaultdict(list)
-            for frame in bdd_data["frame_list"]:
-                seq_name = frame["sequence"]
-                dataset_name = frame["dataset"]
-                storage_name = frame["storage"]
-                sequence_frames[(storage_name, dataset_name, seq_name)].append(frame)
-            # one bdd file might contain mutiple sequences
-            seq_id = sequence_idx_start
-            for sequence_key, frame_list in sequence_frames.items():
-                if n_frame > 0:
-                    frame_count = len(frame_list)
-                    if n_frame < frame_count:
-                        frame_list = frame_list[:n_frame]
-                    n_frame -= len(frame_list)
-                sequence_bdd_data = BDDSchema(frame_list=frame_list).model_dump()
-                sequence_name = f"{seq_id:012d}"
-                logger.info(f"convert sequence {sequence_key} to {sequence_name}")
-                cls.convert_sequence_bdd_to_vai(
-                    bdd_data=sequence_bdd_data,
-                    vai_dest_folder=output_dest_folder,
-                    camera_sensor_name=camera_sensor_name,
-                    lidar_sensor_name=lidar_sensor_name,
-                    sequence_name=sequence_name,
-                    uri_root=uri_root,
-                    annotation_name=annotation_name,
-                    img_extension=img_extension,
-                    copy_sensor_data=copy_sensor_data,
-                    source_data_root=source_data_root,
-                )
-                seq_id += 1
-                if n_frame == 0:
-                    break
+            frame_adapter = get_type_adapter(List[FrameSchema])
+            with open(input_annotation_path, "rb") as f, mmap.mmap(
+                f.fileno(), 0, access=mmap.ACCESS_READ
+            ) as mm:
+                incr("bytes_read", len(mm))
+                # only the byte spans of frames are kept, grouped by sequence,
+                # frames are decoded again when their sequence is converted
+                with phase("json_index"):
+                    frame_spans = index_member_array(mm, "frame_list")
+                sequence_spans = defaultdict(list)
+                with phase("json_parse", items=len(frame_spans)):
+                    for start, end in frame_spans:
+                        frame = json.loads(mm[start:end])
+                        sequence_key = (
+                            frame["storage"],
+                            frame["dataset"],
+                            frame["sequence"],
+                        )
+                        sequence_spans[sequence_key].append((start, end))
+                del frame_spans
+                # one bdd file might contain mutiple sequences
+                seq_id = sequence_idx_start
+                for sequence_key, spans in sequence_spans.items():
+                    if n_frame > 0:
+                        frame_count = len(spans)
+                        if n_frame < frame_count:
+                            spans = spans[:n_frame]
+                        n_frame -= len(spans)
+                    with phase("json_parse", items=len(spans)):
+                        frame_list = [json.loads(mm[start:end]) for start, end in spans]
+                    # validate the frames of this sequence only
+                    with phase("validation", items=len(frame_list)):
+                        frame_list = frame_adapter.dump_python(
+                            frame_adapter.validate_python(frame_list), warnings=False
+                        )
+                    sequence_name = f"{seq_id:012d}"
+                    logger.info(f"convert sequence {sequence_key} to {sequence_name}")
+                    cls.convert_sequence_bdd_to_vai(
+                        bdd_data={"frame_list": frame_list},
+                        vai_dest_folder=output_dest_folder,
+                        camera_sensor_name=camera_sensor_name,
+                        lidar_sensor_name=lidar_sensor_name,
+                        sequence_name=sequence_name,
+                        uri_root=uri_root,
+                        annotation_name=annotation_name,
+                        img_extension=img_extension,
+                        copy_sensor_data=copy_sensor_data,
+                        source_data_root=source_data_root,
+                    )
+                    del frame_list
+                    seq_id += 1
+                    if n_frame == 0:
+                        break
         except Exception as e:
             logger.error("Convert bdd to vai format failed : " + str(e))
 
@@ -128,10 +184,27 @@ class BDDtoVAI(Converter):
                 f"[convert_bdd_to_vai] Convert started (copy sensor data is {copy_sensor_data})"
             )
             frames: dict[str, Frame] = defaultdict(Frame)
-            objects: dict[str, Object] = defaultdict(Object)
+            objects: dict[str, Object] = {}
+            # class, frame numbers and data pointers of each object track
+            object_classes: dict[str, str] = {}
+            object_frames: dict[str, list[int]] = defaultdict(list)
+            pointer_types: dict[str, dict[str, str]] = defaultdict(dict)
+            pointer_frames: dict[tuple[str, str], list[int]] = defaultdict(list)
+            pointer_attrs: dict[tuple[str, str], dict] = defaultdict(dict)
             contexts: dict[str, Context] = defaultdict(Context)
             context_pointers: dict[str, dict] = defaultdict(dict)
             context_cat: dict[str, str] = {}
+            # flat values of the poly2d labels of all frames, in label order
+            flat_vals = iter(
+                vertices_to_flat(
+                    [
+                        poly_info["vertices"]
+                        for frame in frame_list
+                        for label in frame.get("labels", [])
+                        for poly_info in label.get("poly2d") or []
+                    ]
+                )
+            )
             for i, frame in enumerate(frame_list):
                 frame_idx = f"{i:012d}"
                 if copy_sensor_data:
@@ -146,7 +219,7 @@ class BDDtoVAI(Converter):
                         vai_dest_folder, sequence_name, "data", camera_sensor_name
                     )
                     os.makedirs(img_dest_dir, exist_ok=True)
-                    shutil.copy2(
+                    copy_sensor_file(
                         img_source,
                         os.path.join(img_dest_dir, frame_idx + img_extension),
                     )
@@ -167,23 +240,21 @@ class BDDtoVAI(Converter):
                         streams={camera_sensor_name: FramePropertyStream(uri=url)}
                     ),
                 )
-                frame_intervals = [FrameInterval(frame_end=i, frame_start=i)]
-
                 if not labels:
                     logger.info(
                         f"[convert_bdd_to_vai] No labels in this frame : {frame['sequence']}/{frame['name']}"
                     )
                 for label in labels:
                     box2d = label.get("box2d", None)
-                    # only convert box2D objects for now
-                    if box2d is None:
+                    poly_infos = label.get("poly2d") or []
+                    point_infos = label.get("point2d") or []
+                    if box2d is None and not poly_infos and not point_infos:
                         logger.info(
-                            f"The label shape of {label} in {frame['sequence']}/{frame['name']} is not box2d"
+                            f"The label {label} in {frame['sequence']}/{frame['name']} has no box2d, poly2d or point2d"
                         )
                         continue
                     category = label["category"]
                     obj_uuid = label.get("uuid", str(uuid.uuid4()))
-                    x, y, w, h = xyxy2xywh(box2d)
                     confidence_score = label.get("meta_ds", {}).get("score", None)
                     # Get object attribute data
                     attributes = label["attributes"]
@@ -219,35 +290,64 @@ class BDDtoVAI(Converter):
                                     {"name": attr_name, "val": [attr_value]}
                                 )
 
+                    shape_data = {}
+                    if box2d is not None:
+                        x, y, w, h = xyxy2xywh(box2d)
+                        shape_data[ObjectType.BBOX.value] = [
+                            Bbox(
+                                name=BBOX_NAME,
+                                val=[x, y, w, h],
+                                stream=camera_sensor_name,
+                                confidence_score=confidence_score,
+                                attributes=frame_obj_attr,
+                            )
+                        ]
+                    if poly_infos:
+                        shape_data[ObjectType.POLY2D.value] = [
+                            Poly2D(
+                                name=POLY2D_NAME,
+                                val=next(flat_vals),
+                                closed=poly_info["closed"],
+                                stream=camera_sensor_name,
+                                confidence_score=confidence_score,
+                                attributes=frame_obj_attr,
+                            )
+                            for poly_info in poly_infos
+                        ]
+                    if point_infos:
+                        # each vertex of point2d labels is a point
+                        shape_data[ObjectType.POINT2D.value] = [
+                            Point2D(
+                                name=POINT2D_NAME,
+                                val=vertex[:2],
+                                stream=camera_sensor_name,
+                                confidence_score=confidence_score,
+                                attributes=frame_obj_attr,
+                            )
+                            for point_info in point_infos
+                            for vertex in point_info["vertices"]
+                        ]
                     object_under_frames = {
                         obj_uuid: ObjectUnderFrame(
-                            object_data=DynamicObjectData(
-                                bbox=[
-                                    Bbox(
-                                        name="bbox_shape",
-                                        val=[x, y, w, h],
-                                        stream=camera_sensor_name,
-                                        confidence_score=confidence_score,
-                                        attributes=frame_obj_attr,
-                                    )
-                                ]
-                            )
+                            object_data=DynamicObjectData(**shape_data)
                         )
                     }
                     frame_data.objects.update(object_under_frames)
 
-                    objects[obj_uuid] = Object(
-                        name=category,
-                        type=category,
-                        frame_intervals=frame_intervals,
-                        object_data_pointers={
-                            "bbox_shape": ObjectDataPointer(
-                                type=ObjectType.BBOX,
-                                frame_intervals=frame_intervals,
-                                attributes=object_data_pointers_attr,
-                            )
-                        },
-                    )
+                    # objects are built once all their frames are known
+                    if object_classes.setdefault(obj_uuid, category) != category:
+                        logger.warning(
+                            f"[convert_bdd_to_vai] object {obj_uuid} of {object_classes[obj_uuid]}"
+                            + f" is labeled as {category} in {frame['sequence']}/{frame['name']}"
+                        )
+                    object_frames[obj_uuid].append(i)
+                    for shape in shape_data:
+                        pointer_name = SHAPE_NAMES[ObjectType(shape)]
+                        pointer_types[obj_uuid][pointer_name] = shape
+                        pointer_frames[(obj_uuid, pointer_name)].append(i)
+                        pointer_attrs[(obj_uuid, pointer_name)].update(
+                            object_data_pointers_attr
+                        )
 
                 # frame tagging data (contexts)
                 tagging_frame_intervals = [FrameInterval(frame_end=i, frame_start=0)]
@@ -325,6 +425,23 @@ class BDDtoVAI(Converter):
 
                 frames[frame_idx] = frame_data
 
+            for obj_uuid, frame_numbers in object_frames.items():
+                objects[obj_uuid] = Object(
+                    name=object_classes[obj_uuid],
+                    type=object_classes[obj_uuid],
+                    frame_intervals=_to_frame_intervals(frame_numbers),
+                    object_data_pointers={
+                        pointer_name: ObjectDataPointer(
+                            type=shape,
+                            frame_intervals=_to_frame_intervals(
+                                pointer_frames[(obj_uuid, pointer_name)]
+                            ),
+                            attributes=pointer_attrs[(obj_uuid, pointer_name)],
+                        )
+                        for pointer_name, shape in pointer_types[obj_uuid].items()
+                    },
+                )
+
             frame_intervals = [FrameInterval(frame_end=i, frame_start=0)]
             for context_id, context_pointer_value in context_pointers.items():
                 contexts[context_id].update(
@@ -349,6 +466,8 @@ class BDDtoVAI(Converter):
                 vai_data["visionai"].pop("contexts")
 
             vai_data = validate_vai(vai_data).model_dump(exclude_none=True)
+            incr("frames", len(vai_data["visionai"]["frames"]))
+            incr("objects", len(vai_data["visionai"].get("objects", {})))
             save_as_json(
                 vai_data,
                 folder_name=os.path.join(
@@ -1,7 +1,5 @@
-import json
 import logging
 import os
-import shutil
 import uuid
 from collections import defaultdict
 from typing import Optional
@@ -10,20 +8,17 @@ from visionai_data_format.converters.base import Converter, ConverterFactory
 from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
 from visionai_data_format.schemas.common import AnnotationFormat, OntologyImageType
 from visionai_data_format.schemas.visionai_schema import (
-    Bbox,
-    DynamicObjectData,
-    Frame,
     FrameInterval,
-    FrameProperties,
-    FramePropertyStream,
     Object,
     ObjectDataPointer,
     ObjectType,
-    ObjectUnderFrame,
     Stream,
     StreamType,
 )
+from visionai_data_format.utils.instrumentation import incr
 from visionai_data_format.utils.validator import (
+    copy_sensor_file,
+    load_json,
     save_as_json,
     validate_coco,
     validate_vai,
@@ -57,7 +52,7 @@ class COCOtoVAI(Converter):
         **kwargs,
     ) -> None:
         try:
-            raw_data = json.load(open(input_annotation_path))
+            raw_data = load_json(input_annotation_path)
             coco_json_data = validate_coco(raw_data).model_dump()
 
             class_id_name_map: dict[str, str] = {
@@ -105,6 +100,8 @@ class COCOtoVAI(Converter):
                     class_id_name_map=class_id_name_map,
                     img_id_annotations_map=img_id_annotations_map,
                 )
+                incr("frames", len(vai_data["visionai"]["frames"]))
+                incr("objects", len(vai_data["visionai"].get("objects", {})))
                 save_as_json(
                     vai_data,
                     folder_name=os.path.join(
@@ -168,17 +165,18 @@ class COCOtoVAI(Converter):
             )
             if copy_sensor_data:
                 os.makedirs(dest_camera_folder, exist_ok=True)
-                shutil.copy2(image_file_path, dest_camera_path)
+                copy_sensor_file(image_file_path, dest_camera_path)
 
             camera_url = os.path.join(uri_root, dest_camera_path)
 
-            # generate frames below visionai
-            frames[frame_num] = Frame(
-                frame_properties=FrameProperties(
-                    streams={camera_sensor_name: FramePropertyStream(uri=camera_url)}
-                ),
-                objects={},
-            )
+            # generate frames below visionai, plain dictionaries are validated
+            # once by `validate_vai` instead of building models per object
+            frames[frame_num] = {
+                "frame_properties": {
+                    "streams": {camera_sensor_name: {"uri": camera_url}}
+                },
+                "objects": {},
+            }
 
             # parse coco: annotations
             for idx, annot_info in enumerate(img_id_annotations_map.pop(img_id, [])):
@@ -193,20 +191,17 @@ class COCOtoVAI(Converter):
                     height,
                 ]
 
-                objects_under_frames = {
-                    object_id: ObjectUnderFrame(
-                        object_data=DynamicObjectData(
-                            bbox=[
-                                Bbox(
-                                    name=bbox_name,
-                                    val=bbox,
-                                    stream=camera_sensor_name,
-                                )
-                            ]
-                        )
-                    )
+                frames[frame_num]["objects"][object_id] = {
+                    "object_data": {
+                        "bbox": [
+                            {
+                                "name": bbox_name,
+                                "val": bbox,
+                                "stream": camera_sensor_name,
+                            }
+                        ]
+                    }
                 }
-                frames[frame_num].objects.update(objects_under_frames)
 
                 # to vision_ai: objects
                 object_under_vai = {
@@ -1,7 +1,6 @@
 import logging
 import math
 import os
-import shutil
 import uuid
 
 import cv2
@@ -38,7 +37,9 @@ from visionai_data_format.utils.common import (
     KITTI_ROT_Y,
     VISIONAI_JSON,
 )
+from visionai_data_format.utils.instrumentation import incr, phase
 from visionai_data_format.utils.validator import (
+    copy_sensor_file,
     parse_calib_data,
     save_as_json,
     validate_vai,
@@ -200,7 +201,7 @@ class KITTItoVAI(Converter):
                 )
                 if copy_sensor_data:
                     os.makedirs(dest_camera_folder, exist_ok=True)
-                    shutil.copy2(image_file_path, dest_camera_path)
+                    copy_sensor_file(image_file_path, dest_camera_path)
 
             if lidar_sensor_name:
                 dest_lidar_folder = os.path.join(
@@ -216,7 +217,7 @@ class KITTItoVAI(Converter):
                 )
                 if copy_sensor_data:
                     os.makedirs(dest_lidar_folder, exist_ok=True)
-                    shutil.copy2(pcd_path, dest_lidar_path)
+                    copy_sensor_file(pcd_path, dest_lidar_path)
 
             frames[frame_num] = Frame(
                 frame_properties=FrameProperties(**frame_properties),
@@ -384,7 +385,8 @@ class KITTItoVAI(Converter):
 
             camera_stream_properties = {}
             if dict_calib.get("camera_matrix_3x4"):
-                img = cv2.imread(image_file_path)
+                with phase("image_probe"):
+                    img = cv2.imread(image_file_path)
                 img_height, img_width = img.shape[:2]
                 camera_stream_properties = {
                     "intrinsics_pinhole": {
@@ -424,6 +426,8 @@ class KITTItoVAI(Converter):
                 }
             }
             vai_data = validate_vai(vai_data).model_dump(exclude_none=True)
+            incr("frames", len(vai_data["visionai"]["frames"]))
+            incr("objects", len(vai_data["visionai"].get("objects", {})))
             save_as_json(
                 vai_data,
                 folder_name=os.path.join(
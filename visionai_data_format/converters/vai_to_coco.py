@@ -17,6 +17,8 @@ from visionai_data_format.utils.common import (
     IMAGE_EXT,
     VISIONAI_JSON,
 )
+from visionai_data_format.utils.instrumentation import incr, phase
+from visionai_data_format.utils.validator import copy_sensor_file, load_json
 
 __all__ = ["VAItoCOCO"]
 
@@ -65,8 +67,7 @@ class VAItoCOCO(Converter):
                 VISIONAI_JSON,
             )
             logger.info(f"retrieve annotation from {annotation_path}")
-            with open(annotation_path) as f:
-                visionai_dict_list.append(json.load(f))
+            visionai_dict_list.append(load_json(annotation_path))
 
         logger.info("retrieve visionai annotations finished")
 
@@ -92,8 +93,11 @@ class VAItoCOCO(Converter):
         )
         logger.info("convert visionai to coco format finished")
 
-        with open(os.path.join(dest_json_folder, COCO_LABEL_FILE), "w+") as f:
+        with phase("json_write"), open(
+            os.path.join(dest_json_folder, COCO_LABEL_FILE), "w+"
+        ) as f:
             json.dump(coco.model_dump(), f, indent=4)
+            incr("bytes_written", f.tell())
 
     @staticmethod
     def convert_single_visionai_to_coco(
@@ -179,10 +183,13 @@ class VAItoCOCO(Converter):
                     ".jpeg",
                 ]:
                     raise ValueError("The image data type is not supported")
-                shutil.copy(source_image_path, dest_coco_img)
+                copy_sensor_file(
+                    source_image_path, dest_coco_img, copy_function=shutil.copy
+                )
             if img_width is None or img_height is None:
-                img = PILImage.open(source_image_path)
-                img_width, img_height = img.size
+                with phase("image_probe"):
+                    img = PILImage.open(source_image_path)
+                    img_width, img_height = img.size
             image = Image(
                 id=image_id,
                 width=img_width,
@@ -192,11 +199,13 @@ class VAItoCOCO(Converter):
                 # assume there is only one sensor, so there is only one img url per frame
             )
             images.append(image)
+            incr("frames")
 
             if not frame_data.get("objects", None):
                 image_id += 1
                 continue
 
+            incr("annotations", len(frame_data["objects"]))
             for object_id, object_v in frame_data["objects"].items():
                 # from [center x, center y, width, height] to [top left x, top left y, width, height]
                 center_x, center_y, width, height = object_v["object_data"]["bbox"][0][
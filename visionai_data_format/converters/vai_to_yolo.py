@@ -1,4 +1,3 @@
-import json
 import logging
 import os
 import shutil
@@ -16,6 +15,8 @@ from visionai_data_format.utils.common import (
     YOLO_IMAGE_FOLDER,
     YOLO_LABEL_FOLDER,
 )
+from visionai_data_format.utils.instrumentation import incr, phase
+from visionai_data_format.utils.validator import copy_sensor_file, load_json
 
 __all__ = ["VAItoYOLO"]
 
@@ -78,8 +79,7 @@ class VAItoYOLO(Converter):
                 annotation_name,
                 VISIONAI_JSON,
             )
-            with open(annotation_path) as f:
-                visionai_dict = json.load(f)
+            visionai_dict = load_json(annotation_path)
             (
                 category_map,
                 image_labels_map,
@@ -103,8 +103,9 @@ class VAItoYOLO(Converter):
                     f"{dest_label_folder}/{img_path.split('/')[-1].split('.')[0] }.txt"
                 )
                 dump_annotation = "\n".join(labels)
-                with open(label_path, "w") as f:
+                with phase("label_write"), open(label_path, "w") as f:
                     f.write(dump_annotation)
+                    incr("bytes_written", f.tell())
         dest_category_path = os.path.join(output_dest_folder, YOLO_CATEGORY_FILE)
         if not category_map:
             logging.info("No annotation objects are found. Category file is empty.")
@@ -191,16 +192,21 @@ class VAItoYOLO(Converter):
                     ".jpeg",
                 ]:
                     raise ValueError("The image data type is not supported")
-                shutil.copy(source_image_path, dest_yolo_img)
+                copy_sensor_file(
+                    source_image_path, dest_yolo_img, copy_function=shutil.copy
+                )
             if img_width is None or img_height is None:
-                img = PILImage.open(source_image_path)
-                img_width, img_height = img.size
+                with phase("image_probe"):
+                    img = PILImage.open(source_image_path)
+                    img_width, img_height = img.size
             image_labels_map[dest_yolo_url] = []
+            incr("frames")
 
             if not frame_data.get("objects", None):
                 image_id += 1
                 continue
 
+            incr("annotations", len(frame_data["objects"]))
             for object_id, object_v in frame_data["objects"].items():
                 # from [center x, center y, width, height] to [n-center x, n-center y, n-width, n-height]
                 center_x, center_y, width, height = object_v["object_data"]["bbox"][0][
@@ -1,6 +1,5 @@
 import logging
 import os
-import shutil
 import uuid
 from pathlib import Path
 from typing import Optional
@@ -11,21 +10,20 @@ from visionai_data_format.converters.base import Converter, ConverterFactory
 from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
 from visionai_data_format.schemas.common import AnnotationFormat, OntologyImageType
 from visionai_data_format.schemas.visionai_schema import (
-    Bbox,
-    DynamicObjectData,
-    Frame,
     FrameInterval,
-    FrameProperties,
-    FramePropertyStream,
     Object,
     ObjectDataPointer,
     ObjectType,
-    ObjectUnderFrame,
     Stream,
     StreamType,
 )
 from visionai_data_format.utils.common import YOLO_IMAGE_FOLDER, YOLO_LABEL_FOLDER
-from visionai_data_format.utils.validator import save_as_json, validate_vai
+from visionai_data_format.utils.instrumentation import incr, phase
+from visionai_data_format.utils.validator import (
+    copy_sensor_file,
+    save_as_json,
+    validate_vai,
+)
 
 __all__ = ["YOLOtoVAI"]
 
@@ -125,8 +123,9 @@ class YOLOtoVAI(Converter):
                     label_list = []
                 dest_sequence_name = f"{sequence_idx:012d}"
                 if not img_height or not img_width:
-                    img = Image.open(str(img_file))
-                    img_width, img_height = img.size
+                    with phase("image_probe"):
+                        img = Image.open(str(img_file))
+                        img_width, img_height = img.size
 
                 vai_data = cls.convert_yolo_label_vai(
                     image_file_path=str(img_file),
@@ -142,6 +141,8 @@ class YOLOtoVAI(Converter):
                     copy_sensor_data=copy_sensor_data,
                 )
 
+                incr("frames", len(vai_data["visionai"]["frames"]))
+                incr("objects", len(vai_data["visionai"].get("objects", {})))
                 save_as_json(
                     vai_data,
                     folder_name=os.path.join(
@@ -199,17 +200,18 @@ class YOLOtoVAI(Converter):
             )
             if copy_sensor_data:
                 os.makedirs(dest_camera_folder, exist_ok=True)
-                shutil.copy2(image_file_path, dest_camera_path)
+                copy_sensor_file(image_file_path, dest_camera_path)
 
             camera_url = os.path.join(uri_root, dest_camera_path)
 
-            # generate frames below visionai
-            frames[frame_num] = Frame(
-                frame_properties=FrameProperties(
-                    streams={camera_sensor_name: FramePropertyStream(uri=camera_url)}
-                ),
-                objects={},
-            )
+            # generate frames below visionai, plain dictionaries are validated
+            # once by `validate_vai` instead of building models per object
+            frames[frame_num] = {
+                "frame_properties": {
+                    "streams": {camera_sensor_name: {"uri": camera_url}}
+                },
+                "objects": {},
+            }
             streams = {camera_sensor_name: Stream(type=StreamType.CAMERA)}
             frame_intervals = [FrameInterval(frame_start=0, frame_end=0)]
             # parse yolo-labels
@@ -222,20 +224,17 @@ class YOLOtoVAI(Converter):
 
                 bbox = cls.nxywh2xywh(obj=obj, img_h=img_height, img_w=img_width)
 
-                objects_under_frames = {
-                    object_id: ObjectUnderFrame(
-                        object_data=DynamicObjectData(
-                            bbox=[
-                                Bbox(
-                                    name=bbox_name,
-                                    val=bbox,
-                                    stream=camera_sensor_name,
-                                )
-                            ]
-                        )
-                    )
+                frames[frame_num]["objects"][object_id] = {
+                    "object_data": {
+                        "bbox": [
+                            {
+                                "name": bbox_name,
+                                "val": list(bbox),
+                                "stream": camera_sensor_name,
+                            }
+                        ]
+                    }
                 }
-                frames[frame_num].objects.update(objects_under_frames)
 
                 # to vision_ai: objects
                 object_under_vai = {
@@ -1,3 +1,4 @@
 from .constants import VisionAIErrorCode  # noqa
 from .error_messages import VAI_ERROR_MESSAGES_MAP  # noqa
+from .report import ValidationIssue, ValidationReport  # noqa
 from .visionai import VisionAIException  # noqa
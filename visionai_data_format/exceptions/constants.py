@@ -47,4 +47,6 @@ class VisionAIErrorCode(str, Enum):
     VAI_ERR_042 = "VAI_ERR_042"
     VAI_ERR_043 = "VAI_ERR_043"
     VAI_ERR_044 = "VAI_ERR_044"
+    VAI_ERR_045 = "VAI_ERR_045"
+    VAI_ERR_046 = "VAI_ERR_046"
     VAI_ERR_999 = "VAI_ERR_999"
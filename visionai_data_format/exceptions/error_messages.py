@@ -77,5 +77,9 @@ VAI_ERROR_MESSAGES_MAP = {
     VisionAIErrorCode.VAI_ERR_043: "Invalid Run-Length Encoding (RLE) format: {rle_data}",
     VisionAIErrorCode.VAI_ERR_044: "RLE data exceeds image dimensions. RLE length: {rle_length}, "
     + "image width: {image_width}, image height: {image_height}",
+    VisionAIErrorCode.VAI_ERR_045: "The columnar storage file {file_name} has unsupported"
+    + " format version {version}.",
+    VisionAIErrorCode.VAI_ERR_046: "The visionai data fingerprint {fingerprint} doesn't match"
+    + " with the patch fingerprint {patch_fingerprint}.",
     VisionAIErrorCode.VAI_ERR_999: "An invalid process has been identified.",
 }
@@ -0,0 +1,155 @@
+import json
+from collections import Counter
+from enum import Enum
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from .visionai import VisionAIException
+
+__all__ = ["ValidationIssue", "ValidationReport"]
+
+
+class ValidationIssue(NamedTuple):
+    error_code: str
+    location: str = ""
+    message: str = ""
+
+    def to_dict(self) -> Dict[str, str]:
+        return {
+            "error_code": self.error_code,
+            "location": self.location,
+            "message": self.message,
+        }
+
+
+def _error_code_value(error_code: Any) -> str:
+    return error_code.value if isinstance(error_code, Enum) else str(error_code)
+
+
+class ValidationReport:
+    """Machine readable validation result of a sequence
+
+    A report holds one `ValidationIssue` (error code, location path under visionai
+    and optional message) per error and the number of errors per error code.
+    It serializes to plain JSON types, and reports of many sequences can be
+    aggregated with `merge` or `ValidationReport.aggregate`.
+
+    Usage:
+        errors = VisionAIModel(**data).validate_with_ontology(ontology)
+        report = ValidationReport.from_exceptions(errors, sequence="000000000000")
+        report.to_json()
+    """
+
+    def __init__(
+        self,
+        sequence: str = "",
+        issues: Optional[Iterable[ValidationIssue]] = None,
+    ) -> None:
+        self.sequence = sequence
+        self.issues: List[ValidationIssue] = []
+        self.counts: Counter = Counter()
+        self.n_sequences = 1
+        self.invalid_sequences: List[str] = []
+        for issue in issues or []:
+            self.add_issue(issue)
+
+    @property
+    def valid(self) -> bool:
+        return not self.counts
+
+    def add_issue(self, issue: ValidationIssue) -> None:
+        if not self.counts and self.sequence:
+            self.invalid_sequences.append(self.sequence)
+        self.issues.append(issue)
+        self.counts[issue.error_code] += 1
+
+    def add_exception(
+        self, exc: VisionAIException, include_message: bool = True
+    ) -> None:
+        """add a VisionAIException, messages are only formatted if included"""
+        self.add_issue(
+            ValidationIssue(
+                error_code=_error_code_value(exc.error_code),
+                location=exc.location,
+                message=exc.error_message if include_message else "",
+            )
+        )
+
+    def add_schema_errors(
+        self, errors: List[Dict[str, Any]], include_message: bool = True
+    ) -> None:
+        """add errors of `visionai_data_format.utils.validator.get_validation_errors`"""
+        for error in errors:
+            self.add_issue(
+                ValidationIssue(
+                    error_code=_error_code_value(error["type"]),
+                    location="/".join(str(loc) for loc in error["loc"]),
+                    message=error["msg"] if include_message else "",
+                )
+            )
+
+    @classmethod
+    def from_exceptions(
+        cls,
+        errors: Iterable[VisionAIException],
+        sequence: str = "",
+        include_message: bool = True,
+    ) -> "ValidationReport":
+        report = cls(sequence=sequence)
+        for exc in errors:
+            report.add_exception(exc, include_message=include_message)
+        return report
+
+    def merge(self, other: "ValidationReport") -> None:
+        """add the issues and counts of the report of another sequence"""
+        self.issues += other.issues
+        self.counts.update(other.counts)
+        self.n_sequences += other.n_sequences
+        self.invalid_sequences += other.invalid_sequences
+
+    @classmethod
+    def aggregate(
+        cls, reports: Iterable["ValidationReport"], keep_issues: bool = False
+    ) -> "ValidationReport":
+        """aggregate reports of many sequences, issues are dropped by default"""
+        aggregated = cls()
+        aggregated.n_sequences = 0
+        for report in reports:
+            aggregated.merge(report)
+            if not keep_issues:
+                aggregated.issues = []
+        return aggregated
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {
+            "valid": self.valid,
+            "counts": dict(self.counts),
+            "issues": [issue.to_dict() for issue in self.issues],
+        }
+        if self.n_sequences == 1 and self.sequence:
+            data["sequence"] = self.sequence
+        else:
+            data["n_sequences"] = self.n_sequences
+            data["invalid_sequences"] = self.invalid_sequences
+        return data
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ValidationReport":
+        report = cls(
+            sequence=data.get("sequence", ""),
+            issues=[ValidationIssue(**issue) for issue in data.get("issues", [])],
+        )
+        # counts of aggregated reports may not have their issues
+        report.counts = Counter(data.get("counts", {}))
+        if "n_sequences" in data:
+            report.n_sequences = data["n_sequences"]
+            report.invalid_sequences = list(data.get("invalid_sequences", []))
+        return report
+
+    def __repr__(self) -> str:
+        return (
+            f"{type(self).__name__}(sequence={self.sequence!r}, "
+            + f"counts={dict(self.counts)!r})"
+        )
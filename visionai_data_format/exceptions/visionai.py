@@ -1,5 +1,6 @@
 import logging
-from typing import Dict, List, Optional, Union
+from itertools import islice
+from typing import Any, Optional
 
 from pydantic import StrictStr
 
@@ -10,30 +11,97 @@ logger = logging.getLogger(__name__)
 
 
 class VisionAIException(Exception):
+    """VisionAI error with its error code and message kwargs
+
+    The message is formatted from `VAI_ERROR_MESSAGES_MAP` at its first access,
+    since validations may create many errors that are never displayed.
+    Collections with more than `MAX_COLLECTION_ITEMS` items, such as frame lists,
+    are summarized in the message by their first items and their length.
+    `location` is the path of the invalid data under visionai, such as
+    `frames/000000000012/objects/<uuid>`, derived from the message kwargs
+    if not given.
+    """
+
+    MAX_COLLECTION_ITEMS = 20
+
     error_code: Optional[VisionAIErrorCode] = None
-    error_message: Optional[str] = None
     message_kwargs: dict = {}
 
     def __init__(
-        self, error_code: StrictStr, message_kwargs: Optional[dict] = None
-    ) -> Dict[StrictStr, Union[StrictStr, List[StrictStr]]]:
+        self,
+        error_code: StrictStr,
+        message_kwargs: Optional[dict] = None,
+        location: Optional[str] = None,
+    ) -> None:
         if message_kwargs is None:
             message_kwargs = dict()
 
-        # We retrieve error message map for its error code
-        error_message_str: dict[
-            StrictStr, Union[List[StrictStr], StrictStr]
-        ] = VAI_ERROR_MESSAGES_MAP[error_code]
-
-        # we can assign message kwargs for these keys
-        # since each keys is a string with variable
-        new_error_message = ""
-        try:
-            new_error_message: StrictStr = error_message_str.format(**message_kwargs)
-        except KeyError:
-            logger.exception(f"Missing required string keys for {error_code}")
-
         self.error_code = error_code
-        self.error_message = new_error_message
         self.message_kwargs = message_kwargs
-        super().__init__(new_error_message)
+        self._location = location
+        self._error_message: Optional[str] = None
+        # keep the exception picklable with its kwargs instead of its message
+        super().__init__(error_code, message_kwargs)
+
+    def __reduce__(self):
+        return type(self), (self.error_code, self.message_kwargs, self._location)
+
+    @property
+    def location(self) -> str:
+        if self._location is not None:
+            return self._location
+        kwargs = self.message_kwargs
+        if "frame_num" in kwargs:
+            return f"frames/{kwargs['frame_num']}"
+        if "root_key" in kwargs and "data_uuid" in kwargs:
+            return f"{kwargs['root_key']}/{kwargs['data_uuid']}"
+        return ""
+
+    @classmethod
+    def summarize(cls, value: Any) -> Any:
+        """shorten collections larger than `MAX_COLLECTION_ITEMS` for messages"""
+        if not isinstance(value, (list, tuple, set, frozenset, dict)):
+            return value
+        if len(value) <= cls.MAX_COLLECTION_ITEMS:
+            return value
+        if isinstance(value, dict):
+            items = [
+                f"{key!r}: {val!r}"
+                for key, val in islice(value.items(), cls.MAX_COLLECTION_ITEMS)
+            ]
+        else:
+            items = [repr(item) for item in islice(value, cls.MAX_COLLECTION_ITEMS)]
+        brackets = "[]" if isinstance(value, list) else "()"
+        if isinstance(value, (set, frozenset, dict)):
+            brackets = "{}"
+        return (
+            f"{brackets[0]}{', '.join(items)}, ...{brackets[1]}"
+            + f" ({len(value)} items)"
+        )
+
+    @property
+    def error_message(self) -> str:
+        if self._error_message is None:
+            # We retrieve error message map for its error code
+            error_message_str: StrictStr = VAI_ERROR_MESSAGES_MAP[self.error_code]
+
+            # we can assign message kwargs for these keys
+            # since each keys is a string with variable
+            new_error_message = ""
+            try:
+                new_error_message = error_message_str.format(
+                    **{
+                        key: self.summarize(value)
+                        for key, value in self.message_kwargs.items()
+                    }
+                )
+            except KeyError:
+                logger.exception(f"Missing required string keys for {self.error_code}")
+            self._error_message = new_error_message
+        return self._error_message
+
+    def __str__(self) -> str:
+        return self.error_message
+
+    def __repr__(self) -> str:
+        return f"{type(self).__module__}.{type(self).__name__}({self.error_message!r})"
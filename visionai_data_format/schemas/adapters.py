@@ -0,0 +1,41 @@
+from functools import lru_cache
+from typing import Any, Union
+
+from pydantic import TypeAdapter
+
+__all__ = ["get_type_adapter", "validate_python", "validate_json"]
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(type_: Any) -> TypeAdapter:
+    """Retrieve the cached TypeAdapter of `type_`
+
+    The core validator of the adapter is built only once at its first use,
+    then reused by each validation of the same type.
+
+    Parameters
+    ----------
+    type_ : Any
+        model or type annotation to validate, such as `VisionAIModel`
+        or `Dict[str, Frame]`
+
+    Returns
+    -------
+    TypeAdapter
+        cached TypeAdapter of `type_`
+    """
+    return TypeAdapter(type_)
+
+
+def validate_python(type_: Any, data: Any, **kwargs) -> Any:
+    """validate python object `data` as `type_` with the cached TypeAdapter"""
+    return get_type_adapter(type_).validate_python(data, **kwargs)
+
+
+def validate_json(type_: Any, data: Union[str, bytes, bytearray], **kwargs) -> Any:
+    """validate JSON string/bytes `data` as `type_` with the cached TypeAdapter
+
+    The JSON is parsed by pydantic-core while validating, which skips building
+    the intermediate python objects of `json.loads`.
+    """
+    return get_type_adapter(type_).validate_json(data, **kwargs)
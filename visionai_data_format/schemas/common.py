@@ -48,7 +48,9 @@ class DatasetType(str, Enum, metaclass=BaseEnumMeta):
 
 
 class ExcludedNoneBaseModel(BaseModel):
-    model_config = ConfigDict(extra="forbid")
+    # validators are built on first use instead of at import time, nested models
+    # are mostly validated as part of their parent so most of them never need their own
+    model_config = ConfigDict(extra="forbid", defer_build=True)
 
     def model_dump(self, **kwargs):
         exclude_none = kwargs.pop("exclude_none", True)
@@ -0,0 +1,125 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Union
+
+from pydantic import BaseModel
+
+from .validators import build_ontology_attributes_map
+
+__all__ = [
+    "CompiledOntology",
+    "compile_ontology",
+    "clear_compiled_ontology_cache",
+    "ontology_fingerprint",
+]
+
+# number of compiled ontologies kept by `compile_ontology`
+COMPILED_ONTOLOGY_CACHE_SIZE = 32
+
+_CACHE: "OrderedDict[str, CompiledOntology]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+
+
+def ontology_fingerprint(ontology: Dict) -> str:
+    """stable hash of an ontology dictionary, independent of its key order"""
+    content = json.dumps(ontology, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+class CompiledOntology:
+    """Ontology with the maps and sets used by `validate_with_ontology`
+
+    Everything derived from the ontology only (attributes map, sensor map,
+    classes, tag classes ...) is computed once here, so validating many
+    sequences against the same project ontology skips this work.
+    The instance is read only and can be shared between threads.
+
+    Parameters
+    ----------
+    ontology : Dict
+        ontology dictionary, such as `Ontology(**data).model_dump(exclude_unset=True)`
+    fingerprint : Optional[str], optional
+        hash of `ontology`, computed if not given
+    """
+
+    def __init__(self, ontology: Dict, fingerprint: Optional[str] = None) -> None:
+        self.ontology: Dict = ontology
+        self.fingerprint: str = fingerprint or ontology_fingerprint(ontology)
+        self.tags: Dict = ontology.get("tags") or {}
+        self.tag_classes: Set[str] = set(self.tags.keys())
+
+        streams_data: Dict = ontology["streams"]
+        self.sensor_info: Dict[str, str] = {
+            sensor_name: sensor_obj["type"]
+            for sensor_name, sensor_obj in streams_data.items()
+        }
+        self.has_multi_sensor: bool = len(streams_data) > 1
+        self.has_lidar_sensor: bool = any(
+            sensor_type == "lidar" for sensor_type in self.sensor_info.values()
+        )
+
+        # plain dictionaries, so lookups of shared instances never insert keys
+        self.attributes_map: Dict[str, Dict[str, Dict[str, Set[str]]]] = {
+            ontology_root: {
+                class_name: dict(class_attributes)
+                for class_name, class_attributes in classes.items()
+            }
+            for ontology_root, classes in build_ontology_attributes_map(
+                ontology
+            ).items()
+        }
+        self.classes: Dict[str, Set[str]] = {
+            ontology_root: set((ontology.get(ontology_root) or {}).keys())
+            for ontology_root in ("objects", "contexts")
+        }
+        self.has_instance_mask: bool = any(
+            "instance_mask" in (class_data or {}).get("attributes", {})
+            for class_data in (ontology.get("objects") or {}).values()
+        )
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(fingerprint={self.fingerprint!r})"
+
+
+def compile_ontology(
+    ontology: Union[Dict, BaseModel, CompiledOntology]
+) -> CompiledOntology:
+    """Retrieve the `CompiledOntology` of `ontology`, cached by ontology hash
+
+    Parameters
+    ----------
+    ontology : Union[Dict, BaseModel, CompiledOntology]
+        ontology dictionary or `Ontology` model, a `CompiledOntology` is returned as is
+
+    Returns
+    -------
+    CompiledOntology
+        compiled ontology, shared by every call with an equal ontology
+    """
+    if isinstance(ontology, CompiledOntology):
+        return ontology
+    if isinstance(ontology, BaseModel):
+        ontology = ontology.model_dump(exclude_unset=True)
+
+    fingerprint = ontology_fingerprint(ontology)
+    with _CACHE_LOCK:
+        compiled = _CACHE.get(fingerprint)
+        if compiled is not None:
+            _CACHE.move_to_end(fingerprint)
+            return compiled
+
+    # copied, so later changes of the caller's ontology can't alter the cached one
+    compiled = CompiledOntology(copy.deepcopy(ontology), fingerprint=fingerprint)
+    with _CACHE_LOCK:
+        _CACHE[fingerprint] = compiled
+        while len(_CACHE) > COMPILED_ONTOLOGY_CACHE_SIZE:
+            _CACHE.popitem(last=False)
+    return compiled
+
+
+def clear_compiled_ontology_cache() -> None:
+    with _CACHE_LOCK:
+        _CACHE.clear()
@@ -0,0 +1,526 @@
+import logging
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from pydantic import StrictStr
+
+from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
+from visionai_data_format.utils.instrumentation import phase
+
+from ..adapters import validate_python
+from ..ontology import Ontology
+from ..visionai_schema import Context, Frame, FrameInterval, Object, VisionAIModel
+from .compiled_ontology import CompiledOntology, compile_ontology
+from .validators import (
+    error_budget,
+    error_budget_exhausted,
+    extend_errors,
+    get_frame_object_attr_type,
+    parse_data_pointers,
+    parse_dynamic_attrs,
+    parse_static_attrs,
+    parse_visionai_child_type,
+    validate_attributes,
+    validate_frame_object_sensors_data,
+    validate_parsed_visionai_data,
+    validate_streams,
+    validate_tags,
+    validate_visionai_intervals,
+)
+
+__all__ = ["IncrementalValidator"]
+
+logger = logging.getLogger(__name__)
+
+DATA_KEY_MAP: Dict[str, Tuple[str, str]] = {
+    "objects": ("object_data", "object_data_pointers"),
+    "contexts": ("context_data", "context_data_pointers"),
+}
+
+
+def _parse_or_error(parse: Callable, *args) -> Union[Dict, VisionAIException]:
+    # parse errors are raised by the check that needs the parsed data,
+    # at the same step as a full validation
+    try:
+        return parse(*args)
+    except VisionAIException as exc:
+        return exc
+
+
+def _raise_error(value: Union[Dict, VisionAIException]) -> Dict:
+    if isinstance(value, VisionAIException):
+        raise value
+    return value
+
+
+class _ChildrenIndex:
+    """parsed data of visionai `objects` or `contexts`, per uuid and per frame
+
+    Dictionaries keep the order of visionai data, so merging them gives the
+    same maps as parsing the whole sequence.
+    """
+
+    def __init__(self, root_key: str) -> None:
+        self.root_key = root_key
+        self.sub_root_key, self.pointer_type = DATA_KEY_MAP[root_key]
+        # per uuid of visionai objects/contexts
+        self.classes: Dict[str, Union[Dict, VisionAIException]] = {}
+        self.data_pointers: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        self.intervals: Dict[str, List[Tuple[int, int]]] = {}
+        self.static_attrs: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        # per frame key
+        self.frame_sensor_errors: Dict[str, Optional[VisionAIException]] = {}
+        self.frame_attributes: Dict[str, Union[Dict, VisionAIException]] = {}
+        self.frame_dynamic_attrs: Dict[str, Dict[Tuple[str, str], Dict]] = {}
+        self.frame_uuids: Dict[str, Set[str]] = {}
+        self.uuid_frames: Dict[str, Set[str]] = defaultdict(set)
+
+    def index_child(self, uuid: str, data: Dict) -> None:
+        child = {uuid: data}
+        self.classes[uuid] = _parse_or_error(
+            parse_visionai_child_type, child, self.sub_root_key
+        )
+        data_pointers, intervals = parse_data_pointers(child, self.pointer_type)
+        self.data_pointers[uuid] = data_pointers
+        self.intervals[uuid] = intervals[uuid]
+        self.static_attrs[uuid] = parse_static_attrs(child, self.sub_root_key)
+
+    def remove_child(self, uuid: str) -> None:
+        for index in (
+            self.classes,
+            self.data_pointers,
+            self.intervals,
+            self.static_attrs,
+        ):
+            index.pop(uuid, None)
+
+    def index_frame(
+        self,
+        frame_key: str,
+        frame: Dict,
+        children: Dict[str, Dict],
+        sensor_name_set: Set[str],
+        has_lidar_sensor: bool,
+        has_multi_sensor: bool,
+    ) -> None:
+        frame_data = {frame_key: frame}
+        self.frame_sensor_errors[frame_key] = validate_frame_object_sensors_data(
+            data_root_key=self.root_key,
+            data_child_key=self.sub_root_key,
+            frames=frame_data,
+            has_lidar_sensor=has_lidar_sensor,
+            has_multi_sensor=has_multi_sensor,
+            sensor_name_set=sensor_name_set,
+        )
+        self.index_frame_attributes(frame_key, frame, children)
+        self.frame_dynamic_attrs[frame_key] = parse_dynamic_attrs(
+            frame_data, self.root_key, self.sub_root_key
+        )
+        self._unlink_frame(frame_key)
+        uuids = set((frame.get(self.root_key) or {}).keys())
+        self.frame_uuids[frame_key] = uuids
+        for uuid in uuids:
+            self.uuid_frames[uuid].add(frame_key)
+
+    def index_frame_attributes(
+        self, frame_key: str, frame: Dict, children: Dict[str, Dict]
+    ) -> None:
+        # attributes of a frame depend on the class of its objects/contexts
+        frame_children = frame.get(self.root_key)
+        self.frame_attributes[frame_key] = (
+            _parse_or_error(
+                get_frame_object_attr_type,
+                frame_children,
+                children,
+                self.sub_root_key,
+            )
+            if frame_children
+            else {}
+        )
+
+    def remove_frame(self, frame_key: str) -> None:
+        self.frame_sensor_errors.pop(frame_key, None)
+        self.frame_attributes.pop(frame_key, None)
+        self.frame_dynamic_attrs.pop(frame_key, None)
+        self._unlink_frame(frame_key)
+        self.frame_uuids.pop(frame_key, None)
+
+    def _unlink_frame(self, frame_key: str) -> None:
+        for uuid in self.frame_uuids.get(frame_key, ()):
+            frame_keys = self.uuid_frames[uuid]
+            frame_keys.discard(frame_key)
+            if not frame_keys:
+                del self.uuid_frames[uuid]
+
+    def classes_attributes_map(self) -> Dict[str, Dict[str, Set]]:
+        """same as `parse_visionai_child_type` of every object/context"""
+        classes_attributes_map: Dict[str, Dict[str, Set]] = defaultdict(dict)
+        for child_classes in self.classes.values():
+            for obj_class, attributes in _raise_error(child_classes).items():
+                classes_attributes_map[obj_class].update(attributes)
+        return classes_attributes_map
+
+    def frame_sensor_error(self) -> Optional[VisionAIException]:
+        """same as `validate_frame_object_sensors_data` of every frame"""
+        for error in self.frame_sensor_errors.values():
+            if error is not None:
+                return error
+        return None
+
+    def frames_attributes_map(self) -> Dict[str, Dict[str, Set]]:
+        """same as `parse_visionai_frames_objects` of every frame"""
+        classes_attributes_map: Dict[str, Dict[str, Set]] = defaultdict(
+            lambda: defaultdict(set)
+        )
+        for frame_attributes in self.frame_attributes.values():
+            for class_, attribute_data in _raise_error(frame_attributes).items():
+                for attribute_name, attribute_values in attribute_data.items():
+                    classes_attributes_map[class_][attribute_name].update(
+                        attribute_values
+                    )
+        return classes_attributes_map
+
+    def dynamic_attrs(self) -> Dict[Tuple[str, str], Dict]:
+        """same as `parse_dynamic_attrs` of every frame"""
+        dynamic_attrs: Dict[Tuple[str, str], Dict] = defaultdict(dict)
+        for frame_dynamic_attrs in self.frame_dynamic_attrs.values():
+            for attr_key, frame_data in frame_dynamic_attrs.items():
+                dynamic_attrs[attr_key].update(frame_data)
+        return dynamic_attrs
+
+
+class IncrementalValidator:
+    """Validate a sequence with an ontology after each edit of its frames,
+    objects or contexts
+
+    The parsed data of every frame and object/context (classes and attributes,
+    data pointer intervals, dynamic attribute keys, frame sensors) is indexed
+    once. `apply` re-parses only the frames and objects/contexts of a delta and
+    the frames using its objects/contexts, then runs the checks of
+    `VisionAIModel.validate_with_ontology` on the merged indexes,
+    so the errors are the same as a full validation of the edited sequence.
+
+    The delta is validated with the VisionAI schema of frames, objects and
+    contexts; checks of the whole `VisionAIModel` (such as the RLE length with
+    image size) are not run again. Streams, coordinate systems and tags of the
+    sequence can't be edited.
+
+    Usage:
+        validator = IncrementalValidator(VisionAIModel(**data), ontology)
+        errors = validator.apply(
+            frames={"000000000001": frame},
+            objects={object_uuid: visionai_object},
+            frame_intervals=[{"frame_start": 0, "frame_end": 1}],
+        )
+
+    Parameters
+    ----------
+    visionai_model : Union[VisionAIModel, Dict]
+        sequence to validate, or its data
+    ontology : Union[Dict, Ontology, CompiledOntology]
+        project ontology
+    max_errors : Optional[int], optional
+        maximum number of returned errors, see `validate_with_ontology`,
+        by default None (all)
+    """
+
+    def __init__(
+        self,
+        visionai_model: Union[VisionAIModel, Dict],
+        ontology: Union[Dict, Ontology, CompiledOntology],
+        max_errors: Optional[int] = None,
+    ) -> None:
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be a positive integer")
+        if not isinstance(visionai_model, VisionAIModel):
+            visionai_model = validate_python(VisionAIModel, visionai_model)
+        self.max_errors = max_errors
+        self.compiled_ontology: CompiledOntology = compile_ontology(ontology)
+        with phase("model_dump"):
+            self.visionai: Dict = visionai_model.visionai.model_dump(
+                exclude_unset=True, exclude_none=True
+            )
+
+        compiled_ontology = self.compiled_ontology
+        # streams and tags can't be edited, their checks run once
+        with phase("validate_streams", items=len(self.visionai.get("streams", {}))):
+            self._streams_error, self._sensor_info = validate_streams(
+                visionai=self.visionai,
+                sensor_info=compiled_ontology.sensor_info,
+                has_lidar_sensor=compiled_ontology.has_lidar_sensor,
+                has_multi_sensor=compiled_ontology.has_multi_sensor,
+            )
+        self._tags_error: Optional[VisionAIException] = None
+        self._tags_count = 2 if compiled_ontology.has_instance_mask else -1
+        if compiled_ontology.tags:
+            tags_error, self._tags_count = validate_tags(
+                visionai=self.visionai,
+                tags=compiled_ontology.tags,
+                ontology_classes=compiled_ontology.tag_classes,
+            )
+            self._tags_error = tags_error or None
+
+        self._indexes: Dict[str, _ChildrenIndex] = {
+            root_key: _ChildrenIndex(root_key) for root_key in DATA_KEY_MAP
+        }
+        frames = self.visionai["frames"]
+        with phase("incremental_index", items=len(frames)):
+            for root_key, index in self._indexes.items():
+                for uuid, data in self.visionai.get(root_key, {}).items():
+                    index.index_child(uuid, data)
+            for frame_key, frame in frames.items():
+                self._index_frame(frame_key, frame)
+        self.errors: List[VisionAIException] = self.validate()
+
+    def _index_frame(self, frame_key: str, frame: Dict) -> None:
+        for root_key, index in self._indexes.items():
+            index.index_frame(
+                frame_key=frame_key,
+                frame=frame,
+                children=self.visionai.get(root_key, {}),
+                sensor_name_set=set(self._sensor_info.keys()),
+                has_lidar_sensor=self.compiled_ontology.has_lidar_sensor,
+                has_multi_sensor=self.compiled_ontology.has_multi_sensor,
+            )
+
+    @staticmethod
+    def _validate_frames_delta(frames: Dict[str, Dict]) -> Dict[str, Dict]:
+        if not all(len(key) == 12 and key.isdigit() for key in frames):
+            raise VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_013,
+                message_kwargs={"allowed_length": "digit with 12 characters length"},
+            )
+        return {
+            frame_key: frame.model_dump(exclude_unset=True, exclude_none=True)
+            for frame_key, frame in validate_python(
+                Dict[StrictStr, Frame], frames
+            ).items()
+        }
+
+    @staticmethod
+    def _validate_children_delta(
+        root_key: str, children: Dict[str, Dict]
+    ) -> Dict[str, Dict]:
+        model = Object if root_key == "objects" else Context
+        return {
+            uuid: data.model_dump(exclude_unset=True, exclude_none=True)
+            for uuid, data in validate_python(Dict[StrictStr, model], children).items()
+        }
+
+    @staticmethod
+    def _check_not_empty(
+        root_key: str,
+        current: Optional[Dict],
+        updated: Optional[Dict],
+        removed: Iterable[str],
+    ) -> None:
+        if current is None and not updated:
+            return
+        remaining = set(current or {}) - set(removed)
+        if not remaining and not updated:
+            raise VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_023,
+                message_kwargs={"root_key": root_key},
+            )
+
+    def apply(
+        self,
+        frames: Optional[Dict[str, Dict]] = None,
+        objects: Optional[Dict[str, Dict]] = None,
+        contexts: Optional[Dict[str, Dict]] = None,
+        frame_intervals: Optional[List[Dict]] = None,
+        removed_frames: Iterable[str] = (),
+        removed_objects: Iterable[str] = (),
+        removed_contexts: Iterable[str] = (),
+    ) -> List[VisionAIException]:
+        """Apply a delta to the sequence and validate it
+
+        Given frames, objects and contexts are added, or replace the existing
+        ones with the same key, as `dict.update` does.
+
+        Parameters
+        ----------
+        frames : Optional[Dict[str, Dict]], optional
+            added or replaced frames, by frame key
+        objects : Optional[Dict[str, Dict]], optional
+            added or replaced visionai objects, by uuid
+        contexts : Optional[Dict[str, Dict]], optional
+            added or replaced visionai contexts, by uuid
+        frame_intervals : Optional[List[Dict]], optional
+            new frame intervals of the sequence
+        removed_frames : Iterable[str], optional
+            keys of removed frames
+        removed_objects : Iterable[str], optional
+            uuids of removed objects
+        removed_contexts : Iterable[str], optional
+            uuids of removed contexts
+
+        Returns
+        -------
+        List[VisionAIException]
+            errors of the edited sequence, also kept in `errors`
+        """
+        removed_frames = set(removed_frames)
+        removed_children = {
+            "objects": set(removed_objects),
+            "contexts": set(removed_contexts),
+        }
+        updated_children = {"objects": objects or {}, "contexts": contexts or {}}
+
+        # validate the whole delta first, so an invalid delta changes nothing
+        self._check_not_empty("frames", self.visionai["frames"], frames, removed_frames)
+        for root_key, children in updated_children.items():
+            self._check_not_empty(
+                root_key,
+                self.visionai.get(root_key),
+                children,
+                removed_children[root_key],
+            )
+        frames = self._validate_frames_delta(frames or {})
+        updated_children = {
+            root_key: self._validate_children_delta(root_key, children)
+            for root_key, children in updated_children.items()
+        }
+        if frame_intervals is not None:
+            frame_intervals = [
+                frame_interval.model_dump(exclude_unset=True, exclude_none=True)
+                for frame_interval in validate_python(
+                    List[FrameInterval], frame_intervals
+                )
+            ]
+            self.visionai["frame_intervals"] = frame_intervals
+
+        n_items = len(frames) + sum(
+            len(children) for children in updated_children.values()
+        )
+        with phase("incremental_index", items=n_items):
+            # frames of edited objects/contexts are parsed again with their class
+            stale_frames: Set[str] = set()
+            for root_key, index in self._indexes.items():
+                children = updated_children[root_key]
+                removed = removed_children[root_key] - set(children)
+                if not children and not removed:
+                    continue
+                visionai_children = self.visionai.setdefault(root_key, {})
+                # only a new, removed or re-classed object/context changes frames
+                reclassed = {
+                    uuid
+                    for uuid, data in children.items()
+                    if visionai_children.get(uuid, {}).get("type") != data["type"]
+                }
+                for uuid in removed:
+                    visionai_children.pop(uuid, None)
+                    index.remove_child(uuid)
+                for uuid, data in children.items():
+                    visionai_children[uuid] = data
+                    index.index_child(uuid, data)
+                for uuid in removed | reclassed:
+                    stale_frames.update(index.uuid_frames.get(uuid, ()))
+
+            visionai_frames = self.visionai["frames"]
+            for frame_key in removed_frames - set(frames):
+                visionai_frames.pop(frame_key, None)
+                for index in self._indexes.values():
+                    index.remove_frame(frame_key)
+            for frame_key, frame in frames.items():
+                visionai_frames[frame_key] = frame
+                self._index_frame(frame_key, frame)
+
+            for frame_key in stale_frames - set(frames) - removed_frames:
+                for root_key, index in self._indexes.items():
+                    index.index_frame_attributes(
+                        frame_key,
+                        visionai_frames[frame_key],
+                        self.visionai.get(root_key, {}),
+                    )
+
+        self.errors = self.validate()
+        return self.errors
+
+    def validate(self) -> List[VisionAIException]:
+        """errors of the current sequence, from the indexed data"""
+        with error_budget(self.max_errors):
+            error_list = self._validate_checks()
+        return error_list if self.max_errors is None else error_list[: self.max_errors]
+
+    def _validate_checks(self) -> List[VisionAIException]:
+        # same checks and order as `VisionAIModel._validate_with_ontology_checks`
+        error_list: List[VisionAIException] = []
+        visionai = self.visionai
+        with phase(
+            "validate_visionai_intervals", items=len(visionai.get("frames", {}))
+        ):
+            errors = validate_visionai_intervals(visionai=visionai)
+        if extend_errors(error_list, errors):
+            return error_list
+
+        if self._streams_error:
+            extend_errors(error_list, self._streams_error)
+            return error_list
+
+        for ontology_type, ontology_data in self.compiled_ontology.ontology.items():
+            if not ontology_data or ontology_type not in DATA_KEY_MAP:
+                continue
+            if error_budget_exhausted():
+                break
+            error_list += self._validate_children(ontology_type)
+        return error_list
+
+    def _validate_children(self, root_key: str) -> List[VisionAIException]:
+        # same checks and order as `validate_objects`/`validate_visionai_children`
+        error_list: List[VisionAIException] = []
+        compiled_ontology = self.compiled_ontology
+        index = self._indexes[root_key]
+        tags_count = -1
+        if root_key == "objects":
+            tags_count = self._tags_count
+            if self._tags_error and extend_errors(error_list, self._tags_error):
+                return error_list
+
+        ontology_attributes_map = compiled_ontology.attributes_map.get(root_key, {})
+        classes_attributes_map = index.classes_attributes_map()
+        extra_classes = (
+            set(classes_attributes_map.keys()) - compiled_ontology.classes[root_key]
+        )
+        if extra_classes and extend_errors(
+            error_list,
+            VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_020,
+                message_kwargs={"class_name": extra_classes},
+            ),
+        ):
+            return error_list
+
+        with phase("validate_attributes", items=len(classes_attributes_map)):
+            errors = validate_attributes(
+                classes_attributes_map, ontology_attributes_map
+            )
+        if extend_errors(error_list, errors):
+            return error_list
+
+        if extend_errors(error_list, index.frame_sensor_error()):
+            return error_list
+
+        frames_attributes_map = index.frames_attributes_map()
+        with phase("validate_attributes", items=len(frames_attributes_map)):
+            errors = validate_attributes(frames_attributes_map, ontology_attributes_map)
+        if extend_errors(error_list, errors):
+            return error_list
+
+        data_pointers: Dict[Tuple[str, str], Dict] = {}
+        static_attrs: Dict[Tuple[str, str], Dict] = {}
+        for uuid in index.data_pointers:
+            data_pointers.update(index.data_pointers[uuid])
+            static_attrs.update(index.static_attrs[uuid])
+        with phase("validate_visionai_data", items=len(index.intervals)):
+            errors = validate_parsed_visionai_data(
+                data_pointers=data_pointers,
+                data_obj_under_vai_intervals=index.intervals,
+                static_attrs=static_attrs,
+                dynamic_attrs=index.dynamic_attrs(),
+                frame_numbers=[int(frame_num) for frame_num in self.visionai["frames"]],
+                root_key=root_key,
+                tags_count=tags_count,
+            )
+        extend_errors(error_list, errors)
+        return error_list
@@ -1,13 +1,80 @@
 from collections import defaultdict
-from typing import Dict, List, Optional, Set, Tuple, Union
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Set, Tuple, Union
 
 from pydantic import StrictInt, StrictStr
 
 from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
+from visionai_data_format.utils.instrumentation import phase
 
 from ..ontology import Ontology
 
 
+class ErrorBudget:
+    """Number of errors a validation may still report before it stops
+
+    Checks add their errors with `extend_errors`, long traversals stop as soon as
+    `error_budget_exhausted` is True, so rejecting bad data doesn't need
+    a full scan.
+    """
+
+    def __init__(self, max_errors: int) -> None:
+        self.max_errors = max_errors
+        self.n_errors = 0
+
+    def is_exhausted(self, pending: int = 0) -> bool:
+        return self.n_errors + pending >= self.max_errors
+
+
+_ERROR_BUDGET: ContextVar[Optional[ErrorBudget]] = ContextVar(
+    "visionai_error_budget", default=None
+)
+
+
+@contextmanager
+def error_budget(max_errors: Optional[int]) -> Iterator[Optional[ErrorBudget]]:
+    """activate an error budget of `max_errors`, no budget if None"""
+    if max_errors is None:
+        yield None
+        return
+    budget = ErrorBudget(max_errors)
+    token = _ERROR_BUDGET.set(budget)
+    try:
+        yield budget
+    finally:
+        _ERROR_BUDGET.reset(token)
+
+
+def error_budget_exhausted(pending: int = 0) -> bool:
+    """whether the active budget is used up, `pending` errors are not added yet"""
+    budget = _ERROR_BUDGET.get()
+    return budget is not None and budget.is_exhausted(pending)
+
+
+def extend_errors(
+    error_list: List[VisionAIException],
+    errors: Union[List[VisionAIException], VisionAIException, None],
+) -> bool:
+    """add errors of a check to `error_list` and to the active budget
+
+    Returns
+    -------
+    bool
+        True if the active error budget is used up
+    """
+    if errors is None:
+        errors = []
+    elif isinstance(errors, VisionAIException):
+        errors = [errors]
+    error_list += errors
+    budget = _ERROR_BUDGET.get()
+    if budget is None:
+        return False
+    budget.n_errors += len(errors)
+    return budget.is_exhausted()
+
+
 def mapping_attributes_type_value(attributes: Dict) -> Dict[str, Set]:
     """mapping attributes"""
     if not attributes:
@@ -263,10 +330,15 @@ def validate_tags_classes(
 
 
 def validate_tags(
-    visionai: Dict, tags: Dict, *args, **kwargs
+    visionai: Dict,
+    tags: Dict,
+    ontology_classes: Optional[Set[str]] = None,
+    *args,
+    **kwargs,
 ) -> Tuple[Optional[VisionAIException], int]:
     # Validate the tags classes if the visionai contains this key
-    ontology_classes: Set[str] = set(tags.keys())
+    if ontology_classes is None:
+        ontology_classes = set(tags.keys())
 
     return validate_tags_classes(
         tags=visionai.get("tags"), ontology_classes=ontology_classes
@@ -280,6 +352,8 @@ def validate_attributes(
 ) -> List[VisionAIException]:
     error_list = []
     for label_class, label_attrs_data in classes_attributes_map.items():
+        if error_budget_exhausted(len(error_list)):
+            break
         # already valid the class in previous step
         ontology_attr_name_type_dict: Dict[str, Set] = attributes.get(label_class, {})
         ontology_attr_name_type_set: Set[str] = set(ontology_attr_name_type_dict.keys())
@@ -341,7 +415,7 @@ def validate_frame_object_sensors_data(
     has_multi_sensor: bool,
     sensor_name_set: Set[str],
 ) -> Optional[VisionAIException]:
-    for frame_obj in frames.values():
+    for frame_key, frame_obj in frames.items():
         cur_obj_data_type = set()
         cur_obj_stream_sensor = set()
         cur_obj_coor_sensor = set()
@@ -372,6 +446,7 @@ def validate_frame_object_sensors_data(
                     "root_sensors": sensor_name_set,
                     "root_name": "visionai streams",
                 },
+                location=f"frames/{frame_key}",
             )
         extra = cur_obj_coor_sensor - sensor_name_set
         if has_lidar_sensor and extra:
@@ -383,6 +458,7 @@ def validate_frame_object_sensors_data(
                     "root_sensors": sensor_name_set,
                     "root_name": "visionai coordinate systems",
                 },
+                location=f"frames/{frame_key}",
             )
 
         frame_properties = frame_obj.get("frame_properties")
@@ -390,6 +466,7 @@ def validate_frame_object_sensors_data(
             return VisionAIException(
                 error_code=VisionAIErrorCode.VAI_ERR_019,
                 message_kwargs={"root_key": "frame_properties"},
+                location=f"frames/{frame_key}",
             )
 
         streams_name_set = set(frame_properties["streams"].keys())
@@ -400,6 +477,7 @@ def validate_frame_object_sensors_data(
             return VisionAIException(
                 error_code=VisionAIErrorCode.VAI_ERR_012,
                 message_kwargs={"sensor_name": extra, "sensor_type": "camera or lidar"},
+                location=f"frames/{frame_key}/frame_properties/streams",
             )
 
     return None
@@ -669,6 +747,8 @@ def validate_vai_data_frame_intervals(
 
     error_list: List[VisionAIException] = []
     for data_uuid, data_intervals in data_obj_under_vai_intervals.items():
+        if error_budget_exhausted(len(error_list)):
+            break
         for start, end in data_intervals:
             if start > end or start < 0 or end < 0:
                 error_list.append(
@@ -705,6 +785,11 @@ def validate_vai_data_frame_intervals(
     return error_list
 
 
+def data_pointer_location(root_key: str, data_uuid: str, attribute_name: str) -> str:
+    """location of a data pointer, i.e `objects/<uuid>/object_data_pointers/<name>`"""
+    return f"{root_key}/{data_uuid}/{root_key[:-1]}_data_pointers/{attribute_name}"
+
+
 def vai_data_data_pointers_intervals(
     root_key: str,
     data_pointers: Dict[Tuple[str, str], Dict],
@@ -741,6 +826,8 @@ def vai_data_data_pointers_intervals(
         Tuple[str, str], List[Tuple[int, int]]
     ] = defaultdict(list)
     for data_key, data_info in data_pointers.items():
+        if error_budget_exhausted(len(error_list)):
+            return error_list, data_pointers_frames_intervals
         interval_list: List[Tuple[int, int]] = list()
         interval_set: Set[List[Tuple[int, int]]] = set()
         for frame_interval_info in data_info["frame_intervals"]:
@@ -755,6 +842,7 @@ def vai_data_data_pointers_intervals(
                             "start": start,
                             "end": end,
                         },
+                        location=data_pointer_location(root_key, *data_key),
                     )
                 )
                 continue
@@ -767,6 +855,7 @@ def vai_data_data_pointers_intervals(
                             "start": start,
                             "end": end,
                         },
+                        location=data_pointer_location(root_key, *data_key),
                     )
                 )
                 continue
@@ -783,6 +872,7 @@ def vai_data_data_pointers_intervals(
                         "attribute_name": data_key,
                         "interval_list": interval_list,
                     },
+                    location=data_pointer_location(root_key, *data_key),
                 )
             )
 
@@ -810,6 +900,7 @@ def vai_data_data_pointers_intervals(
                         "end": end,
                         "data_uuid_intervals": data_obj_under_vai_intervals[attr_uuid],
                     },
+                    location=data_pointer_location(root_key, attr_uuid, attr_name),
                 )
             )
 
@@ -846,6 +937,8 @@ def validate_dynamic_attrs_data_pointer_intervals(
     error_list: List[VisionAIException] = []
 
     for attr_key, attr_intervals in dynamic_attrs_frames_intervals.items():
+        if error_budget_exhausted(len(error_list)):
+            break
         data_pointer_frame_intervals = data_pointers_frames_intervals.get(attr_key)
         if not data_pointer_frame_intervals:
             error_list.append(
@@ -856,6 +949,7 @@ def validate_dynamic_attrs_data_pointer_intervals(
                         "data_uuid": attr_key[0],
                         "attribute_name": attr_key[1],
                     },
+                    location=data_pointer_location(root_key, *attr_key),
                 )
             )
             break
@@ -880,6 +974,7 @@ def validate_dynamic_attrs_data_pointer_intervals(
                         "end": end,
                         "data_uuid_intervals": data_pointer_frame_intervals,
                     },
+                    location=data_pointer_location(root_key, *attr_key),
                 )
             )
 
@@ -909,11 +1004,14 @@ def validate_dynamic_attrs_data_pointer_semantic_values(
     """
 
     error_list: List[VisionAIException] = []
-    for frame_data in dynamic_attrs.values():
+    for (data_uuid, _), frame_data in dynamic_attrs.items():
+        if error_budget_exhausted(len(error_list)):
+            break
         for frame_num, attr_info in frame_data.items():
             if attr_info["type"] != "binary":
                 continue
             mask_rle: str = attr_info["val"]
+            location = f"frames/{frame_num:012d}/objects/{data_uuid}"
 
             # retrieve classes from #pixelnumVclass
             pixel_list: List[str] = [data for data in mask_rle.split("#") if data]
@@ -930,6 +1028,7 @@ def validate_dynamic_attrs_data_pointer_semantic_values(
                     VisionAIException(
                         error_code=VisionAIErrorCode.VAI_ERR_018,
                         message_kwargs={"root_key": "tags"},
+                        location=location,
                     )
                 )
             # validate whether annotation class indices are lower or higher than allowed
@@ -944,6 +1043,7 @@ def validate_dynamic_attrs_data_pointer_semantic_values(
                             ),  # only need to show unique classes
                             "tags_count": tags_count - 1,
                         },
+                        location=location,
                     )
                 )
 
@@ -957,6 +1057,7 @@ def validate_dynamic_attrs_data_pointer_semantic_values(
                             "pixel_total": pixel_total,
                             "image_area": img_area,
                         },
+                        location=location,
                     )
                 )
     return error_list
@@ -1037,7 +1138,6 @@ def validate_visionai_data(
     pointer_type: str = "context_data_pointers",
     tags_count: int = -1,
 ) -> List[VisionAIException]:
-    error_list: List[VisionAIException] = []
     parsed_data_pointers: Tuple[
         Dict[Tuple[str, str], Dict], Dict[str, List]
     ] = parse_data_pointers(
@@ -1056,6 +1156,53 @@ def validate_visionai_data(
         sub_root_key,
     )
 
+    return validate_parsed_visionai_data(
+        data_pointers=data_pointers,
+        data_obj_under_vai_intervals=data_obj_under_vai_intervals,
+        static_attrs=static_attrs,
+        dynamic_attrs=dynamic_attrs,
+        frame_numbers=[int(frame_num) for frame_num in frames.keys()],
+        root_key=root_key,
+        tags_count=tags_count,
+    )
+
+
+def validate_parsed_visionai_data(
+    data_pointers: Dict[Tuple[str, str], Dict],
+    data_obj_under_vai_intervals: Dict[str, List],
+    static_attrs: Dict[Tuple[str, str], Dict],
+    dynamic_attrs: Dict[Tuple[str, str], Dict],
+    frame_numbers: List[int],
+    root_key: str = "contexts",
+    tags_count: int = -1,
+) -> List[VisionAIException]:
+    """validate objects/contexts data with the output of `parse_data_pointers`,
+    `parse_static_attrs` and `parse_dynamic_attrs`
+
+    Parameters
+    ----------
+    data_pointers : Dict[Tuple[str, str], Dict]
+        data pointers with uuid and attribute name as key
+    data_obj_under_vai_intervals : Dict[str, List]
+        frame intervals of each uuid
+    static_attrs : Dict[Tuple[str, str], Dict]
+        static attributes with uuid and attribute name as key
+    dynamic_attrs : Dict[Tuple[str, str], Dict]
+        dynamic attributes with uuid and attribute name as key
+    frame_numbers : List[int]
+        frame numbers of visionai frames
+    root_key : str, optional
+        visionai object key, such as `contexts` or `objects`, by default "contexts"
+    tags_count : int, optional
+        number of classes inside tags object under visionai, by default -1
+
+    Returns
+    -------
+    List[VisionAIException]
+        list of VisionAIException
+    """
+    error_list: List[VisionAIException] = []
+
     # the reason why changing static_attrs and dynamic_attrs structure is the key
     # that contains attribute data is attribute type, instead of attribute name
     # e.g "text":[{"name": ..., }, {}, {}, {}], therefore for each look up
@@ -1085,8 +1232,8 @@ def validate_visionai_data(
             dynamic_attrs=dynamic_attrs,
         )
 
-    # retrieve frame numbers
-    frame_numbers = [int(frame_num) for frame_num in frames.keys()]
+    if error_budget_exhausted(len(error_list)):
+        return error_list
 
     # create frame intervals from frame numbers in case the frames is not continuous
     visionai_frame_intervals: List[Tuple[int, int]] = gen_intervals(frame_numbers)
@@ -1098,6 +1245,9 @@ def validate_visionai_data(
         visionai_frame_intervals=visionai_frame_intervals,
     )
 
+    if error_budget_exhausted(len(error_list)):
+        return error_list
+
     # validate data under vai intervals with data pointers intervals
     errors, return_content = vai_data_data_pointers_intervals(
         root_key=root_key,
@@ -1123,7 +1273,7 @@ def validate_visionai_data(
             error_list += errors
 
         # validate if current image_type is semantic_segmentation
-        if root_key == "objects":
+        if root_key == "objects" and not error_budget_exhausted(len(error_list)):
             errors = validate_dynamic_attrs_data_pointer_semantic_values(
                 dynamic_attrs=dynamic_attrs,
                 tags_count=tags_count,
@@ -1144,6 +1294,7 @@ def validate_visionai_children(
     has_multi_sensor: bool,
     ontology_attributes_map: Optional[Dict[str, Dict[str, Set]]] = None,
     tags_count: int = -1,
+    ontology_classes: Optional[Set[str]] = None,
     *args,
     **kwargs,
 ) -> List[VisionAIException]:
@@ -1151,59 +1302,70 @@ def validate_visionai_children(
 
     if not ontology_attributes_map:
         ontology_attributes_map = {}
-    ontology_classes = set(ontology_data.keys())
+    if ontology_classes is None:
+        ontology_classes = set(ontology_data.keys())
     visionai_frames = visionai.get("frames", {})
     visionai_objects = visionai.get(root_key, {})
-    extra_classes, classes_attributes_map = validate_classes(
-        visionai=visionai,
-        ontology_classes=ontology_classes,
-        root_key=root_key,
-        sub_root_key=data_key_map["sub_root_key"],
-    )
-
-    if extra_classes:
-        error_list.append(
-            VisionAIException(
-                error_code=VisionAIErrorCode.VAI_ERR_020,
-                message_kwargs={"class_name": extra_classes},
-            )
+    with phase("validate_classes", items=len(visionai_objects)):
+        extra_classes, classes_attributes_map = validate_classes(
+            visionai=visionai,
+            ontology_classes=ontology_classes,
+            root_key=root_key,
+            sub_root_key=data_key_map["sub_root_key"],
         )
 
-    ontology_attribute_exceptions: List[VisionAIException] = validate_attributes(
-        classes_attributes_map, ontology_attributes_map
-    )
-    error_list += ontology_attribute_exceptions
+    if extra_classes and extend_errors(
+        error_list,
+        VisionAIException(
+            error_code=VisionAIErrorCode.VAI_ERR_020,
+            message_kwargs={"class_name": extra_classes},
+        ),
+    ):
+        return error_list
+
+    with phase("validate_attributes", items=len(classes_attributes_map)):
+        ontology_attribute_exceptions: List[VisionAIException] = validate_attributes(
+            classes_attributes_map, ontology_attributes_map
+        )
+    if extend_errors(error_list, ontology_attribute_exceptions):
+        return error_list
     sensor_name_set = set(sensor_info.keys())
-    valid_frame_sensor_error: Optional[
-        VisionAIException
-    ] = validate_frame_object_sensors_data(
-        data_root_key=root_key,
-        data_child_key=data_key_map["sub_root_key"],
-        frames=visionai_frames,
-        has_lidar_sensor=has_lidar_sensor,
-        has_multi_sensor=has_multi_sensor,
-        sensor_name_set=sensor_name_set,
-    )
+    with phase("validate_frame_object_sensors_data", items=len(visionai_frames)):
+        valid_frame_sensor_error: Optional[
+            VisionAIException
+        ] = validate_frame_object_sensors_data(
+            data_root_key=root_key,
+            data_child_key=data_key_map["sub_root_key"],
+            frames=visionai_frames,
+            has_lidar_sensor=has_lidar_sensor,
+            has_multi_sensor=has_multi_sensor,
+            sensor_name_set=sensor_name_set,
+        )
 
-    if valid_frame_sensor_error:
-        error_list.append(valid_frame_sensor_error)
+    if extend_errors(error_list, valid_frame_sensor_error):
+        return error_list
 
-    frames_attributes_map: Dict[str, Dict[str, Set]] = parse_visionai_frames_objects(
-        visionai_frames, visionai_objects, root_key
-    )
-    frame_attribute_exceptions: List[VisionAIException] = validate_attributes(
-        frames_attributes_map, ontology_attributes_map
-    )
-    error_list += frame_attribute_exceptions
+    with phase("parse_visionai_frames_objects", items=len(visionai_frames)):
+        frames_attributes_map: Dict[
+            str, Dict[str, Set]
+        ] = parse_visionai_frames_objects(visionai_frames, visionai_objects, root_key)
+    with phase("validate_attributes", items=len(frames_attributes_map)):
+        frame_attribute_exceptions: List[VisionAIException] = validate_attributes(
+            frames_attributes_map, ontology_attributes_map
+        )
+    if extend_errors(error_list, frame_attribute_exceptions):
+        return error_list
 
-    error_list += validate_visionai_data(
-        data_under_vai=visionai_objects,
-        frames=visionai_frames,
-        root_key=root_key,
-        sub_root_key=data_key_map["sub_root_key"],
-        pointer_type=data_key_map["pointer_type"],
-        tags_count=tags_count,
-    )
+    with phase("validate_visionai_data", items=len(visionai_objects)):
+        visionai_data_exceptions = validate_visionai_data(
+            data_under_vai=visionai_objects,
+            frames=visionai_frames,
+            root_key=root_key,
+            sub_root_key=data_key_map["sub_root_key"],
+            pointer_type=data_key_map["pointer_type"],
+            tags_count=tags_count,
+        )
+    extend_errors(error_list, visionai_data_exceptions)
 
     return error_list
 
@@ -1216,6 +1378,7 @@ def validate_contexts(
     has_multi_sensor: bool,
     sensor_info: Dict,
     tags_count: int = -1,
+    ontology_classes: Optional[Set[str]] = None,
     *args,
     **kwargs,
 ) -> List[VisionAIException]:
@@ -1235,6 +1398,7 @@ def validate_contexts(
         has_lidar_sensor=has_lidar_sensor,
         has_multi_sensor=has_multi_sensor,
         tags_count=tags_count,
+        ontology_classes=ontology_classes,
     )
 
 
@@ -1246,6 +1410,9 @@ def validate_objects(
     has_lidar_sensor: bool,
     has_multi_sensor: bool,
     sensor_info: Dict,
+    ontology_classes: Optional[Set[str]] = None,
+    tag_classes: Optional[Set[str]] = None,
+    has_instance_mask: Optional[bool] = None,
     *args,
     **kwargs,
 ) -> List[VisionAIException]:
@@ -1260,14 +1427,21 @@ def validate_objects(
     # We do not need tags for instance_mask, so we set the tags_count to 2 for doing the validation of segmentation
     # For instance_mask, we'll only have 0 for background and 1 for the given category.
     # The RLE will only have V0 and V1.
-    for object in ontology_data.values():
-        if "instance_mask" in object.get("attributes", {}):
-            tags_count = 2
+    if has_instance_mask is None:
+        has_instance_mask = any(
+            "instance_mask" in object.get("attributes", {})
+            for object in ontology_data.values()
+        )
+    if has_instance_mask:
+        tags_count = 2
     # validate ontology.tags and visionai.tags for segmentation data
     if tags:
-        error_msg, tags_count = validate_tags(visionai=visionai, tags=tags)
-        if error_msg:
-            error_list += [error_msg]
+        with phase("validate_tags", items=len(tags)):
+            error_msg, tags_count = validate_tags(
+                visionai=visionai, tags=tags, ontology_classes=tag_classes
+            )
+        if error_msg and extend_errors(error_list, error_msg):
+            return error_list
     error_list += validate_visionai_children(
         visionai=visionai,
         ontology_data=ontology_data,
@@ -1278,6 +1452,7 @@ def validate_objects(
         has_lidar_sensor=has_lidar_sensor,
         has_multi_sensor=has_multi_sensor,
         tags_count=tags_count,
+        ontology_classes=ontology_classes,
     )
 
     return error_list
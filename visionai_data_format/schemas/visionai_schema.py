@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import re
 from enum import Enum
-from typing import Dict, List, Optional, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 try:
     from typing import Literal
@@ -24,13 +24,24 @@ from pydantic import (
 from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
 from visionai_data_format.schemas.common import ExcludedNoneBaseModel
 from visionai_data_format.schemas.ontology import Ontology
+from visionai_data_format.schemas.utils.compiled_ontology import (
+    CompiledOntology,
+    compile_ontology,
+)
 from visionai_data_format.schemas.utils.validators import (
-    build_ontology_attributes_map,
+    error_budget,
+    error_budget_exhausted,
+    extend_errors,
     validate_contexts,
     validate_objects,
     validate_streams,
     validate_visionai_intervals,
 )
+from visionai_data_format.utils.instrumentation import (
+    MetricsRecorder,
+    get_recorder,
+    phase,
+)
 
 
 class SchemaVersion(str, Enum):
@@ -1000,7 +1011,71 @@ class VisionAIModel(ExcludedNoneBaseModel):
     )
 
     def validate_with_ontology(
-        self, ontology: Type[Ontology]
+        self,
+        ontology: Union[Type[Ontology], CompiledOntology],
+        return_profile: bool = False,
+        max_errors: Optional[int] = None,
+        fail_fast: bool = False,
+    ) -> Union[List[VisionAIException], Tuple[List[VisionAIException], Dict]]:
+        """Validate VisionAI data with the given ontology
+
+        Parameters
+        ----------
+        ontology : Union[Type[Ontology], CompiledOntology]
+            ontology dictionary, or its `CompiledOntology` to reuse across
+            validations. A dictionary is compiled by `compile_ontology`,
+            which caches the result by ontology hash
+        return_profile : bool, optional
+            return a profile of the checks alongside the errors, by default False.
+            The profile contains `wall_seconds` and the `calls`, `seconds`,
+            `max_seconds` and processed `items` of each check under `phases`
+            (validate_streams, validate_classes, validate_attributes,
+            validate_frame_object_sensors_data, parse_visionai_frames_objects,
+            validate_visionai_data ...)
+        max_errors : Optional[int], optional
+            stop the validation once `max_errors` errors are found and return
+            at most `max_errors` errors, by default None (run every check)
+        fail_fast : bool, optional
+            stop at the first error, same as `max_errors=1`, by default False
+
+        Returns
+        -------
+        Union[List[VisionAIException], Tuple[List[VisionAIException], Dict]]
+            errors, or tuple of errors and profile if `return_profile` is set
+        """
+        if fail_fast:
+            max_errors = 1 if max_errors is None else min(max_errors, 1)
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be a positive integer")
+
+        if not return_profile:
+            return self._validate_with_ontology(
+                ontology=ontology, max_errors=max_errors
+            )
+
+        outer_recorder = get_recorder()
+        recorder = MetricsRecorder()
+        with recorder.activate():
+            error_list = self._validate_with_ontology(
+                ontology=ontology, max_errors=max_errors
+            )
+        profile = recorder.summary()
+        profile.pop("counters")
+        if outer_recorder is not None:
+            outer_recorder.merge(profile)
+        return error_list, profile
+
+    def _validate_with_ontology(
+        self,
+        ontology: Union[Type[Ontology], CompiledOntology],
+        max_errors: Optional[int] = None,
+    ) -> List[VisionAIException]:
+        with error_budget(max_errors):
+            error_list = self._validate_with_ontology_checks(ontology=ontology)
+        return error_list if max_errors is None else error_list[:max_errors]
+
+    def _validate_with_ontology_checks(
+        self, ontology: Union[Type[Ontology], CompiledOntology]
     ) -> List[VisionAIException]:
         validator_map = {
             "contexts": validate_contexts,
@@ -1009,48 +1084,48 @@ class VisionAIModel(ExcludedNoneBaseModel):
 
         error_list: List[str] = []
 
-        tags = ontology.get("tags", {})
-
-        visionai = self.visionai.model_dump(exclude_unset=True, exclude_none=True)
-
-        errors = validate_visionai_intervals(visionai=visionai)
-        error_list += errors
+        with phase("compile_ontology"):
+            compiled_ontology = compile_ontology(ontology)
 
-        streams_data = ontology["streams"]
+        with phase("model_dump"):
+            visionai = self.visionai.model_dump(exclude_unset=True, exclude_none=True)
 
-        sensor_info: Dict[str, str] = {
-            sensor_name: sensor_obj["type"]
-            for sensor_name, sensor_obj in streams_data.items()
-        }
-
-        has_multi_sensor: bool = len(streams_data) > 1
+        with phase(
+            "validate_visionai_intervals", items=len(visionai.get("frames", {}))
+        ):
+            errors = validate_visionai_intervals(visionai=visionai)
+        if extend_errors(error_list, errors):
+            return error_list
 
-        has_lidar_sensor: bool = any(
-            sensor_type == "lidar" for sensor_type in sensor_info.values()
-        )
-        # ontology_category_attribute_map for objects/context
-        object_context_ontology_attributes_map = build_ontology_attributes_map(ontology)
+        has_multi_sensor: bool = compiled_ontology.has_multi_sensor
+        has_lidar_sensor: bool = compiled_ontology.has_lidar_sensor
 
-        error, visionai_sensor_info = validate_streams(
-            visionai=visionai,
-            sensor_info=sensor_info,
-            has_lidar_sensor=has_lidar_sensor,
-            has_multi_sensor=has_multi_sensor,
-        )
+        with phase("validate_streams", items=len(visionai.get("streams", {}))):
+            error, visionai_sensor_info = validate_streams(
+                visionai=visionai,
+                sensor_info=compiled_ontology.sensor_info,
+                has_lidar_sensor=has_lidar_sensor,
+                has_multi_sensor=has_multi_sensor,
+            )
         if error:
-            error_list.append(error)
+            extend_errors(error_list, error)
             return error_list
 
-        for ontology_type, ontology_data in ontology.items():
+        for ontology_type, ontology_data in compiled_ontology.ontology.items():
             if not ontology_data or ontology_type not in validator_map:
                 continue
+            if error_budget_exhausted():
+                break
             errors = validator_map[ontology_type](
                 visionai=visionai,
                 ontology_data=ontology_data,
-                ontology_attributes_map=object_context_ontology_attributes_map.get(
+                ontology_attributes_map=compiled_ontology.attributes_map.get(
                     ontology_type, {}
                 ),
-                tags=tags,
+                ontology_classes=compiled_ontology.classes[ontology_type],
+                tags=compiled_ontology.tags,
+                tag_classes=compiled_ontology.tag_classes,
+                has_instance_mask=compiled_ontology.has_instance_mask,
                 sensor_info=visionai_sensor_info,
                 has_multi_sensor=has_multi_sensor,
                 has_lidar_sensor=has_lidar_sensor,
@@ -1113,14 +1188,3 @@ class VisionAIModel(ExcludedNoneBaseModel):
                             )
 
         return values
-
-
-Attributes.model_rebuild()
-Context.model_rebuild()
-ContextDataPointer.model_rebuild()
-ContextUnderFrame.model_rebuild()
-Frame.model_rebuild()
-Object.model_rebuild()
-DynamicObjectData.model_rebuild()
-ObjectUnderFrame.model_rebuild()
-VisionAI.model_rebuild()
@@ -1,4 +1,4 @@
-from typing import Dict, Tuple
+from typing import Dict, List, Tuple
 
 import numpy as np
 
@@ -30,6 +30,38 @@ def xyxy2xywh(geometry: Dict) -> Tuple:
     return x, y, w, h
 
 
+def flat_to_vertices(vals: List[List[float]]) -> List[List[List[float]]]:
+    """reshape flat [x0, y0, x1, y1, ...] values to [[x0, y0], [x1, y1], ...]
+    vertices, all values at once"""
+    if not vals:
+        return []
+    lengths = np.fromiter((len(val) // 2 for val in vals), dtype=np.int64)
+    points = np.fromiter(
+        (v for val in vals for v in val[: len(val) // 2 * 2]),
+        dtype=np.float64,
+        count=int(lengths.sum()) * 2,
+    ).reshape(-1, 2)
+    bounds = np.cumsum(lengths)[:-1]
+    return [chunk.tolist() for chunk in np.split(points, bounds)]
+
+
+def vertices_to_flat(vertices_list: List[List[List[float]]]) -> List[List[float]]:
+    """reshape [[x0, y0], [x1, y1], ...] vertices to flat [x0, y0, x1, y1, ...]
+    values, all vertices at once"""
+    if not vertices_list:
+        return []
+    lengths = np.fromiter(
+        (len(vertices) * 2 for vertices in vertices_list), dtype=np.int64
+    )
+    values = np.fromiter(
+        (v for vertices in vertices_list for vertex in vertices for v in vertex[:2]),
+        dtype=np.float64,
+        count=int(lengths.sum()),
+    )
+    bounds = np.cumsum(lengths)[:-1]
+    return [chunk.tolist() for chunk in np.split(values, bounds)]
+
+
 def cart2hom(pcs_3d: np.array) -> np.array:
     """Input: nx3 points in Cartesian in Velodyne coordinate system
     Output: nx4 points in Homogeneous by pending 1
@@ -0,0 +1,380 @@
+import json
+import logging
+import math
+import os
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
+
+logger = logging.getLogger(__name__)
+
+COLUMNAR_VERSION = 1
+COLUMNAR_EXT = ".npz"
+
+# frame object data types whose `val` is a list of numbers and can be stored as columns,
+# the position in this tuple is the shape code saved in the `shape` column
+COLUMNAR_SHAPES: Tuple[str, ...] = ("bbox", "cuboid", "point2d", "poly2d")
+_SHAPE_CODE_MAP: Dict[str, int] = {
+    shape: code for code, shape in enumerate(COLUMNAR_SHAPES)
+}
+# element keys stored in dedicated columns, the other keys are kept in `extras`
+_COLUMN_KEYS = frozenset(("name", "val", "stream", "confidence_score", "closed"))
+# integer coordinates are stored in an int64 column, larger integers stay in the skeleton
+_INT64_INFO = np.iinfo(np.int64)
+
+
+def _pack_json(data) -> np.ndarray:
+    return np.frombuffer(
+        json.dumps(data, separators=(",", ":")).encode("utf-8"), dtype=np.uint8
+    )
+
+
+def _unpack_json(data: np.ndarray):
+    return json.loads(data.tobytes().decode("utf-8"))
+
+
+def _pack_strings(strings: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    if encoded:
+        np.cumsum([len(s) for s in encoded], out=offsets[1:])
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8), offsets
+
+
+def _unpack_strings(data: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = data.tobytes()
+    bounds = offsets.tolist()
+    return [raw[start:end].decode("utf-8") for start, end in zip(bounds, bounds[1:])]
+
+
+def _is_coordinate(value) -> bool:
+    if isinstance(value, int):
+        return (
+            not isinstance(value, bool) and _INT64_INFO.min <= value <= _INT64_INFO.max
+        )
+    return isinstance(value, float)
+
+
+def _is_columnar_element(element) -> bool:
+    if not isinstance(element, dict):
+        return False
+    val = element.get("val")
+    if not isinstance(val, list) or not all(_is_coordinate(v) for v in val):
+        return False
+    if not isinstance(element.get("name", ""), str):
+        return False
+    if not isinstance(element.get("stream", ""), str):
+        return False
+    # the float64 column would turn integer scores into floats
+    confidence_score = element.get("confidence_score", 0.0)
+    if not isinstance(confidence_score, float) or math.isnan(confidence_score):
+        return False
+    return isinstance(element.get("closed", False), bool)
+
+
+class _StringTable:
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+
+    def get(self, value: str) -> int:
+        idx = self.index.get(value)
+        if idx is None:
+            idx = self.index[value] = len(self.index)
+        return idx
+
+    def values(self) -> List[str]:
+        return list(self.index.keys())
+
+
+def visionai_to_columnar(data: Dict) -> Dict[str, np.ndarray]:
+    """Encode VisionAI data into columnar arrays
+
+    Every `bbox`, `cuboid`, `point2d` and `poly2d` element under the frames is stored
+    as one row of flat arrays (frame index, object index, shape code, name, stream,
+    coordinates, confidence score ...). Integer coordinates are also kept in an int64
+    column, so they are restored exactly. The remaining data (streams, objects,
+    contexts, binary masks, frame properties ...) is kept as a compact JSON skeleton,
+    so the encoding is lossless.
+
+    Parameters
+    ----------
+    data : Dict
+        VisionAIModel-compatible dictionary, i.e `{"visionai": {...}}`
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        mapping of column name and its array
+    """
+    visionai = data.get("visionai") or {}
+    frames = visionai.get("frames") or {}
+
+    names = _StringTable()
+    streams = _StringTable()
+    object_ids = _StringTable()
+    extras = _StringTable()
+
+    frame_idx: List[int] = []
+    object_idx: List[int] = []
+    shape_codes: List[int] = []
+    name_idx: List[int] = []
+    stream_idx: List[int] = []
+    extra_idx: List[int] = []
+    confidence_scores: List[float] = []
+    closed_flags: List[int] = []
+    val_lengths: List[int] = []
+    coords: List[float] = []
+
+    skeleton_frames: Dict[str, Dict] = {}
+    for frame_pos, (frame_key, frame) in enumerate(frames.items()):
+        frame_objects = frame.get("objects") if isinstance(frame, dict) else None
+        if not isinstance(frame_objects, dict):
+            skeleton_frames[frame_key] = frame
+            continue
+        skeleton_objects: Dict[str, Dict] = {}
+        for obj_id, obj in frame_objects.items():
+            object_data = obj.get("object_data") if isinstance(obj, dict) else None
+            if not isinstance(object_data, dict):
+                skeleton_objects[obj_id] = obj
+                continue
+            remain_object_data = {}
+            for data_type, elements in object_data.items():
+                if (
+                    data_type not in _SHAPE_CODE_MAP
+                    or not isinstance(elements, list)
+                    or not elements
+                    or not all(_is_columnar_element(ele) for ele in elements)
+                ):
+                    remain_object_data[data_type] = elements
+                    continue
+                for element in elements:
+                    frame_idx.append(frame_pos)
+                    object_idx.append(object_ids.get(obj_id))
+                    shape_codes.append(_SHAPE_CODE_MAP[data_type])
+                    name = element.get("name")
+                    name_idx.append(-1 if name is None else names.get(name))
+                    stream = element.get("stream")
+                    stream_idx.append(-1 if stream is None else streams.get(stream))
+                    confidence_scores.append(
+                        element.get("confidence_score", float("nan"))
+                    )
+                    closed = element.get("closed")
+                    closed_flags.append(-1 if closed is None else int(closed))
+                    extra = {k: v for k, v in element.items() if k not in _COLUMN_KEYS}
+                    extra_idx.append(
+                        -1
+                        if not extra
+                        else extras.get(json.dumps(extra, separators=(",", ":")))
+                    )
+                    val_lengths.append(len(element["val"]))
+                    coords.extend(element["val"])
+
+            # the object is kept even without remaining data, so empty objects survive
+            remain_obj = {k: v for k, v in obj.items() if k != "object_data"}
+            remain_obj["object_data"] = remain_object_data
+            skeleton_objects[obj_id] = remain_obj
+        skeleton_frames[frame_key] = dict(frame, objects=skeleton_objects)
+
+    skeleton = dict(data)
+    if "visionai" in data:
+        skeleton["visionai"] = dict(visionai)
+        if "frames" in visionai:
+            skeleton["visionai"]["frames"] = skeleton_frames
+
+    val_offsets = np.zeros(len(val_lengths) + 1, dtype=np.int64)
+    if val_lengths:
+        np.cumsum(val_lengths, out=val_offsets[1:])
+
+    names_data, names_offsets = _pack_strings(names.values())
+    streams_data, streams_offsets = _pack_strings(streams.values())
+    object_ids_data, object_ids_offsets = _pack_strings(object_ids.values())
+    extras_data, extras_offsets = _pack_strings(extras.values())
+
+    return {
+        "version": np.array([COLUMNAR_VERSION], dtype=np.int32),
+        "skeleton": _pack_json(skeleton),
+        "frame_idx": np.array(frame_idx, dtype=np.int32),
+        "object_idx": np.array(object_idx, dtype=np.int32),
+        "shape": np.array(shape_codes, dtype=np.uint8),
+        "name_idx": np.array(name_idx, dtype=np.int32),
+        "stream_idx": np.array(stream_idx, dtype=np.int32),
+        "extra_idx": np.array(extra_idx, dtype=np.int32),
+        "confidence_score": np.array(confidence_scores, dtype=np.float64),
+        "closed": np.array(closed_flags, dtype=np.int8),
+        "val_offsets": val_offsets,
+        "coords": np.array(coords, dtype=np.float64),
+        # keep the original number type, so integer coordinates stay integers
+        "coords_is_int": np.array([isinstance(v, int) for v in coords], dtype=np.bool_),
+        "int_coords": np.array(
+            [v for v in coords if isinstance(v, int)], dtype=np.int64
+        ),
+        "names": names_data,
+        "names_offsets": names_offsets,
+        "streams": streams_data,
+        "streams_offsets": streams_offsets,
+        "object_ids": object_ids_data,
+        "object_ids_offsets": object_ids_offsets,
+        "extras": extras_data,
+        "extras_offsets": extras_offsets,
+    }
+
+
+def columnar_to_visionai(columns: Dict[str, np.ndarray]) -> Dict:
+    """Decode columnar arrays generated by `visionai_to_columnar` back to VisionAI data
+
+    Parameters
+    ----------
+    columns : Dict[str, np.ndarray]
+        mapping of column name and its array
+
+    Returns
+    -------
+    Dict
+        VisionAIModel-compatible dictionary
+    """
+    data = _unpack_json(columns["skeleton"])
+    if not len(columns["frame_idx"]):
+        return data
+
+    names = _unpack_strings(columns["names"], columns["names_offsets"])
+    streams = _unpack_strings(columns["streams"], columns["streams_offsets"])
+    object_ids = _unpack_strings(columns["object_ids"], columns["object_ids_offsets"])
+    extras = [
+        json.loads(extra)
+        for extra in _unpack_strings(columns["extras"], columns["extras_offsets"])
+    ]
+
+    coords: List = columns["coords"].tolist()
+    int_positions = np.flatnonzero(columns["coords_is_int"]).tolist()
+    if "int_coords" in columns:
+        for pos, value in zip(int_positions, columns["int_coords"].tolist()):
+            coords[pos] = value
+    else:
+        # files written before the int64 column only have the float coordinates
+        for pos in int_positions:
+            coords[pos] = int(coords[pos])
+    val_offsets = columns["val_offsets"].tolist()
+
+    frame_list = list(data["visionai"]["frames"].values())
+    with_confidence_list = (~np.isnan(columns["confidence_score"])).tolist()
+    confidence_list = columns["confidence_score"].tolist()
+    closed_list = columns["closed"].tolist()
+    extra_idx_list = columns["extra_idx"].tolist()
+    # skip per-row lookups of optional columns when none of the rows use them
+    has_confidence = any(with_confidence_list)
+    has_closed = bool((columns["closed"] >= 0).any())
+    has_extras = bool(extras)
+
+    last_key: Tuple[int, int] = (-1, -1)
+    object_data: Dict = {}
+    for row, (frame_pos, obj_pos, shape_code, name_pos, stream_pos) in enumerate(
+        zip(
+            columns["frame_idx"].tolist(),
+            columns["object_idx"].tolist(),
+            columns["shape"].tolist(),
+            columns["name_idx"].tolist(),
+            columns["stream_idx"].tolist(),
+        )
+    ):
+        element = {}
+        if name_pos >= 0:
+            element["name"] = names[name_pos]
+        element["val"] = coords[val_offsets[row] : val_offsets[row + 1]]
+        if stream_pos >= 0:
+            element["stream"] = streams[stream_pos]
+        if has_confidence and with_confidence_list[row]:
+            element["confidence_score"] = confidence_list[row]
+        if has_closed and closed_list[row] >= 0:
+            element["closed"] = bool(closed_list[row])
+        if has_extras and extra_idx_list[row] >= 0:
+            element.update(extras[extra_idx_list[row]])
+
+        if (frame_pos, obj_pos) != last_key:
+            last_key = (frame_pos, obj_pos)
+            frame_objects = frame_list[frame_pos].setdefault("objects", {})
+            object_data = frame_objects.setdefault(object_ids[obj_pos], {}).setdefault(
+                "object_data", {}
+            )
+        shape = COLUMNAR_SHAPES[shape_code]
+        if shape in object_data:
+            object_data[shape].append(element)
+        else:
+            object_data[shape] = [element]
+    return data
+
+
+def save_as_columnar(
+    data: Dict, file_name: str, folder_name: str = "", compressed: bool = True
+) -> None:
+    """Save VisionAI data as columnar `.npz` file
+
+    Parameters
+    ----------
+    data : Dict
+        VisionAIModel-compatible dictionary
+    file_name : str
+        destination file name, i.e `visionai.npz`
+    folder_name : str, optional
+        destination folder, by default ""
+    compressed : bool, optional
+        whether to compress the arrays, by default True
+    """
+    if folder_name:
+        os.makedirs(folder_name, exist_ok=True)
+    file_path = os.path.join(folder_name, file_name)
+    logger.info(f"[save_as_columnar] Save file to {file_path} started")
+    columns = visionai_to_columnar(data)
+    # np.savez appends the .npz extension to file paths, so we write to the file object
+    with open(file_path, "wb") as f:
+        if compressed:
+            np.savez_compressed(f, **columns)
+        else:
+            np.savez(f, **columns)
+    logger.info(f"[save_as_columnar] Save file to {file_path} success")
+
+
+def load_columns(file_path: str) -> Dict[str, np.ndarray]:
+    """Load the columnar arrays of `.npz` file without building the VisionAI dictionary
+
+    Parameters
+    ----------
+    file_path : str
+        path of the `.npz` file saved by `save_as_columnar`
+
+    Returns
+    -------
+    Dict[str, np.ndarray]
+        mapping of column name and its array
+
+    Raises
+    ------
+    VisionAIException
+        the file format version is not supported
+    """
+    with np.load(file_path, allow_pickle=False) as npz:
+        columns = {key: npz[key] for key in npz.files}
+    version = int(columns["version"][0])
+    if version != COLUMNAR_VERSION:
+        raise VisionAIException(
+            error_code=VisionAIErrorCode.VAI_ERR_045,
+            message_kwargs={"file_name": file_path, "version": version},
+        )
+    return columns
+
+
+def load_columnar(file_path: str) -> Dict:
+    """Load VisionAI data from columnar `.npz` file
+
+    Parameters
+    ----------
+    file_path : str
+        path of the `.npz` file saved by `save_as_columnar`
+
+    Returns
+    -------
+    Dict
+        VisionAIModel-compatible dictionary
+    """
+    return columnar_to_visionai(load_columns(file_path))
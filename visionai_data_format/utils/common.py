@@ -7,6 +7,8 @@ YOLO_CATEGORY_FILE = "classes.txt"
 
 GROUND_TRUTH_FOLDER = "annotations/groundtruth/"
 BBOX_NAME = "bbox_shape"
+POLY2D_NAME = "poly2d_shape"
+POINT2D_NAME = "point2d_shape"
 IMAGE_EXT = ".jpg"
 
 
@@ -1,18 +1,248 @@
 import json
 import logging
 import os
-from typing import Optional
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
-from visionai_data_format.schemas.bdd_schema import AttributeSchema, FrameSchema
+from visionai_data_format.schemas.adapters import get_type_adapter
+from visionai_data_format.schemas.bdd_schema import (
+    BDD_VERSION,
+    AttributeSchema,
+    FrameSchema,
+)
 from visionai_data_format.schemas.visionai_schema import VisionAI
 
-from .calculation import xywh2xyxy
-from .validator import validate_vai
+from .calculation import flat_to_vertices, xywh2xyxy
+from .instrumentation import incr, phase
+from .validator import load_json, validate_vai
 
 logger = logging.getLogger(__name__)
 VERSION = "00"
 
 
+def convert_vai_sequence_to_bdd(
+    annotation_file: str,
+    sequence_name: str,
+    storage_name: str,
+    container_name: str,
+    target_classes: Optional[list] = None,
+    validate_visionai: bool = True,
+    validate: bool = True,
+) -> List[Dict]:
+    """Convert the `visionai.json` of a sequence to BDD+ frames
+
+    Parameters
+    ----------
+    annotation_file : str
+        path of the `visionai.json` of the sequence
+    sequence_name : str
+        sequence name
+    storage_name : str
+        storage name of BDD+ frames
+    container_name : str
+        container (dataset) name of BDD+ frames
+    target_classes : Optional[list], optional
+        classes to convert, by default None (all classes)
+    validate_visionai : bool, optional
+        validate the VisionAI data before converting it, by default True
+    validate : bool, optional
+        validate the BDD+ frames and fill their defaults, such as the label
+        uuids, by default True
+
+    Returns
+    -------
+    List[Dict]
+        BDD+ frames of the sequence
+
+    Raises
+    ------
+    ValueError
+        if `validate_visionai` is set and the sequence isn't valid VisionAI data
+    """
+    vai_json = load_json(annotation_file)
+    if validate_visionai and validate_vai(vai_json) is None:
+        raise ValueError(f"{annotation_file} isn't valid VisionAI data")
+    frame_list = convert_vai_to_bdd_single(
+        vai_data=vai_json["visionai"],
+        sequence_name=sequence_name,
+        storage_name=storage_name,
+        container_name=container_name,
+        target_classes=target_classes,
+    )
+    del vai_json
+    if validate:
+        adapter = get_type_adapter(List[FrameSchema])
+        with phase("validation", items=len(frame_list)):
+            # `meta_ds` defaults are dicts, not `MetaDsSchema`, as in
+            # `BDDSchema.model_dump` they are dumped as is
+            frame_list = adapter.dump_python(
+                adapter.validate_python(frame_list), warnings=False
+            )
+    return frame_list
+
+
+def _convert_sequence_task(task: Tuple) -> List[Dict]:
+    return convert_vai_sequence_to_bdd(*task)
+
+
+def iter_vai_to_bdd_frames(
+    folder_name: str,
+    storage_name: str,
+    container_name: str,
+    annotation_name: str = "groundtruth",
+    target_classes: Optional[list] = None,
+    validate: bool = True,
+    validate_visionai: bool = True,
+    workers: int = 1,
+) -> Iterator[Dict]:
+    """Convert the VisionAI sequences of a folder to BDD+ frames, one sequence
+    at a time
+
+    Frames are yielded in sequence order, sequence by sequence, so only the
+    sequences being converted are held in memory.
+
+    Parameters
+    ----------
+    folder_name : str
+        VisionAI root folder, with `{sequence}/annotations/{annotation_name}/visionai.json`
+    storage_name : str
+        storage name of BDD+ frames
+    container_name : str
+        container (dataset) name of BDD+ frames
+    annotation_name : str, optional
+        annotation folder name, by default "groundtruth"
+    target_classes : Optional[list], optional
+        classes to convert, by default None (all classes)
+    validate : bool, optional
+        validate the BDD+ frames of each sequence and fill their defaults, such
+        as the label uuids, otherwise frames are yielded as converted,
+        by default True
+    validate_visionai : bool, optional
+        validate each VisionAI sequence before converting it, by default True
+    workers : int, optional
+        number of processes converting sequences, by default 1
+
+    Yields
+    ------
+    Iterator[Dict]
+        BDD+ frames
+
+    Raises
+    ------
+    ValueError
+        if a sequence isn't valid VisionAI data
+    """
+    if not os.path.exists(folder_name) or len(os.listdir(folder_name)) == 0:
+        logger.info("[iter_vai_to_bdd_frames] Folder empty or doesn't exits")
+        return
+    tasks = [
+        (
+            os.path.join(
+                folder_name,
+                sequence_name,
+                "annotations",
+                annotation_name,
+                "visionai.json",
+            ),
+            sequence_name,
+            storage_name,
+            container_name,
+            target_classes,
+            validate_visionai,
+            validate,
+        )
+        for sequence_name in sorted(os.listdir(folder_name))
+        if os.path.isdir(os.path.join(folder_name, sequence_name))
+    ]
+    if workers <= 1 or len(tasks) <= 1:
+        for task in tasks:
+            frame_list = _convert_sequence_task(task)
+            incr("frames", len(frame_list))
+            yield from frame_list
+        return
+
+    # limit submitted sequences, so converted frames don't pile up in memory
+    # while the previous sequences are written
+    max_pending = workers * 2
+    task_iter = iter(tasks)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending: Deque[Future] = deque(
+            executor.submit(_convert_sequence_task, task)
+            for task in islice(task_iter, max_pending)
+        )
+        while pending:
+            frame_list = pending.popleft().result()
+            for task in islice(task_iter, 1):
+                pending.append(executor.submit(_convert_sequence_task, task))
+            incr("frames", len(frame_list))
+            yield from frame_list
+
+
+class BDDStreamWriter:
+    """Write a BDD+ json file frame by frame
+
+    The file is written to `{file_path}.partial` and renamed to `file_path`
+    once all frames are written, it is removed if the writing fails.
+
+    Examples
+    --------
+    >>> with BDDStreamWriter("bdd.json", company_code=99) as writer:
+    ...     writer.write_frames(frames)
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        company_code: Optional[Union[int, str]] = None,
+        inference_object: str = "detection",
+    ):
+        self.file_path = file_path
+        self.n_frames = 0
+        self._header = {
+            "bdd_version": BDD_VERSION,
+            "company_code": None if company_code is None else str(company_code),
+            "inference_object": inference_object,
+            "meta_ds": {},
+            "meta_se": {},
+            "frame_list": [],
+        }
+        self._tmp_path = f"{file_path}.partial"
+        self._file = None
+
+    def __enter__(self) -> "BDDStreamWriter":
+        folder_name = os.path.dirname(self.file_path)
+        if folder_name:
+            os.makedirs(folder_name, exist_ok=True)
+        self._file = open(self._tmp_path, "w")
+        # header of the BDD+ data, up to the opening of `frame_list`
+        self._file.write(json.dumps(self._header)[: -len("]}")])
+        return self
+
+    def write_frames(self, frames: Iterable[Dict]) -> int:
+        """write BDD+ frames, returns the number of written frames"""
+        n_frames = 0
+        with phase("json_write"):
+            for frame in frames:
+                if self.n_frames:
+                    self._file.write(", ")
+                self._file.write(json.dumps(frame))
+                self.n_frames += 1
+                n_frames += 1
+        return n_frames
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        if exc_type is not None:
+            self._file.close()
+            os.remove(self._tmp_path)
+            return
+        self._file.write("]}")
+        incr("bytes_written", self._file.tell())
+        self._file.close()
+        os.replace(self._tmp_path, self.file_path)
+
+
 def convert_vai_to_bdd(
     folder_name: str,
     company_code: int,
@@ -20,29 +250,24 @@ def convert_vai_to_bdd(
     container_name: str,
     annotation_name: str = "groundtruth",
     target_classes: Optional[list] = None,
+    workers: int = 1,
 ) -> dict:
     if not os.path.exists(folder_name) or len(os.listdir(folder_name)) == 0:
         logger.info("[convert_vai_to_bdd] Folder empty or doesn't exits")
     else:
         logger.info("[convert_vai_to_bdd] Convert started")
 
-    frame_list = list()
-    for sequence_name in sorted(os.listdir(folder_name)):
-        if not os.path.isdir(os.path.join(folder_name, sequence_name)):
-            continue
-        annotation_file = os.path.join(
-            folder_name, sequence_name, "annotations", annotation_name, "visionai.json"
-        )
-        vai_json = json.loads(open(annotation_file).read())
-        vai_data = validate_vai(vai_json).visionai
-        cur_frame_list = convert_vai_to_bdd_single(
-            vai_data=vai_data,
-            sequence_name=sequence_name,
+    frame_list = list(
+        iter_vai_to_bdd_frames(
+            folder_name=folder_name,
             storage_name=storage_name,
             container_name=container_name,
+            annotation_name=annotation_name,
             target_classes=target_classes,
+            validate=False,
+            workers=workers,
         )
-        frame_list += cur_frame_list
+    )
 
     data = {"frame_list": frame_list, "company_code": company_code}
     logger.info("[convert_vai_to_bdd] Convert finished")
@@ -51,8 +276,13 @@ def convert_vai_to_bdd(
     return data
 
 
+# VisionAI shapes exported as BDD+ labels, a poly2d/point2d element is
+# a `poly2d`/`point2d` label with the vertices of its flat values
+BDD_SHAPES = ("bbox", "poly2d", "point2d")
+
+
 def convert_vai_to_bdd_single(
-    vai_data: VisionAI,
+    vai_data: Union[VisionAI, Dict],
     sequence_name: str,
     storage_name: str,
     container_name: str,
@@ -60,64 +290,115 @@ def convert_vai_to_bdd_single(
     target_sensor: str = "camera",
     target_classes: Optional[list] = None,
 ) -> list:
+    """Convert VisionAI data of a sequence to BDD+ frames
+
+    Frames and labels are built as dicts from the VisionAI data dict, a
+    `VisionAI` model is dumped first. Each bbox, poly2d and point2d element
+    is a label, with a `box2d`, `poly2d` or `point2d` geometry.
+
+    Parameters
+    ----------
+    vai_data : Union[VisionAI, Dict]
+        VisionAI data of the sequence, without its `visionai` root key
+    sequence_name : str
+        sequence name
+    storage_name : str
+        storage name of BDD+ frames
+    container_name : str
+        container (dataset) name of BDD+ frames
+    img_extension : str, optional
+        image extension of frame names, by default ".jpg"
+    target_sensor : str, optional
+        type of the converted streams, by default "camera"
+    target_classes : Optional[list], optional
+        classes to convert, by default None (all classes)
+
+    Returns
+    -------
+    list
+        BDD+ frames, one per frame and sensor
+    """
+    if isinstance(vai_data, VisionAI):
+        vai_data = vai_data.model_dump()
     frame_list = list()
-    # only support sensor type is camera/bbox annotation for now
+    # only support sensor type is camera/bbox, poly2d and point2d annotations for now
     # TODO converter for lidar annotation
-    target_classes_set = set()
-    if target_classes is not None:
-        target_classes_set = set(target_classes)
-    sensor_names = [
-        sensor_name
-        for sensor_name, sensor_content in vai_data.streams.items()
-        if sensor_content.type == target_sensor
-    ]
-    for frame_key, frame_data in vai_data.frames.items():
+    target_classes_set = set(target_classes) if target_classes is not None else None
+    sensor_sequences = {
+        sensor_name: "/".join([sequence_name, "data", sensor_name])
+        for sensor_name, sensor_content in (vai_data.get("streams") or {}).items()
+        if sensor_content.get("type") == target_sensor
+    }
+    object_classes = {
+        obj_id: obj["type"] for obj_id, obj in (vai_data.get("objects") or {}).items()
+    }
+    object_ids = {
+        class_: {
+            "project": "General",
+            "function": "General",
+            "object": class_,
+            "version": VERSION,
+        }
+        for class_ in set(object_classes.values())
+    }
+    default_attributes = AttributeSchema().model_dump()
+    poly_infos: List[Dict] = []
+    poly_vals: List[List[float]] = []
+    for frame_key, frame_data in (vai_data.get("frames") or {}).items():
         # create emtpy frame for each target sensor
-        sensor_frame = {}
         img_name = frame_key + img_extension
-        for sensor in sensor_names:
-            frame_temp = FrameSchema(
-                storage=storage_name,
-                dataset=container_name,
-                sequence="/".join([sequence_name, "data", sensor]),
-                name=img_name,
-                lidarPlaneURLs=[img_name],
-                labels=[],
-            )
-            sensor_frame[sensor] = frame_temp.model_dump()
+        sensor_frame = {
+            sensor: {
+                "name": img_name,
+                "storage": storage_name,
+                "dataset": container_name,
+                "sequence": sensor_sequence,
+                "labels": [],
+                "frameLabels": [],
+                "meta_ds": {},
+                "lidarPlaneURLs": [img_name],
+            }
+            for sensor, sensor_sequence in sensor_sequences.items()
+        }
         idx = 0
-        objects = getattr(frame_data, "objects", None) or {}
-        for obj_id, obj_data in objects.items():
-            class_ = vai_data.objects.get(obj_id).type
+        for obj_id, obj_data in (frame_data.get("objects") or {}).items():
+            class_ = object_classes[obj_id]
             # filter classes if target_classes is not None
-            if target_classes is not None:
-                if class_ not in target_classes_set:
-                    continue
-            bboxes = obj_data.object_data.bbox or [] if obj_data.object_data else []
-            for bbox in bboxes:
-                geometry = bbox.val
-                sensor = bbox.stream  # which sensor is the bbox from
-                label = dict()
-                label["category"] = class_
-                label["meta_ds"] = {}
-                label["meta_se"] = {}
-                x1, y1, x2, y2 = xywh2xyxy(geometry)
-                box2d = {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
-                if bbox.confidence_score is not None:
-                    label["meta_ds"]["score"] = bbox.confidence_score
-                label["box2d"] = box2d
-
-                object_id = {
-                    "project": "General",
-                    "function": "General",
-                    "object": class_,
-                    "version": VERSION,
-                }
-                label["objectId"] = object_id
-                label["attributes"] = AttributeSchema(INSTANCE_ID=idx).model_dump()
-                sensor_frame[sensor]["labels"].append(label)
-                idx += 1
+            if target_classes_set is not None and class_ not in target_classes_set:
+                continue
+            object_data = obj_data.get("object_data") or {}
+            for shape in BDD_SHAPES:
+                for element in object_data.get(shape) or []:
+                    meta_ds = {}
+                    if element.get("confidence_score") is not None:
+                        meta_ds["score"] = element["confidence_score"]
+                    label = {
+                        "category": class_,
+                        "meta_ds": meta_ds,
+                        "meta_se": {},
+                    }
+                    if shape == "bbox":
+                        x1, y1, x2, y2 = xywh2xyxy(element["val"])
+                        label["box2d"] = {"x1": x1, "y1": y1, "x2": x2, "y2": y2}
+                    else:
+                        # vertices are filled for all the sequence at once
+                        poly_info = {
+                            "vertices": [],
+                            "closed": element.get("closed", False),
+                            "types": "",
+                        }
+                        poly_infos.append(poly_info)
+                        poly_vals.append(element["val"])
+                        label[shape] = [poly_info]
+                    label["objectId"] = dict(object_ids[class_])
+                    label["attributes"] = {**default_attributes, "INSTANCE_ID": idx}
+                    # which sensor is the shape from
+                    sensor_frame[element["stream"]]["labels"].append(label)
+                    idx += 1
         # frame for different sensors is consider a unique frame in bdd
-        for _, frame in sensor_frame.items():
-            frame_list.append(frame)
+        frame_list.extend(sensor_frame.values())
+
+    for poly_info, vertices in zip(poly_infos, flat_to_vertices(poly_vals)):
+        poly_info["vertices"] = vertices
+        poly_info["types"] = "L" * len(vertices)
     return frame_list
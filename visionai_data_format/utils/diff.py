@@ -0,0 +1,277 @@
+import copy
+import hashlib
+import json
+import logging
+from typing import Any, Dict, List, Optional
+
+from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
+from visionai_data_format.utils.instrumentation import incr, phase
+
+__all__ = [
+    "fingerprint",
+    "frame_fingerprints",
+    "sequence_fingerprint",
+    "diff_visionai",
+    "apply_patch",
+    "summarize_patch",
+]
+
+logger = logging.getLogger(__name__)
+
+PATCH_VERSION = 1
+
+
+def fingerprint(data: Any) -> str:
+    """stable hash of JSON data, independent of its key order"""
+    content = json.dumps(data, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(content, digest_size=16).hexdigest()
+
+
+def _unwrap(data: Dict) -> Dict:
+    # accept the content of `visionai.json` or the visionai data under its root key
+    return data["visionai"] if "visionai" in data else data
+
+
+def frame_fingerprints(visionai: Dict) -> Dict[str, str]:
+    """fingerprint of each frame of visionai data, by frame key"""
+    visionai = _unwrap(visionai)
+    frames = visionai.get("frames", {})
+    with phase("frame_fingerprints", items=len(frames)):
+        return {frame_key: fingerprint(frame) for frame_key, frame in frames.items()}
+
+
+def sequence_fingerprint(
+    visionai: Dict, fingerprints: Optional[Dict[str, str]] = None
+) -> str:
+    """fingerprint of visionai data, built from the fingerprints of its frames
+
+    Parameters
+    ----------
+    visionai : Dict
+        visionai data
+    fingerprints : Optional[Dict[str, str]], optional
+        frame fingerprints of `visionai`, computed if not given
+
+    Returns
+    -------
+    str
+        sequence fingerprint
+    """
+    visionai = _unwrap(visionai)
+    if fingerprints is None:
+        fingerprints = frame_fingerprints(visionai)
+    data = {key: value for key, value in visionai.items() if key != "frames"}
+    data["frames"] = fingerprints
+    return fingerprint(data)
+
+
+def _diff_mapping(old: Dict, new: Dict) -> Dict:
+    """patch node from `old` to `new`
+
+    A node has `set` for added or replaced values, `removed` for removed keys,
+    `modified` for nested nodes of changed dictionaries and `order` for the new
+    key order if it isn't kept by the other operations.
+    Lists, such as bbox values or frame intervals, are replaced as a whole.
+    """
+    node: Dict[str, Any] = {}
+    set_values = {}
+    modified = {}
+    for key, new_value in new.items():
+        if key not in old:
+            set_values[key] = new_value
+            continue
+        old_value = old[key]
+        if old_value == new_value:
+            continue
+        if isinstance(old_value, dict) and isinstance(new_value, dict):
+            modified[key] = _diff_mapping(old_value, new_value)
+        else:
+            set_values[key] = new_value
+    removed = [key for key in old if key not in new]
+    if set_values:
+        node["set"] = set_values
+    if removed:
+        node["removed"] = removed
+    if modified:
+        node["modified"] = modified
+    # applied keys are appended, keep the order of `new` if it differs
+    expected_order = [key for key in old if key in new]
+    expected_order += [key for key in new if key not in old]
+    if expected_order != list(new):
+        node["order"] = list(new)
+    return node
+
+
+def _diff_frames(
+    old_frames: Dict[str, Dict],
+    new_frames: Dict[str, Dict],
+    old_fingerprints: Dict[str, str],
+    new_fingerprints: Dict[str, str],
+) -> Dict:
+    node: Dict[str, Any] = {}
+    set_values = {}
+    modified = {}
+    for frame_key, new_frame in new_frames.items():
+        if frame_key not in old_frames:
+            set_values[frame_key] = new_frame
+        # only frames with different fingerprints are compared
+        elif old_fingerprints[frame_key] != new_fingerprints[frame_key]:
+            modified[frame_key] = _diff_mapping(old_frames[frame_key], new_frame)
+    removed = [frame_key for frame_key in old_frames if frame_key not in new_frames]
+    incr("frames_changed", len(set_values) + len(modified) + len(removed))
+    if set_values:
+        node["set"] = set_values
+    if removed:
+        node["removed"] = removed
+    if modified:
+        node["modified"] = modified
+    expected_order = [key for key in old_frames if key in new_frames]
+    expected_order += list(set_values)
+    if expected_order != list(new_frames):
+        node["order"] = list(new_frames)
+    return node
+
+
+def diff_visionai(
+    old: Dict,
+    new: Dict,
+    old_fingerprints: Optional[Dict[str, str]] = None,
+    new_fingerprints: Optional[Dict[str, str]] = None,
+) -> Dict:
+    """Compute the patch from `old` to `new` visionai data
+
+    Frames with equal fingerprints are skipped without comparing them,
+    `frame_fingerprints` of a previous annotation round can be kept and passed
+    as `old_fingerprints` to skip hashing the old frames again.
+    The patch contains the added, removed and modified frames, objects and
+    contexts; modified ones only contain their changed fields, such as the
+    boxes or attributes of a frame object or the frame intervals of an object.
+
+    Parameters
+    ----------
+    old : Dict
+        old visionai data, or the content of its `visionai.json`
+    new : Dict
+        new visionai data, or the content of its `visionai.json`
+    old_fingerprints : Optional[Dict[str, str]], optional
+        frame fingerprints of `old`, computed if not given
+    new_fingerprints : Optional[Dict[str, str]], optional
+        frame fingerprints of `new`, computed if not given
+
+    Returns
+    -------
+    Dict
+        JSON serializable patch, with the `base` and `target` sequence
+        fingerprints, see `apply_patch`
+    """
+    old = _unwrap(old)
+    new = _unwrap(new)
+    if old_fingerprints is None:
+        old_fingerprints = frame_fingerprints(old)
+    if new_fingerprints is None:
+        new_fingerprints = frame_fingerprints(new)
+
+    with phase("diff_visionai", items=len(new.get("frames", {}))):
+        old_rest = {key: value for key, value in old.items() if key != "frames"}
+        new_rest = {key: value for key, value in new.items() if key != "frames"}
+        node = _diff_mapping(old_rest, new_rest)
+        node.pop("order", None)
+        frames_node = _diff_frames(
+            old.get("frames", {}),
+            new.get("frames", {}),
+            old_fingerprints,
+            new_fingerprints,
+        )
+        if frames_node:
+            node.setdefault("modified", {})["frames"] = frames_node
+
+    return {
+        "version": PATCH_VERSION,
+        "base": sequence_fingerprint(old, old_fingerprints),
+        "target": sequence_fingerprint(new, new_fingerprints),
+        "visionai": node,
+    }
+
+
+def _apply_node(data: Dict, node: Dict) -> Dict:
+    # copy only the dictionaries along the patched paths, the others are shared
+    data = dict(data)
+    for key in node.get("removed", []):
+        data.pop(key, None)
+    for key, sub_node in node.get("modified", {}).items():
+        data[key] = _apply_node(data.get(key, {}), sub_node)
+    for key, value in node.get("set", {}).items():
+        data[key] = copy.deepcopy(value)
+    if "order" in node:
+        data = {key: data[key] for key in node["order"]}
+    return data
+
+
+def apply_patch(visionai: Dict, patch: Dict, check_fingerprints: bool = True) -> Dict:
+    """Apply a patch of `diff_visionai` to visionai data
+
+    Parameters
+    ----------
+    visionai : Dict
+        visionai data the patch was computed from, or the content of its
+        `visionai.json`, it isn't modified
+    patch : Dict
+        patch of `diff_visionai`
+    check_fingerprints : bool, optional
+        check `visionai` is the base of the patch and the result is its target,
+        by default True
+
+    Returns
+    -------
+    Dict
+        patched visionai data, in the same form as `visionai`.
+        Unchanged frames, objects and contexts are shared with `visionai`
+
+    Raises
+    ------
+    VisionAIException
+        if `check_fingerprints` is set and `visionai` isn't the base
+        of the patch, or the patched data isn't its target
+    """
+    wrapped = "visionai" in visionai
+    data = _unwrap(visionai)
+    if check_fingerprints and sequence_fingerprint(data) != patch["base"]:
+        raise VisionAIException(
+            error_code=VisionAIErrorCode.VAI_ERR_046,
+            message_kwargs={
+                "fingerprint": sequence_fingerprint(data),
+                "patch_fingerprint": patch["base"],
+            },
+        )
+
+    with phase("apply_patch"):
+        patched = _apply_node(data, patch["visionai"])
+
+    if check_fingerprints:
+        patched_fingerprint = sequence_fingerprint(patched)
+        if patched_fingerprint != patch["target"]:
+            raise VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_046,
+                message_kwargs={
+                    "fingerprint": patched_fingerprint,
+                    "patch_fingerprint": patch["target"],
+                },
+            )
+    return {**visionai, "visionai": patched} if wrapped else patched
+
+
+def summarize_patch(patch: Dict) -> Dict[str, Dict[str, int]]:
+    """number of added, removed and modified frames, objects and contexts"""
+    added: Dict = patch["visionai"].get("set", {})
+    modified: Dict = patch["visionai"].get("modified", {})
+    summary = {}
+    for key in ("frames", "objects", "contexts"):
+        node = modified.get(key, {})
+        # a whole new `objects`/`contexts` of visionai is set at the root
+        added_keys: List[str] = list(added.get(key) or node.get("set", {}))
+        summary[key] = {
+            "added": len(added_keys),
+            "removed": len(node.get("removed", [])),
+            "modified": len(node.get("modified", {})),
+        }
+    return summary
@@ -0,0 +1,235 @@
+from array import array
+from collections import defaultdict
+from typing import ClassVar, Dict, Iterable, List, Optional, Sequence, Type, Union
+
+import numpy as np
+
+from visionai_data_format.exceptions import VisionAIErrorCode, VisionAIException
+from visionai_data_format.schemas.visionai_schema import (
+    Bbox,
+    Cuboid,
+    ObjectDataElement,
+    Point2D,
+    Poly2D,
+)
+
+__all__ = [
+    "GeometryRecord",
+    "BboxRecord",
+    "CuboidRecord",
+    "Point2DRecord",
+    "Poly2DRecord",
+    "GEOMETRY_RECORDS",
+    "record_from_dict",
+    "records_to_object_data",
+]
+
+Number = Union[float, int]
+
+
+class GeometryRecord:
+    """Lightweight geometry of an object data element
+
+    The coordinates are kept in a compact `array("d")` together with a bit mask of
+    the integer positions (so integer coordinates are dumped as integers again),
+    instead of a pydantic model holding a list of python numbers.
+    Records are meant to be used internally, use `to_dict` or `to_model` to convert
+    them at the API boundary.
+    """
+
+    __slots__ = (
+        "name",
+        "stream",
+        "confidence_score",
+        "attributes",
+        "extra",
+        "_val",
+        "_int_mask",
+    )
+
+    shape: ClassVar[str] = ""
+    model: ClassVar[Type[ObjectDataElement]] = ObjectDataElement
+    val_length: ClassVar[Optional[int]] = None
+
+    def __init__(
+        self,
+        name: str,
+        val: Sequence[Number],
+        stream: str,
+        confidence_score: Optional[float] = None,
+        attributes: Optional[Dict] = None,
+        **extra,
+    ) -> None:
+        self.name = name
+        self.stream = stream
+        self.confidence_score = confidence_score
+        self.attributes = attributes
+        self.extra = extra or None
+        self.val = val
+
+    @property
+    def val(self) -> List[Number]:
+        mask = self._int_mask
+        if not mask:
+            return self._val.tolist()
+        return [
+            int(v) if mask >> idx & 1 else v for idx, v in enumerate(self._val.tolist())
+        ]
+
+    @val.setter
+    def val(self, val: Sequence[Number]) -> None:
+        self._val = array("d", val)
+        mask = 0
+        for idx, v in enumerate(val):
+            if isinstance(v, int):
+                mask |= 1 << idx
+        self._int_mask = mask
+
+    def as_array(self) -> np.ndarray:
+        """zero-copy float64 view of the coordinates"""
+        return np.frombuffer(self._val, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self._val)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(name={self.name!r}, val={self.val!r})"
+
+    def __eq__(self, other) -> bool:
+        if type(self) is not type(other):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def validate(self) -> "GeometryRecord":
+        """validate the coordinate length with the same rule as the pydantic model
+
+        Raises
+        ------
+        VisionAIException
+            VAI_ERR_013 if the coordinate length is not allowed
+        """
+        if self.val_length is not None and len(self._val) != self.val_length:
+            raise VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_013,
+                message_kwargs={"allowed_length": f"{self.val_length} elements"},
+            )
+        return self
+
+    def to_dict(self) -> Dict:
+        data = {"name": self.name, "val": self.val, "stream": self.stream}
+        if self.confidence_score is not None:
+            data["confidence_score"] = self.confidence_score
+        if self.attributes is not None:
+            data["attributes"] = self.attributes
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    def to_model(self) -> ObjectDataElement:
+        return self.model.model_validate(self.to_dict())
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "GeometryRecord":
+        return cls(**data)
+
+    @classmethod
+    def from_model(cls, model: ObjectDataElement) -> "GeometryRecord":
+        return cls.from_dict(model.model_dump())
+
+
+class BboxRecord(GeometryRecord):
+    __slots__ = ()
+
+    shape = "bbox"
+    model = Bbox
+    val_length = 4
+
+
+class CuboidRecord(GeometryRecord):
+    __slots__ = ()
+
+    shape = "cuboid"
+    model = Cuboid
+    val_length = 9
+
+
+class Point2DRecord(GeometryRecord):
+    __slots__ = ()
+
+    shape = "point2d"
+    model = Point2D
+    val_length = 2
+
+
+class Poly2DRecord(GeometryRecord):
+    __slots__ = ("closed", "mode")
+
+    shape = "poly2d"
+    model = Poly2D
+
+    def __init__(
+        self,
+        name: str,
+        val: Sequence[Number],
+        stream: str,
+        closed: bool,
+        mode: Optional[str] = None,
+        **kwargs,
+    ) -> None:
+        super().__init__(name=name, val=val, stream=stream, **kwargs)
+        self.closed = closed
+        self.mode = mode
+
+    def vertices(self) -> np.ndarray:
+        """coordinates as (n, 2) array of [x, y] vertices"""
+        return self.as_array().reshape(-1, 2)
+
+    def validate(self) -> "Poly2DRecord":
+        if len(self._val) < 2:
+            raise VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_013,
+                message_kwargs={"allowed_length": "minimum 2 items"},
+            )
+        if len(self._val) % 2 != 0:
+            raise VisionAIException(
+                error_code=VisionAIErrorCode.VAI_ERR_013,
+                message_kwargs={"allowed_length": "even number"},
+            )
+        return self
+
+    def to_dict(self) -> Dict:
+        data = super().to_dict()
+        data["closed"] = self.closed
+        if self.mode is not None:
+            data["mode"] = self.mode
+        return data
+
+
+GEOMETRY_RECORDS: Dict[str, Type[GeometryRecord]] = {
+    record.shape: record
+    for record in (BboxRecord, CuboidRecord, Point2DRecord, Poly2DRecord)
+}
+
+
+def record_from_dict(shape: str, data: Dict) -> GeometryRecord:
+    """build geometry record of the object data element `data` under `shape` key"""
+    return GEOMETRY_RECORDS[shape].from_dict(data)
+
+
+def records_to_object_data(records: Iterable[GeometryRecord]) -> Dict[str, List[Dict]]:
+    """group geometry records by their shape as the `object_data` of an object
+
+    Parameters
+    ----------
+    records : Iterable[GeometryRecord]
+        geometry records of an object under a frame
+
+    Returns
+    -------
+    Dict[str, List[Dict]]
+        dictionary in `DynamicObjectData` form, such as {"bbox": [{...}]}
+    """
+    object_data = defaultdict(list)
+    for record in records:
+        object_data[record.shape].append(record.to_dict())
+    return dict(object_data)
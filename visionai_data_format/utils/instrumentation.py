@@ -0,0 +1,178 @@
+import json
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterator, Optional, Union
+
+__all__ = ["MetricsRecorder", "get_recorder", "phase", "incr"]
+
+# callback(kind, name, value), kind is "phase" (value in seconds) or "counter"
+MetricsCallback = Callable[[str, str, float], None]
+
+_ACTIVE_RECORDER: ContextVar[Optional["MetricsRecorder"]] = ContextVar(
+    "visionai_metrics_recorder", default=None
+)
+
+
+class MetricsRecorder:
+    """Record wall time of named phases and counters of a run
+
+    Phases (such as `json_read`, `validation`, `sensor_copy`, `image_probe` or
+    `json_write`) record their number of calls, total/max seconds and processed
+    items. Counters (such as `bytes_read`, `bytes_written`, `files_copied`,
+    `frames` or `objects`) are plain sums. Nested phases are recorded separately,
+    so the time of an inner phase is also part of its outer phase.
+
+    Each counter name has one meaning across converters, so runs can be compared:
+    `objects` counts VisionAI sequence objects, `annotations` counts COCO
+    annotations and YOLO label lines, and `elements` counts VisionAI object data
+    elements (shapes and masks) transformed by the resize tools.
+
+    Usage:
+        metrics = MetricsRecorder()
+        with metrics.activate():
+            ...  # instrumented code calls `phase()` and `incr()` of this module
+        print(metrics.to_prometheus())
+    """
+
+    def __init__(self, callback: Optional[MetricsCallback] = None) -> None:
+        self.callback = callback
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, float] = defaultdict(float)
+        self._lock = threading.Lock()
+        self._started_at = time.perf_counter()
+        self._finished_at: Optional[float] = None
+
+    @contextmanager
+    def activate(self) -> Iterator["MetricsRecorder"]:
+        """make this recorder the target of module level `phase` and `incr`"""
+        token = _ACTIVE_RECORDER.set(self)
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+        try:
+            yield self
+        finally:
+            self._finished_at = time.perf_counter()
+            _ACTIVE_RECORDER.reset(token)
+
+    @contextmanager
+    def phase(self, name: str, items: int = 0) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_phase(name, time.perf_counter() - start, items)
+
+    def record_phase(self, name: str, seconds: float, items: int = 0) -> None:
+        with self._lock:
+            stats = self.phases.get(name)
+            if stats is None:
+                stats = self.phases[name] = {
+                    "calls": 0,
+                    "seconds": 0.0,
+                    "max_seconds": 0.0,
+                    "items": 0,
+                }
+            stats["calls"] += 1
+            stats["seconds"] += seconds
+            stats["max_seconds"] = max(stats["max_seconds"], seconds)
+            stats["items"] += items
+        if self.callback:
+            self.callback("phase", name, seconds)
+
+    def incr(self, name: str, value: Union[int, float] = 1) -> None:
+        with self._lock:
+            self.counters[name] += value
+        if self.callback:
+            self.callback("counter", name, value)
+
+    def merge(self, other: Union["MetricsRecorder", Dict]) -> None:
+        """add phases and counters of another recorder or of its summary"""
+        summary = other.summary() if isinstance(other, MetricsRecorder) else other
+        with self._lock:
+            for name, other_stats in summary.get("phases", {}).items():
+                stats = self.phases.setdefault(
+                    name, {"calls": 0, "seconds": 0.0, "max_seconds": 0.0, "items": 0}
+                )
+                for key in ("calls", "seconds", "items"):
+                    stats[key] += other_stats[key]
+                stats["max_seconds"] = max(
+                    stats["max_seconds"], other_stats["max_seconds"]
+                )
+            for name, value in summary.get("counters", {}).items():
+                self.counters[name] += value
+
+    @property
+    def wall_seconds(self) -> float:
+        end = self._finished_at or time.perf_counter()
+        return end - self._started_at
+
+    def summary(self) -> Dict:
+        with self._lock:
+            return {
+                "wall_seconds": self.wall_seconds,
+                "phases": {name: dict(stats) for name, stats in self.phases.items()},
+                "counters": dict(self.counters),
+            }
+
+    def to_json(self, file_path: Optional[str] = None) -> str:
+        content = json.dumps(self.summary(), indent=4)
+        if file_path:
+            with open(file_path, "w") as f:
+                f.write(content)
+        return content
+
+    def to_prometheus(
+        self, prefix: str = "visionai", file_path: Optional[str] = None
+    ) -> str:
+        """snapshot in Prometheus text exposition format"""
+        summary = self.summary()
+        lines = [
+            f"# TYPE {prefix}_run_seconds gauge",
+            f"{prefix}_run_seconds {summary['wall_seconds']}",
+        ]
+        phase_metrics = (
+            ("phase_calls_total", "counter", "calls"),
+            ("phase_seconds_total", "counter", "seconds"),
+            ("phase_max_seconds", "gauge", "max_seconds"),
+            ("phase_items_total", "counter", "items"),
+        )
+        for metric, metric_type, key in phase_metrics:
+            if not summary["phases"]:
+                break
+            lines.append(f"# TYPE {prefix}_{metric} {metric_type}")
+            for name, stats in summary["phases"].items():
+                lines.append(f'{prefix}_{metric}{{phase="{name}"}} {stats[key]}')
+        for name, value in summary["counters"].items():
+            lines.append(f"# TYPE {prefix}_{name}_total counter")
+            lines.append(f"{prefix}_{name}_total {value}")
+        content = "\n".join(lines) + "\n"
+        if file_path:
+            with open(file_path, "w") as f:
+                f.write(content)
+        return content
+
+
+def get_recorder() -> Optional[MetricsRecorder]:
+    """the active recorder of the current context, if any"""
+    return _ACTIVE_RECORDER.get()
+
+
+@contextmanager
+def phase(name: str, items: int = 0) -> Iterator[None]:
+    """time a phase on the active recorder, no-op without active recorder"""
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is None:
+        yield
+        return
+    with recorder.phase(name, items):
+        yield
+
+
+def incr(name: str, value: Union[int, float] = 1) -> None:
+    """increase a counter on the active recorder, no-op without active recorder"""
+    recorder = _ACTIVE_RECORDER.get()
+    if recorder is not None:
+        recorder.incr(name, value)
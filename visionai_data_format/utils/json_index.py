@@ -0,0 +1,373 @@
+import json
+import logging
+import mmap
+import os
+import re
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+FRAME_INDEX_VERSION = 1
+FRAME_INDEX_EXT = ".idx"
+# visionai keys whose members are indexed one by one
+INDEXED_SECTIONS = ("frames", "objects", "contexts")
+
+_STRING_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"')
+_TOKEN_RE = re.compile(rb'"[^"\\]*(?:\\.[^"\\]*)*"|[{}\[\]]')
+_SCALAR_RE = re.compile(rb"[^,}\]\s]+")
+_WHITESPACE = frozenset(b" \t\r\n")
+_OPEN_BRACKETS = frozenset(b"{[")
+_CLOSE_BRACKETS = frozenset(b"}]")
+
+Span = Tuple[int, int]
+
+
+def _skip_whitespace(buf, pos: int) -> int:
+    while buf[pos] in _WHITESPACE:
+        pos += 1
+    return pos
+
+
+def _expect(buf, pos: int, char: bytes) -> int:
+    pos = _skip_whitespace(buf, pos)
+    if buf[pos] != char[0]:
+        raise ValueError(f"Expecting {char!r} at byte {pos}")
+    return pos + 1
+
+
+def find_value_end(buf, start: int) -> int:
+    """Find the end position (exclusive) of the JSON value starting at `start`
+
+    Parameters
+    ----------
+    buf : bytes-like object
+        JSON content, such as `bytes` or `mmap.mmap`
+    start : int
+        position of the first byte of the value
+
+    Returns
+    -------
+    int
+        position right after the last byte of the value
+    """
+    first = buf[start]
+    if first == ord('"'):
+        return _STRING_RE.match(buf, start).end()
+    if first not in _OPEN_BRACKETS:
+        return _SCALAR_RE.match(buf, start).end()
+    # only strings and brackets matter to find the matching bracket,
+    # the string pattern makes sure brackets inside strings are skipped
+    depth = 0
+    for token in _TOKEN_RE.finditer(buf, start):
+        char = buf[token.start()]
+        if char in _OPEN_BRACKETS:
+            depth += 1
+        elif char in _CLOSE_BRACKETS:
+            depth -= 1
+            if not depth:
+                return token.end()
+    raise ValueError(f"Unterminated JSON value starting at byte {start}")
+
+
+def iter_object_members(
+    buf,
+    start: int,
+    value_end: Optional[Callable[[str, int], int]] = None,
+) -> Generator[Tuple[str, int, int], None, int]:
+    """Iterate members of the JSON object starting at `start` without decoding values
+
+    Parameters
+    ----------
+    buf : bytes-like object
+        JSON content, such as `bytes` or `mmap.mmap`
+    start : int
+        position of the `{` of the object
+    value_end : Optional[Callable[[str, int], int]], optional
+        function to retrieve the end position of a member value from its key and start
+        position, by default `find_value_end` is used
+
+    Yields
+    ------
+    Tuple[str, int, int]
+        member key, start and end (exclusive) position of the member value
+
+    Returns
+    -------
+    int
+        position right after the `}` of the object
+    """
+    pos = _expect(buf, start, b"{")
+    pos = _skip_whitespace(buf, pos)
+    if buf[pos] == ord("}"):
+        return pos + 1
+    while True:
+        key_match = _STRING_RE.match(buf, pos)
+        if not key_match:
+            raise ValueError(f"Expecting object key at byte {pos}")
+        key = json.loads(bytes(key_match.group()))
+        value_start = _skip_whitespace(buf, _expect(buf, key_match.end(), b":"))
+        end = (
+            value_end(key, value_start)
+            if value_end
+            else find_value_end(buf, value_start)
+        )
+        yield key, value_start, end
+        pos = _skip_whitespace(buf, end)
+        if buf[pos] == ord("}"):
+            return pos + 1
+        pos = _skip_whitespace(buf, _expect(buf, pos, b","))
+
+
+def iter_array_items(buf, start: int) -> Generator[Span, None, int]:
+    """Iterate items of the JSON array starting at `start` without decoding them
+
+    Parameters
+    ----------
+    buf : bytes-like object
+        JSON content, such as `bytes` or `mmap.mmap`
+    start : int
+        position of the `[` of the array
+
+    Yields
+    ------
+    Tuple[int, int]
+        start and end (exclusive) position of the item
+
+    Returns
+    -------
+    int
+        position right after the `]` of the array
+    """
+    pos = _skip_whitespace(buf, _expect(buf, start, b"["))
+    if buf[pos] == ord("]"):
+        return pos + 1
+    while True:
+        end = find_value_end(buf, pos)
+        yield pos, end
+        pos = _skip_whitespace(buf, end)
+        if buf[pos] == ord("]"):
+            return pos + 1
+        pos = _skip_whitespace(buf, _expect(buf, pos, b","))
+
+
+def index_object_members(buf, start: int) -> Tuple[Dict[str, Span], int]:
+    """Map each member key of the JSON object starting at `start` to its value span
+
+    Returns
+    -------
+    Tuple[Dict[str, Tuple[int, int]], int]
+        mapping of member key and value span, and the end position of the object
+    """
+    members: Dict[str, Span] = {}
+    iterator = iter_object_members(buf, start)
+    while True:
+        try:
+            key, value_start, value_end = next(iterator)
+        except StopIteration as stop:
+            return members, stop.value
+        members[key] = (value_start, value_end)
+
+
+def index_member_array(buf, key: str) -> List[Span]:
+    """List the item spans of the array under `key` of the root JSON object,
+    such as the frames of `frame_list` in a BDD+ file
+
+    Parameters
+    ----------
+    buf : bytes-like object
+        JSON content, such as `bytes` or `mmap.mmap`
+    key : str
+        key of the array in the root object
+
+    Returns
+    -------
+    List[Tuple[int, int]]
+        start and end (exclusive) position of each item, empty if there
+        is no such array
+    """
+    spans: List[Span] = []
+
+    def member_end(member: str, value_start: int) -> int:
+        if member != key or buf[value_start] != ord("["):
+            return find_value_end(buf, value_start)
+        iterator = iter_array_items(buf, value_start)
+        while True:
+            try:
+                spans.append(next(iterator))
+            except StopIteration as stop:
+                return stop.value
+
+    for _ in iter_object_members(buf, _skip_whitespace(buf, 0), value_end=member_end):
+        pass
+    return spans
+
+
+def _file_stat(file_path: str) -> Dict[str, int]:
+    stat = os.stat(file_path)
+    return {"file_size": stat.st_size, "file_mtime_ns": stat.st_mtime_ns}
+
+
+def build_frame_index(file_path: str, index_path: Optional[str] = None) -> Dict:
+    """Build byte offset index of a `visionai.json` file and save it as sidecar file
+
+    The index maps each key of `frames`, `objects` and `contexts` to the byte range
+    of its value, and each key under `visionai` to the byte range of its section.
+
+    Parameters
+    ----------
+    file_path : str
+        path of `visionai.json`
+    index_path : Optional[str], optional
+        path of the sidecar index file, by default `{file_path}.idx`
+
+    Returns
+    -------
+    Dict
+        the frame index
+    """
+    logger.info(f"[build_frame_index] Build index of {file_path} started")
+    index: Dict = {"version": FRAME_INDEX_VERSION, **_file_stat(file_path)}
+    sections: Dict[str, Span] = {}
+    indexed: Dict[str, Dict[str, Span]] = {key: {} for key in INDEXED_SECTIONS}
+    with open(file_path, "rb") as f, mmap.mmap(
+        f.fileno(), 0, access=mmap.ACCESS_READ
+    ) as mm:
+
+        def section_end(key: str, value_start: int) -> int:
+            if key in indexed and mm[value_start] == ord("{"):
+                indexed[key], end = index_object_members(mm, value_start)
+                return end
+            return find_value_end(mm, value_start)
+
+        root_start = _skip_whitespace(mm, 0)
+        for key, value_start, value_end in iter_object_members(mm, root_start):
+            if key != "visionai":
+                continue
+            for section, section_start, end in iter_object_members(
+                mm, value_start, value_end=section_end
+            ):
+                sections[section] = (section_start, end)
+
+    index["sections"] = sections
+    index.update(indexed)
+    index_path = index_path or file_path + FRAME_INDEX_EXT
+    with open(index_path, "w") as f:
+        json.dump(index, f)
+    logger.info(f"[build_frame_index] Build index of {file_path} finished")
+    return index
+
+
+def load_frame_index(
+    file_path: str, index_path: Optional[str] = None, rebuild: bool = False
+) -> Dict:
+    """Load the sidecar index of `visionai.json`, the index is (re)built when it
+    doesn't exist or is outdated with the json file
+
+    Parameters
+    ----------
+    file_path : str
+        path of `visionai.json`
+    index_path : Optional[str], optional
+        path of the sidecar index file, by default `{file_path}.idx`
+    rebuild : bool, optional
+        force rebuilding the index, by default False
+
+    Returns
+    -------
+    Dict
+        the frame index
+    """
+    index_path = index_path or file_path + FRAME_INDEX_EXT
+    if not rebuild and os.path.exists(index_path):
+        with open(index_path) as f:
+            index = json.load(f)
+        if index.get("version") == FRAME_INDEX_VERSION and all(
+            index.get(key) == value for key, value in _file_stat(file_path).items()
+        ):
+            return index
+        logger.info(f"[load_frame_index] Index {index_path} is outdated")
+    return build_frame_index(file_path, index_path=index_path)
+
+
+class VisionAIFrameReader:
+    """Random access reader of frames in a large `visionai.json` file
+
+    Only the byte range of the requested frames (and their referenced objects/contexts)
+    are decoded through a memory map of the file, so reading one frame is proportional
+    to the frame size instead of the file size.
+
+    Usage:
+        with VisionAIFrameReader("visionai.json") as reader:
+            frame = reader.get_frame(12)
+            data = reader.get_frames([12, 13])
+    """
+
+    def __init__(
+        self, file_path: str, index_path: Optional[str] = None, rebuild: bool = False
+    ) -> None:
+        self.file_path = file_path
+        self.index: Dict = load_frame_index(
+            file_path, index_path=index_path, rebuild=rebuild
+        )
+        self._file = open(file_path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self) -> None:
+        self._mm.close()
+        self._file.close()
+
+    def __enter__(self) -> "VisionAIFrameReader":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    @property
+    def frame_keys(self) -> List[str]:
+        return list(self.index["frames"].keys())
+
+    def __len__(self) -> int:
+        return len(self.index["frames"])
+
+    def _decode(self, span: Span):
+        start, end = span
+        return json.loads(self._mm[start:end])
+
+    @staticmethod
+    def _frame_key(frame: Union[int, str]) -> str:
+        return frame if isinstance(frame, str) else f"{frame:012d}"
+
+    def get_section(self, section: str):
+        """decode a section under visionai, such as `streams` or `metadata`"""
+        return self._decode(self.index["sections"][section])
+
+    def get_frame(self, frame: Union[int, str]) -> Dict:
+        """decode single frame by its frame number or its 12 digits frame key"""
+        return self._decode(self.index["frames"][self._frame_key(frame)])
+
+    def get_object(self, uuid: str) -> Dict:
+        return self._decode(self.index["objects"][uuid])
+
+    def get_context(self, uuid: str) -> Dict:
+        return self._decode(self.index["contexts"][uuid])
+
+    def get_frames(self, frames: Iterable[Union[int, str]]) -> Dict[str, Dict]:
+        """decode the requested frames with the objects and contexts they refer to
+
+        Returns
+        -------
+        Dict[str, Dict]
+            dictionary with `frames`, `objects` and `contexts` keys, which contain
+            the requested frames and their referenced objects and contexts
+        """
+        result: Dict[str, Dict] = {key: {} for key in INDEXED_SECTIONS}
+        for frame in frames:
+            frame_key = self._frame_key(frame)
+            frame_data = self.get_frame(frame_key)
+            result["frames"][frame_key] = frame_data
+            for root_key in ("objects", "contexts"):
+                spans = self.index[root_key]
+                for uuid in frame_data.get(root_key) or {}:
+                    if uuid not in result[root_key] and uuid in spans:
+                        result[root_key][uuid] = self._decode(spans[uuid])
+        return result
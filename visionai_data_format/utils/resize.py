@@ -1,10 +1,17 @@
 import argparse
-import copy
 import json
 import logging
 import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
 
 import cv2
+import numpy as np
+from PIL import Image
+
+from visionai_data_format.utils.common import ANNOT_PATH, VISIONAI_JSON
+from visionai_data_format.utils.instrumentation import incr, phase
+from visionai_data_format.utils.validator import copy_sensor_file, load_json
 
 logger = logging.getLogger(__name__)
 
@@ -18,74 +25,715 @@ def resize_bbox(annotation, ratio_w, ratio_h):
     annotation["bbox"] = [new_x, new_y, new_w, new_h]
 
 
-def append_ann_json(ori_json, new_json, new_size):
-    w, h = new_size
-    images = ori_json["images"].copy()
+RESIZE_MODES = ("stretch", "letterbox", "shorter_side")
+# gray padding of letterbox images
+LETTERBOX_PAD_VALUE = 114
+# (scale_x, scale_y, offset_x, offset_y) of annotations without image
+_IDENTITY_AFFINE = (1.0, 1.0, 0, 0)
+
+
+class ResizeTransform(NamedTuple):
+    """Affine transform of an image resize, `x * scale_x + offset_x`
+    (same for y), images are resized to `resized_width` x `resized_height`
+    then padded to `width` x `height`"""
+
+    scale_x: float
+    scale_y: float
+    offset_x: int
+    offset_y: int
+    resized_width: int
+    resized_height: int
+    width: int
+    height: int
+
+    @property
+    def padded(self) -> bool:
+        return (self.resized_width, self.resized_height) != (self.width, self.height)
+
+    def apply_points(self, points: np.ndarray) -> np.ndarray:
+        """transform an array of flat [x0, y0, x1, y1, ...] coordinates"""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return (
+            points * (self.scale_x, self.scale_y) + (self.offset_x, self.offset_y)
+        ).ravel()
+
+    def apply_bboxes(self, bboxes: np.ndarray) -> np.ndarray:
+        """transform (n, 4) bboxes, [x, y, w, h] with a top-left or center point"""
+        bboxes = np.asarray(bboxes, dtype=np.float64).reshape(-1, 4)
+        scale = (self.scale_x, self.scale_y, self.scale_x, self.scale_y)
+        offset = (self.offset_x, self.offset_y, 0, 0)
+        return bboxes * scale + offset
+
+
+def compute_resize_transform(
+    width: int, height: int, new_size: Tuple[int, int], mode: str = "stretch"
+) -> ResizeTransform:
+    """Compute the transform resizing a `width` x `height` image
+
+    Parameters
+    ----------
+    width : int
+        image width
+    height : int
+        image height
+    new_size : Tuple[int, int]
+        (width, height) of resized images
+    mode : str, optional
+        "stretch" resizes to `new_size`, "letterbox" keeps the aspect ratio
+        to fit in `new_size` and pads the image to `new_size`, "shorter_side"
+        keeps the aspect ratio with the shorter side resized to `min(new_size)`,
+        by default "stretch"
+
+    Returns
+    -------
+    ResizeTransform
+        transform of images and their annotations
+    """
+    new_w, new_h = new_size
+    if mode == "stretch":
+        return ResizeTransform(
+            new_w / width, new_h / height, 0, 0, new_w, new_h, new_w, new_h
+        )
+    if mode == "letterbox":
+        scale = min(new_w / width, new_h / height)
+        resized_w = max(1, round(width * scale))
+        resized_h = max(1, round(height * scale))
+        return ResizeTransform(
+            resized_w / width,
+            resized_h / height,
+            (new_w - resized_w) // 2,
+            (new_h - resized_h) // 2,
+            resized_w,
+            resized_h,
+            new_w,
+            new_h,
+        )
+    if mode == "shorter_side":
+        scale = min(new_size) / min(width, height)
+        resized_w = max(1, round(width * scale))
+        resized_h = max(1, round(height * scale))
+        return ResizeTransform(
+            resized_w / width,
+            resized_h / height,
+            0,
+            0,
+            resized_w,
+            resized_h,
+            resized_w,
+            resized_h,
+        )
+    raise ValueError(f"Unknown resize mode {mode}, expected one of {RESIZE_MODES}")
+
+
+def build_image_size_index(images: List[Dict]) -> Dict[Any, Tuple[int, int]]:
+    """map each COCO image id to its (width, height)"""
+    return {img["id"]: (img["width"], img["height"]) for img in images}
+
+
+def build_image_transform_index(
+    images: List[Dict], new_size: Tuple[int, int], mode: str = "stretch"
+) -> Dict[Any, ResizeTransform]:
+    """map each COCO image id to its `ResizeTransform`"""
+    return {
+        image_id: compute_resize_transform(width, height, new_size, mode)
+        for image_id, (width, height) in build_image_size_index(images).items()
+    }
+
+
+def _transform_flat_coordinates(
+    coordinates: List[List[float]],
+    transforms: np.ndarray,
+    decimals: Optional[int] = 1,
+) -> List[List[float]]:
+    """transform lists of flat [x0, y0, x1, y1, ...] coordinates at once,
+    `transforms` holds the (scale_x, scale_y, offset_x, offset_y) of each list"""
+    lengths = np.fromiter((len(c) for c in coordinates), dtype=np.int64)
+    if not lengths.sum():
+        return [list(c) for c in coordinates]
+    points = np.fromiter(
+        (v for c in coordinates for v in c), dtype=np.float64, count=lengths.sum()
+    ).reshape(-1, 2)
+    point_transforms = np.repeat(transforms, lengths // 2, axis=0)
+    points = points * point_transforms[:, :2] + point_transforms[:, 2:]
+    if decimals is not None:
+        points = np.round(points, decimals)
+    bounds = np.cumsum(lengths)[:-1].tolist()
+    return [chunk.tolist() for chunk in np.split(points.ravel(), bounds)]
+
+
+def transform_annotations(
+    annotations: List[Dict], image_transforms: Dict[Any, ResizeTransform]
+) -> None:
+    """transform the geometry of COCO annotations to their resized images, in place
+
+    Bboxes, polygon segmentations, areas and keypoints of all annotations
+    are transformed with numpy at once.
+
+    Parameters
+    ----------
+    annotations : List[Dict]
+        COCO annotations
+    image_transforms : Dict[Any, ResizeTransform]
+        transform of each image id, see `build_image_transform_index`
+    """
+    if not annotations:
+        return
+    with phase("transform_annotations", items=len(annotations)):
+        transforms = []
+        n_missing = 0
+        for annotation in annotations:
+            transform = image_transforms.get(annotation["image_id"])
+            if transform is None:
+                # keep the geometry of annotations without image
+                n_missing += 1
+            transforms.append(transform)
+        if n_missing:
+            logger.warning(
+                f"[transform_annotations] {n_missing} annotations without image are not transformed"
+            )
+        affine = np.asarray(
+            [
+                transform[:4] if transform else _IDENTITY_AFFINE
+                for transform in transforms
+            ],
+            dtype=np.float64,
+        )
+        scales = np.tile(affine[:, :2], 2)
+        offsets = np.concatenate([affine[:, 2:], np.zeros_like(affine[:, 2:])], axis=1)
+
+        bboxes = np.asarray(
+            [annotation["bbox"] for annotation in annotations], dtype=np.float64
+        ).reshape(-1, 4)
+        new_bboxes = np.round(bboxes * scales + offsets, 1).tolist()
+        for annotation, bbox, transform in zip(annotations, new_bboxes, transforms):
+            annotation["bbox"] = bbox
+            if transform:
+                annotation["width"] = transform.width
+                annotation["height"] = transform.height
+            annotation["iscrowd"] = 0
+
+        area_idx = [idx for idx, ann in enumerate(annotations) if "area" in ann]
+        if area_idx:
+            areas = np.asarray(
+                [annotations[idx]["area"] for idx in area_idx], dtype=np.float64
+            )
+            areas *= affine[area_idx, 0] * affine[area_idx, 1]
+            for idx, area in zip(area_idx, np.round(areas, 2).tolist()):
+                annotations[idx]["area"] = area
+
+        # polygon segmentations, RLE segmentations are kept as is
+        polygon_owners = []
+        polygons = []
+        for idx, annotation in enumerate(annotations):
+            segmentation = annotation.get("segmentation")
+            if isinstance(segmentation, list):
+                polygon_owners.extend([idx] * len(segmentation))
+                polygons.extend(segmentation)
+        if polygons:
+            new_polygons = _transform_flat_coordinates(polygons, affine[polygon_owners])
+            for idx in set(polygon_owners):
+                annotations[idx]["segmentation"] = []
+            for idx, polygon in zip(polygon_owners, new_polygons):
+                annotations[idx]["segmentation"].append(polygon)
+
+        # keypoints are [x, y, visibility] triplets, unlabeled ones stay at 0
+        keypoint_idx = [
+            idx for idx, ann in enumerate(annotations) if ann.get("keypoints")
+        ]
+        for idx in keypoint_idx:
+            keypoints = np.asarray(
+                annotations[idx]["keypoints"], dtype=np.float64
+            ).reshape(-1, 3)
+            labeled = keypoints[:, 2] > 0
+            keypoints[labeled, :2] = np.round(
+                keypoints[labeled, :2] * affine[idx, :2] + affine[idx, 2:], 1
+            )
+            annotations[idx]["keypoints"] = [
+                int(v) if pos % 3 == 2 else v
+                for pos, v in enumerate(keypoints.ravel().tolist())
+            ]
+    incr("annotations", len(annotations))
+
+
+# VisionAI object data shapes in image coordinates
+VISIONAI_2D_SHAPES = ("bbox", "poly2d", "point2d")
+
+
+def transform_frame_geometry(
+    frame: Dict, stream_transforms: Dict[str, ResizeTransform]
+) -> int:
+    """transform the bbox, poly2d and point2d values of a VisionAI frame, in place
 
-    for annotation in new_json["annotations"]:
-        annotation["width"] = w
-        annotation["height"] = h
+    Elements of all objects are transformed with numpy at once, with the
+    transform of their stream, elements of other streams are kept as is.
 
-        ratio_w = w
-        ratio_h = h
-        find = False
+    Parameters
+    ----------
+    frame : Dict
+        VisionAI frame data
+    stream_transforms : Dict[str, ResizeTransform]
+        transform of each resized camera stream
 
-        for img in images:
-            for k, v in img.items():
-                if k == "id" and v == annotation["image_id"]:
-                    # Calculate the scaling ratio of each image to calculate the correct position of each bbox
-                    ratio_w = w / img["width"]
-                    ratio_h = h / img["height"]
-                    find = True
-                    break
-            if find is True:
-                break
+    Returns
+    -------
+    int
+        number of transformed elements
+    """
+    bboxes: List[Dict] = []
+    bbox_affine: List[Tuple] = []
+    points: List[Dict] = []
+    point_affine: List[Tuple] = []
+    for obj in (frame.get("objects") or {}).values():
+        for shape, elements in (obj.get("object_data") or {}).items():
+            if shape not in VISIONAI_2D_SHAPES:
+                continue
+            for element in elements:
+                transform = stream_transforms.get(element.get("stream"))
+                if transform is None:
+                    continue
+                if shape == "bbox":
+                    bboxes.append(element)
+                    bbox_affine.append(transform[:4])
+                else:
+                    points.append(element)
+                    point_affine.append(transform[:4])
 
-        resize_bbox(annotation, ratio_w, ratio_h)
+    if bboxes:
+        affine = np.asarray(bbox_affine, dtype=np.float64)
+        offsets = np.concatenate([affine[:, 2:], np.zeros_like(affine[:, 2:])], axis=1)
+        values = np.asarray([element["val"] for element in bboxes], dtype=np.float64)
+        new_values = (values * np.tile(affine[:, :2], 2) + offsets).tolist()
+        for element, val in zip(bboxes, new_values):
+            element["val"] = val
+    if points:
+        new_values = _transform_flat_coordinates(
+            [element["val"] for element in points],
+            np.asarray(point_affine, dtype=np.float64),
+            decimals=None,
+        )
+        for element, val in zip(points, new_values):
+            element["val"] = val
+    return len(bboxes) + len(points)
 
-        annotation["iscrowd"] = 0
+
+def decode_rle_mask(rle: str, width: int, height: int) -> np.ndarray:
+    """decode a `#{count}V{class index}` RLE mask to a (height, width) array"""
+    runs = np.asarray(
+        rle.replace("V", " ").replace("#", " ").split(), dtype=np.int64
+    ).reshape(-1, 2)
+    if runs[:, 0].sum() != width * height:
+        raise ValueError(
+            f"RLE mask of {runs[:, 0].sum()} pixels doesn't cover a {width}x{height} image"
+        )
+    return np.repeat(runs[:, 1].astype(np.int32), runs[:, 0]).reshape(height, width)
+
+
+def encode_rle_mask(mask: np.ndarray) -> str:
+    """encode a mask array to a `#{count}V{class index}` RLE mask, row by row"""
+    flat = mask.ravel()
+    bounds = np.concatenate(([0], np.flatnonzero(np.diff(flat)) + 1, [flat.size]))
+    counts = np.diff(bounds).tolist()
+    values = flat[bounds[:-1]].tolist()
+    return "".join(f"#{count}V{value}" for count, value in zip(counts, values))
+
+
+def resample_rle_mask(rle: str, transform: ResizeTransform, pad_value: int = 0) -> str:
+    """resample a RLE mask with the transform of its image, the mask is resized
+    with nearest neighbor interpolation and padded with `pad_value`"""
+    width = round(transform.resized_width / transform.scale_x)
+    height = round(transform.resized_height / transform.scale_y)
+    mask = decode_rle_mask(rle, width, height)
+    return encode_rle_mask(
+        apply_resize_transform(mask, transform, pad_value, cv2.INTER_NEAREST)
+    )
+
+
+def transform_intrinsics(intrinsics: Dict, transform: ResizeTransform) -> None:
+    """update `intrinsics_pinhole` of a camera stream to its resized images, in place"""
+    affine = np.array(
+        [
+            [transform.scale_x, 0.0, transform.offset_x],
+            [0.0, transform.scale_y, transform.offset_y],
+            [0.0, 0.0, 1.0],
+        ]
+    )
+    matrix = np.asarray(intrinsics["camera_matrix_3x4"], dtype=np.float64)
+    intrinsics["camera_matrix_3x4"] = (affine @ matrix.reshape(3, 4)).ravel().tolist()
+    intrinsics["width_px"] = transform.width
+    intrinsics["height_px"] = transform.height
+
+
+def camera_stream_sizes(visionai: Dict) -> Dict[str, Tuple[int, int]]:
+    """(width, height) of the camera streams with `intrinsics_pinhole`"""
+    sizes = {}
+    for stream_name, stream in (visionai.get("streams") or {}).items():
+        intrinsics = (stream.get("stream_properties") or {}).get("intrinsics_pinhole")
+        if stream.get("type") == "camera" and intrinsics:
+            sizes[stream_name] = (intrinsics["width_px"], intrinsics["height_px"])
+    return sizes
+
+
+def transform_visionai_annotations(
+    visionai: Dict,
+    stream_transforms: Dict[str, ResizeTransform],
+    mask_pad_value: int = 0,
+) -> Dict[str, int]:
+    """transform the annotations of VisionAI data to its resized camera images, in place
+
+    Bbox, poly2d and point2d values and binary RLE masks of the resized streams
+    are transformed, as well as the intrinsics of these streams. 3D shapes
+    and elements of other streams are kept as is, so are the masks which don't
+    match the size of their stream.
+
+    Parameters
+    ----------
+    visionai : Dict
+        visionai data, without its `visionai` root key
+    stream_transforms : Dict[str, ResizeTransform]
+        transform of each resized camera stream
+    mask_pad_value : int, optional
+        class index of the padding of letterbox masks, by default 0
+
+    Returns
+    -------
+    Dict[str, int]
+        number of transformed "elements" and "masks", and of "failed_masks"
+    """
+    for stream_name, transform in stream_transforms.items():
+        stream = (visionai.get("streams") or {}).get(stream_name) or {}
+        intrinsics = (stream.get("stream_properties") or {}).get("intrinsics_pinhole")
+        if intrinsics:
+            transform_intrinsics(intrinsics, transform)
+
+    frames = visionai.get("frames") or {}
+    counts = {"elements": 0, "masks": 0, "failed_masks": 0}
+    with phase("transform_annotations", items=len(frames)):
+        for frame_key, frame in frames.items():
+            counts["elements"] += transform_frame_geometry(frame, stream_transforms)
+            for obj_id, obj in (frame.get("objects") or {}).items():
+                for element in (obj.get("object_data") or {}).get("binary", []):
+                    transform = stream_transforms.get(element.get("stream"))
+                    if transform is None:
+                        continue
+                    try:
+                        element["val"] = resample_rle_mask(
+                            element["val"], transform, mask_pad_value
+                        )
+                    except ValueError as e:
+                        logger.error(
+                            "[transform_visionai_annotations] Failed to resize mask"
+                            + f" {element.get('name')} of object {obj_id}"
+                            + f" in frame {frame_key}, it is kept as is: {e}"
+                        )
+                        counts["failed_masks"] += 1
+                        continue
+                    counts["masks"] += 1
+    incr("elements", counts["elements"] + counts["masks"])
+    return counts
+
+
+def scale_annotations(
+    annotations: List[Dict],
+    image_sizes: Dict[Any, Tuple[int, int]],
+    new_size: Tuple[int, int],
+) -> None:
+    """scale COCO annotations to images stretched to `new_size`, in place"""
+    transform_annotations(
+        annotations,
+        {
+            image_id: compute_resize_transform(width, height, new_size)
+            for image_id, (width, height) in image_sizes.items()
+        },
+    )
+
+
+def append_ann_json(ori_json, new_json, new_size):
+    scale_annotations(
+        new_json["annotations"],
+        build_image_size_index(ori_json["images"]),
+        new_size,
+    )
 
     logger.info("------ann json is done-----")
 
 
-def resize_json(src: str, dst: str, img_dst: str, new_size: tuple[int, int]):
-    ori_json = json.load(open(src))
+def resize_json(
+    src: str,
+    dst: str,
+    img_dst: str,
+    new_size: tuple[int, int],
+    image_format: Optional[str] = None,
+    mode: str = "stretch",
+):
+    # the loaded json is updated in place, only image transforms are kept aside
+    coco_json = load_json(src)
 
-    w, h = new_size
     new_img_base_dir = img_dst.split("/")[-2]
-    new_json = copy.deepcopy(ori_json)
+    image_transforms = build_image_transform_index(coco_json["images"], new_size, mode)
 
     # Annotation has five parts, and we only resize the three important parts
-    for img in new_json["images"]:
-        img["width"] = w
-        img["height"] = h
+    for img in coco_json["images"]:
+        transform = image_transforms[img["id"]]
+        img["width"] = transform.width
+        img["height"] = transform.height
         ori_filename = img["file_name"]
-        new_filename = os.path.join(new_img_base_dir, os.path.split(ori_filename)[-1])
+        new_filename = os.path.join(
+            new_img_base_dir,
+            _image_dst_name(os.path.split(ori_filename)[-1], image_format),
+        )
         img["file_name"] = new_filename
 
     logger.info("------image json is done-----")
 
-    append_ann_json(ori_json, new_json, new_size)
+    transform_annotations(coco_json["annotations"], image_transforms)
 
-    with open(dst, "w") as f:
-        json.dump(new_json, f, indent=4)
+    logger.info("------ann json is done-----")
+
+    # encoding the whole json at once is much faster than `json.dump` chunks
+    with phase("json_write"), open(dst, "w") as f:
+        f.write(json.dumps(coco_json))
 
     logger.info("------already wrote json-----")
 
 
-def resize_image(src: str, dst: str, new_size: tuple[int, int]):
+# reduced JPEG decoding flags of OpenCV, by scale denominator
+REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
+JPEG_EXTENSIONS = frozenset((".jpg", ".jpeg"))
+# EXIF orientation tag, values 5 to 8 rotate the image by 90 or 270 degrees
+EXIF_ORIENTATION_TAG = 0x0112
+TRANSPOSED_ORIENTATIONS = frozenset((5, 6, 7, 8))
+
+
+def _oriented_image_size(pil_img: Image.Image) -> Tuple[int, int]:
+    """(width, height) of an image with its EXIF orientation applied,
+    as decoded by `cv2.imread`"""
+    width, height = pil_img.size
+    if pil_img.getexif().get(EXIF_ORIENTATION_TAG) in TRANSPOSED_ORIENTATIONS:
+        return height, width
+    return width, height
+
+
+def _image_write_params(ext: str, quality: Optional[int]) -> List[int]:
+    if quality is None:
+        return []
+    if ext in JPEG_EXTENSIONS:
+        return [cv2.IMWRITE_JPEG_QUALITY, quality]
+    if ext == ".webp":
+        return [cv2.IMWRITE_WEBP_QUALITY, quality]
+    return []
+
+
+def _read_image(
+    src_file: str, new_size: Tuple[int, int], mode: str, reduced_decode: bool
+) -> Tuple[Optional[np.ndarray], Optional[ResizeTransform]]:
+    """read an image and compute its transform, JPEG files are decoded at
+    1/2, 1/4 or 1/8 scale if the image is still larger than its resized size"""
+    ext = os.path.splitext(src_file)[1].lower()
+    if not reduced_decode or ext not in JPEG_EXTENSIONS:
+        img = cv2.imread(src_file)
+        if img is None:
+            return None, None
+        height, width = img.shape[:2]
+        return img, compute_resize_transform(width, height, new_size, mode)
+    # the header is enough to get the image size
+    with Image.open(src_file) as pil_img:
+        width, height = _oriented_image_size(pil_img)
+    transform = compute_resize_transform(width, height, new_size, mode)
+    scale = min(width / transform.resized_width, height / transform.resized_height)
+    for factor, flag in REDUCED_DECODE_FLAGS:
+        if scale >= factor:
+            return cv2.imread(src_file, flag), transform
+    return cv2.imread(src_file), transform
+
+
+def apply_resize_transform(
+    img: np.ndarray,
+    transform: ResizeTransform,
+    pad_value: int = LETTERBOX_PAD_VALUE,
+    interpolation: int = cv2.INTER_LINEAR,
+) -> np.ndarray:
+    """resize `img` with `transform`, and pad it for letterbox transforms"""
+    new_img = cv2.resize(
+        img,
+        (transform.resized_width, transform.resized_height),
+        interpolation=interpolation,
+    )
+    if not transform.padded:
+        return new_img
+    return cv2.copyMakeBorder(
+        new_img,
+        transform.offset_y,
+        transform.height - transform.resized_height - transform.offset_y,
+        transform.offset_x,
+        transform.width - transform.resized_width - transform.offset_x,
+        cv2.BORDER_CONSTANT,
+        value=(pad_value, pad_value, pad_value),
+    )
+
+
+def resize_image_file(
+    src_file: str,
+    dst_file: str,
+    new_size: Tuple[int, int],
+    quality: Optional[int] = None,
+    reduced_decode: bool = True,
+    resume: bool = False,
+    mode: str = "stretch",
+    pad_value: int = LETTERBOX_PAD_VALUE,
+) -> str:
+    """Resize an image file
+
+    Parameters
+    ----------
+    src_file : str
+        source image path
+    dst_file : str
+        resized image path, its extension sets the image format
+    new_size : Tuple[int, int]
+        (width, height) of the resized image
+    quality : Optional[int], optional
+        JPEG/WebP quality from 0 to 100, by default None (OpenCV default)
+    reduced_decode : bool, optional
+        decode JPEG images at a reduced scale when shrinking by 2 or more,
+        by default True
+    resume : bool, optional
+        skip the image if `dst_file` already exists, by default False
+    mode : str, optional
+        resize mode, see `compute_resize_transform`, by default "stretch"
+    pad_value : int, optional
+        gray level of letterbox padding, by default 114
+
+    Returns
+    -------
+    str
+        "resized", "skipped" or "failed"
+    """
+    if resume and os.path.isfile(dst_file) and os.path.getsize(dst_file):
+        return "skipped"
+    try:
+        img, transform = _read_image(src_file, new_size, mode, reduced_decode)
+    except Exception:
+        img = None
+    if img is None:
+        logger.error(f"[resize_image_file] Failed to read image {src_file}")
+        return "failed"
+    new_img = apply_resize_transform(img, transform, pad_value)
+    # write to a temporary file first, so interrupted jobs never leave
+    # a partial image that `resume` would skip
+    dst_dir, dst_name = os.path.split(dst_file)
+    stem, ext = os.path.splitext(dst_name)
+    tmp_file = os.path.join(dst_dir, f".{stem}.partial{ext}")
+    if not cv2.imwrite(tmp_file, new_img, _image_write_params(ext.lower(), quality)):
+        logger.error(f"[resize_image_file] Failed to write image {dst_file}")
+        return "failed"
+    os.replace(tmp_file, dst_file)
+    return "resized"
+
+
+def _resize_image_task(task: Tuple) -> str:
+    return resize_image_file(*task)
+
+
+def _init_resize_worker() -> None:
+    # images are resized in parallel by processes, not by OpenCV threads
+    cv2.setNumThreads(1)
+
+
+def _run_resize_tasks(tasks: List[Tuple], workers: int) -> Dict[str, int]:
+    """run `resize_image_file` tasks, in a process pool if `workers` > 1"""
+    counts = {"resized": 0, "skipped": 0, "failed": 0}
+    with phase("image_resize", items=len(tasks)):
+        if workers <= 1 or len(tasks) <= 1:
+            for task in tasks:
+                counts[_resize_image_task(task)] += 1
+        else:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_resize_worker
+            ) as executor:
+                chunksize = max(1, min(64, len(tasks) // (workers * 8)))
+                for result in executor.map(
+                    _resize_image_task, tasks, chunksize=chunksize
+                ):
+                    counts[result] += 1
+    incr("files_resized", counts["resized"])
+    return counts
+
+
+def _image_dst_name(img_name: str, image_format: Optional[str]) -> str:
+    if not image_format:
+        return img_name
+    return f"{os.path.splitext(img_name)[0]}.{image_format.lstrip('.')}"
+
+
+def resize_image(
+    src: str,
+    dst: str,
+    new_size: tuple[int, int],
+    workers: int = 1,
+    quality: Optional[int] = None,
+    image_format: Optional[str] = None,
+    reduced_decode: bool = True,
+    resume: bool = False,
+    mode: str = "stretch",
+    pad_value: int = LETTERBOX_PAD_VALUE,
+) -> Dict[str, int]:
+    """Resize every image of a folder
+
+    Parameters
+    ----------
+    src : str
+        source image folder
+    dst : str
+        resized image folder
+    new_size : tuple[int, int]
+        (width, height) of resized images
+    workers : int, optional
+        number of worker processes, by default 1
+    quality : Optional[int], optional
+        JPEG/WebP quality from 0 to 100, by default None (OpenCV default)
+    image_format : Optional[str], optional
+        extension of resized images, such as "jpg" or "png",
+        by default None (same as the source image)
+    reduced_decode : bool, optional
+        decode JPEG images at a reduced scale when shrinking by 2 or more,
+        by default True
+    resume : bool, optional
+        skip images which already exist in `dst`, by default False
+    mode : str, optional
+        resize mode, see `compute_resize_transform`, by default "stretch"
+    pad_value : int, optional
+        gray level of letterbox padding, by default 114
+
+    Returns
+    -------
+    Dict[str, int]
+        number of "resized", "skipped" and "failed" images
+    """
     logger.info("------start image augment-----")
 
-    imgs = os.listdir(src)
     os.makedirs(dst, exist_ok=True)
-    for img_name in imgs:
-        src_file = os.path.join(src, img_name)
-        dst_file = os.path.join(dst, img_name)
-        img = cv2.imread(src_file)
-        new_img = cv2.resize(img, new_size)
-        cv2.imwrite(dst_file, new_img)
+    tasks = [
+        (
+            entry.path,
+            os.path.join(dst, _image_dst_name(entry.name, image_format)),
+            new_size,
+            quality,
+            reduced_decode,
+            resume,
+            mode,
+            pad_value,
+        )
+        for entry in sorted(os.scandir(src), key=lambda entry: entry.name)
+        if entry.is_file()
+    ]
+    counts = _run_resize_tasks(tasks, workers)
 
-    logger.info("------image augmentation is done-----")
+    logger.info(f"------image augmentation is done----- {counts}")
+    return counts
 
 
 def resize_coco(
@@ -94,10 +742,208 @@ def resize_coco(
     img_src: str,
     img_dst: str,
     new_size: tuple[int, int],
-):
-    # TODO: Do acceleration in the future
-    resize_json(label_src, label_dst, img_dst, new_size)
-    resize_image(img_src, img_dst, new_size)
+    workers: int = 1,
+    quality: Optional[int] = None,
+    image_format: Optional[str] = None,
+    resume: bool = False,
+    mode: str = "stretch",
+    pad_value: int = LETTERBOX_PAD_VALUE,
+) -> Dict[str, int]:
+    """Resize a COCO dataset, its images and their annotations
+
+    Each image and its annotations are resized with the same `ResizeTransform`,
+    computed from the image size recorded in `label_src`
+    (see `compute_resize_transform` for the resize modes).
+    """
+    if mode not in RESIZE_MODES:
+        raise ValueError(f"Unknown resize mode {mode}, expected one of {RESIZE_MODES}")
+    resize_json(
+        label_src,
+        label_dst,
+        img_dst,
+        new_size,
+        image_format=image_format,
+        mode=mode,
+    )
+    return resize_image(
+        img_src,
+        img_dst,
+        new_size,
+        workers=workers,
+        quality=quality,
+        image_format=image_format,
+        resume=resume,
+        mode=mode,
+        pad_value=pad_value,
+    )
+
+
+def _probe_image_size(image_file: str) -> Optional[Tuple[int, int]]:
+    try:
+        with Image.open(image_file) as pil_img:
+            return _oriented_image_size(pil_img)
+    except Exception:
+        return None
+
+
+def resize_visionai(
+    source_data_root: str,
+    output_dest_folder: str,
+    new_size: Tuple[int, int],
+    annotation_name: str = "groundtruth",
+    workers: int = 1,
+    quality: Optional[int] = None,
+    image_format: Optional[str] = None,
+    resume: bool = False,
+    mode: str = "stretch",
+    pad_value: int = LETTERBOX_PAD_VALUE,
+    mask_pad_value: int = 0,
+    copy_sensor_data: bool = True,
+) -> Dict[str, int]:
+    """Resize a VisionAI dataset, its camera images and their annotations
+
+    The images of a camera stream share its size, taken from its
+    `intrinsics_pinhole` or from its first image, so each stream has one
+    `ResizeTransform` (see `compute_resize_transform` for the resize modes).
+    Images of all sequences are resized in a process pool, files of other
+    sensors are copied as is.
+
+    Parameters
+    ----------
+    source_data_root : str
+        dataset folder, with `{sequence}/annotations/{annotation_name}/visionai.json`
+        and `{sequence}/data/{sensor}/` sensor data
+    output_dest_folder : str
+        resized dataset folder, with the same layout
+    new_size : Tuple[int, int]
+        (width, height) of resized images
+    annotation_name : str, optional
+        annotation folder name, by default "groundtruth"
+    workers : int, optional
+        number of image resize processes, by default 1
+    quality : Optional[int], optional
+        JPEG/WebP quality from 0 to 100, by default None (OpenCV default)
+    image_format : Optional[str], optional
+        extension of resized images, such as "jpg" or "png",
+        by default None (same as the source image)
+    resume : bool, optional
+        skip images and sensor files which already exist in
+        `output_dest_folder`, by default False
+    mode : str, optional
+        resize mode, by default "stretch"
+    pad_value : int, optional
+        gray level of letterbox padding, by default 114
+    mask_pad_value : int, optional
+        class index of the padding of letterbox masks, by default 0
+    copy_sensor_data : bool, optional
+        copy the files of non camera streams, by default True
+
+    Returns
+    -------
+    Dict[str, int]
+        number of "sequences", of "resized", "skipped" and "failed" images,
+        and of "failed_masks" which are kept unresized
+    """
+    if mode not in RESIZE_MODES:
+        raise ValueError(f"Unknown resize mode {mode}, expected one of {RESIZE_MODES}")
+
+    tasks = []
+    n_sequences = 0
+    n_failed_masks = 0
+    for sequence in sorted(os.listdir(source_data_root)):
+        annotation_path = os.path.join(
+            source_data_root, sequence, ANNOT_PATH, annotation_name, VISIONAI_JSON
+        )
+        if not os.path.isfile(annotation_path):
+            logger.info(
+                f"[resize_visionai] {sequence} is ignored, no {annotation_path}"
+            )
+            continue
+        visionai_dict = load_json(annotation_path)
+        visionai = visionai_dict["visionai"]
+        cameras = {
+            stream_name
+            for stream_name, stream in (visionai.get("streams") or {}).items()
+            if stream.get("type") == "camera"
+        }
+        stream_sizes = camera_stream_sizes(visionai)
+        n_renamed = 0
+
+        for frame in (visionai.get("frames") or {}).values():
+            streams = (frame.get("frame_properties") or {}).get("streams") or {}
+            for stream_name, stream in streams.items():
+                uri = stream.get("uri")
+                if not uri:
+                    continue
+                # sensor files are under {sequence}/data/{sensor}/
+                uri_parts = uri.split("/")[-4:]
+                src_file = os.path.join(source_data_root, *uri_parts)
+                if stream_name not in cameras:
+                    dst_file = os.path.join(output_dest_folder, *uri_parts)
+                    if copy_sensor_data and not (resume and os.path.isfile(dst_file)):
+                        os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                        copy_sensor_file(src_file, dst_file)
+                    continue
+                if stream_name not in stream_sizes:
+                    size = _probe_image_size(src_file)
+                    if size is None:
+                        logger.error(
+                            f"[resize_visionai] Failed to read image {src_file},"
+                            + f" stream {stream_name} of {sequence} isn't resized"
+                        )
+                        cameras.discard(stream_name)
+                        continue
+                    stream_sizes[stream_name] = size
+                dst_name = _image_dst_name(uri_parts[-1], image_format)
+                dst_file = os.path.join(output_dest_folder, *uri_parts[:-1], dst_name)
+                os.makedirs(os.path.dirname(dst_file), exist_ok=True)
+                tasks.append(
+                    (
+                        src_file,
+                        dst_file,
+                        new_size,
+                        quality,
+                        True,
+                        resume,
+                        mode,
+                        pad_value,
+                    )
+                )
+                if dst_name != uri_parts[-1]:
+                    stream["uri"] = f"{uri.rsplit('/', 1)[0]}/{dst_name}"
+                    n_renamed += 1
+
+        stream_transforms = {
+            stream_name: compute_resize_transform(width, height, new_size, mode)
+            for stream_name, (width, height) in stream_sizes.items()
+            if stream_name in cameras
+        }
+        annotation_counts = transform_visionai_annotations(
+            visionai, stream_transforms, mask_pad_value
+        )
+        n_failed_masks += annotation_counts["failed_masks"]
+
+        dst_annotation_dir = os.path.join(
+            output_dest_folder, sequence, ANNOT_PATH, annotation_name
+        )
+        os.makedirs(dst_annotation_dir, exist_ok=True)
+        with phase("json_write"), open(
+            os.path.join(dst_annotation_dir, VISIONAI_JSON), "w"
+        ) as f:
+            f.write(json.dumps(visionai_dict))
+        n_sequences += 1
+        logger.info(
+            f"[resize_visionai] {sequence} annotations are resized,"
+            + f" {n_renamed} image uris are renamed"
+        )
+
+    counts = {
+        "sequences": n_sequences,
+        **_run_resize_tasks(tasks, workers),
+        "failed_masks": n_failed_masks,
+    }
+    logger.info(f"[resize_visionai] resize is done {counts}")
+    return counts
 
 
 def make_parser():
@@ -133,6 +979,47 @@ def make_parser():
     parser.add_argument(
         "-size", "--size", type=int, default=640, help="Size of resized image"
     )
+    parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of image resize processes",
+    )
+    parser.add_argument(
+        "-q",
+        "--quality",
+        type=int,
+        default=None,
+        help="JPEG/WebP quality of resized images, from 0 to 100",
+    )
+    parser.add_argument(
+        "-f",
+        "--format",
+        type=str,
+        default=None,
+        help="Extension of resized images, i.e : jpg, by default the source one",
+    )
+    parser.add_argument(
+        "-m",
+        "--mode",
+        type=str,
+        default="stretch",
+        choices=RESIZE_MODES,
+        help="stretch to size x size, letterbox with padding to size x size,"
+        + " or resize the shorter side to size keeping the aspect ratio",
+    )
+    parser.add_argument(
+        "--pad-value",
+        type=int,
+        default=LETTERBOX_PAD_VALUE,
+        help="Gray level of letterbox padding",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Skip images which already exist in the resized images folder",
+    )
 
     return parser.parse_args()
 
@@ -148,4 +1035,16 @@ if __name__ == "__main__":
     new_h = int(args.size)
     new_size = (new_w, new_h)
 
-    resize_coco(label_src, label_dst, img_src, img_dst, new_size)
+    resize_coco(
+        label_src,
+        label_dst,
+        img_src,
+        img_dst,
+        new_size,
+        workers=args.workers,
+        quality=args.quality,
+        image_format=args.format,
+        resume=args.resume,
+        mode=args.mode,
+        pad_value=args.pad_value,
+    )
@@ -1,20 +1,26 @@
 import json
 import logging
 import os
-from typing import Dict, Union
+import shutil
+from typing import Any, Callable, Dict, List, Tuple, Type, Union
 
 import numpy as np
+from pydantic import ValidationError
 
+from visionai_data_format.exceptions import VisionAIException
+from visionai_data_format.schemas.adapters import validate_json, validate_python
 from visionai_data_format.schemas.bdd_schema import BDDSchema
 from visionai_data_format.schemas.coco_schema import COCO
 from visionai_data_format.schemas.visionai_schema import VisionAIModel
+from visionai_data_format.utils.instrumentation import get_recorder, incr, phase
 
 logger = logging.getLogger(__name__)
 
 
 def validate_vai(data: Dict) -> Union[VisionAIModel, None]:
     try:
-        vai = VisionAIModel(**data)
+        with phase("validation"):
+            vai = validate_python(VisionAIModel, data)
         logger.info("[validated_vai] Validate success")
         return vai
     except Exception as e:
@@ -24,7 +30,8 @@ def validate_vai(data: Dict) -> Union[VisionAIModel, None]:
 
 def validate_bdd(data: Dict) -> Union[BDDSchema, None]:
     try:
-        bdd = BDDSchema(**data)
+        with phase("validation"):
+            bdd = validate_python(BDDSchema, data)
         logger.info("[validate_bdd] Validation success")
         return bdd
     except Exception as e:
@@ -34,7 +41,8 @@ def validate_bdd(data: Dict) -> Union[BDDSchema, None]:
 
 def validate_coco(data: Dict) -> Union[COCO, None]:
     try:
-        bdd = COCO(**data)
+        with phase("validation"):
+            bdd = validate_python(COCO, data)
         logger.info("[validate_coco] Validation success")
         return bdd
     except Exception as e:
@@ -42,6 +50,90 @@ def validate_coco(data: Dict) -> Union[COCO, None]:
         return None
 
 
+JSONInput = Union[bytes, bytearray, memoryview, str, os.PathLike]
+
+
+def _read_json_input(data: JSONInput) -> Union[bytes, bytearray]:
+    if isinstance(data, (bytes, bytearray)):
+        return data
+    if isinstance(data, memoryview):
+        return data.tobytes()
+    with phase("json_read"), open(data, "rb") as f:
+        content = f.read()
+    incr("bytes_read", len(content))
+    return content
+
+
+def get_validation_errors(exc: Exception) -> List[Dict[str, Any]]:
+    """Convert the exception raised by a validation to list of errors
+
+    Each error is a dictionary with `type`, `loc` and `msg` keys as pydantic
+    validation errors, `type` is the error code for VisionAIException.
+    """
+    if isinstance(exc, ValidationError):
+        return exc.errors(include_url=False, include_input=False)
+    if isinstance(exc, VisionAIException):
+        return [{"type": exc.error_code, "loc": (), "msg": exc.error_message}]
+    return [{"type": type(exc).__name__, "loc": (), "msg": str(exc)}]
+
+
+def _validate_json(
+    model: Type, data: JSONInput, log_name: str, return_errors: bool
+) -> Union[Any, Tuple[Any, List[Dict[str, Any]]]]:
+    errors = []
+    try:
+        content = _read_json_input(data)
+        with phase("validation"):
+            result = validate_json(model, content)
+        logger.info(f"[{log_name}] Validation success")
+    except Exception as e:
+        logger.error(f"[{log_name}] Validation failed : " + str(e))
+        result = None
+        errors = get_validation_errors(e)
+    return (result, errors) if return_errors else result
+
+
+def validate_vai_json(
+    data: JSONInput, return_errors: bool = False
+) -> Union[
+    Union[VisionAIModel, None],
+    Tuple[Union[VisionAIModel, None], List[Dict[str, Any]]],
+]:
+    """Validate VisionAI from JSON bytes or file path in a single pass
+
+    The JSON is parsed by pydantic-core while validating, without building
+    the intermediate dictionary of `json.load`.
+
+    Parameters
+    ----------
+    data : Union[bytes, bytearray, memoryview, str, os.PathLike]
+        JSON content as bytes, or path of the JSON file
+    return_errors : bool, optional
+        return a tuple of the model and the list of errors, by default False
+
+    Returns
+    -------
+    Union[VisionAIModel, None] or Tuple[Union[VisionAIModel, None], List[Dict]]
+        the validated model or None if validation failed, along with the list
+        of errors (see `get_validation_errors`) when `return_errors` is True
+    """
+    return _validate_json(VisionAIModel, data, "validate_vai_json", return_errors)
+
+
+def validate_bdd_json(
+    data: JSONInput, return_errors: bool = False
+) -> Union[Union[BDDSchema, None], Tuple[Union[BDDSchema, None], List[Dict[str, Any]]]]:
+    """Validate BDD+ from JSON bytes or file path, see `validate_vai_json`"""
+    return _validate_json(BDDSchema, data, "validate_bdd_json", return_errors)
+
+
+def validate_coco_json(
+    data: JSONInput, return_errors: bool = False
+) -> Union[Union[COCO, None], Tuple[Union[COCO, None], List[Dict[str, Any]]]]:
+    """Validate COCO from JSON bytes or file path, see `validate_vai_json`"""
+    return _validate_json(COCO, data, "validate_coco_json", return_errors)
+
+
 def attribute_generator(
     category: str, attribute: Dict, ontology_class_attrs: Dict
 ) -> Dict:
@@ -64,19 +156,39 @@ def save_as_json(data: Dict, file_name: str, folder_name: str = "") -> None:
     try:
         if folder_name:
             os.makedirs(folder_name, exist_ok=True)
-        file = open(os.path.join(folder_name, file_name), "w")
-        logger.info(
-            f"[save_as_json] Save file to {os.path.join(folder_name,file_name)} started "
-        )
-        json.dump(data, file)
-        logger.info(
-            f"[save_as_json] Save file to {os.path.join(folder_name,file_name)} success"
-        )
+        file_path = os.path.join(folder_name, file_name)
+        logger.info(f"[save_as_json] Save file to {file_path} started ")
+        with phase("json_write"), open(file_path, "w") as file:
+            json.dump(data, file)
+        if get_recorder() is not None:
+            incr("bytes_written", os.path.getsize(file_path))
+        logger.info(f"[save_as_json] Save file to {file_path} success")
 
     except Exception as e:
         logger.error("[save_as_json] Save file failed : " + str(e))
 
 
+def load_json(file_path: str) -> Any:
+    """load json file, the read time and size are recorded by the active
+    metrics recorder (see `visionai_data_format.utils.instrumentation`)"""
+    with phase("json_read"), open(file_path, "rb") as f:
+        content = f.read()
+    incr("bytes_read", len(content))
+    with phase("json_parse"):
+        return json.loads(content)
+
+
+def copy_sensor_file(
+    source_path: str, dest_path: str, copy_function: Callable = shutil.copy2
+) -> None:
+    """copy sensor data file, the copy is recorded by the active metrics recorder"""
+    with phase("sensor_copy"):
+        copy_function(source_path, dest_path)
+    if get_recorder() is not None:
+        incr("files_copied")
+        incr("bytes_copied", os.path.getsize(dest_path))
+
+
 def read_calib_data(calib_path: str) -> dict[str, np.array]:
     data = {}
     with open(calib_path, encoding="utf8") as f:
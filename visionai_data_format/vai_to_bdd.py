@@ -1,8 +1,10 @@
 import argparse
 import logging
 
-from visionai_data_format.utils.converter import convert_vai_to_bdd
-from visionai_data_format.utils.validator import save_as_json, validate_bdd
+from visionai_data_format.utils.converter import (
+    BDDStreamWriter,
+    iter_vai_to_bdd_frames,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -14,17 +16,30 @@ def vai_to_bdd(
     storage_name: str,
     container_name: str,
     annotation_name: str,
+    validate: bool = True,
+    workers: int = 1,
 ) -> None:
+    """Convert VisionAI sequences to a BDD+ json file
+
+    Frames are written as each sequence is converted, and validated
+    sequence by sequence if `validate` is set, so the memory use
+    doesn't grow with the number of sequences. Sequences are converted
+    by `workers` processes.
+    """
     try:
-        bdd_data = convert_vai_to_bdd(
-            folder_name=vai_src_folder,
-            company_code=company_code,
-            storage_name=storage_name,
-            container_name=container_name,
-            annotation_name=annotation_name,
-        )
-        bdd = validate_bdd(data=bdd_data)
-        save_as_json(bdd.model_dump(), file_name=bdd_dest_file)
+        with BDDStreamWriter(bdd_dest_file, company_code=company_code) as writer:
+            writer.write_frames(
+                iter_vai_to_bdd_frames(
+                    folder_name=vai_src_folder,
+                    storage_name=storage_name,
+                    container_name=container_name,
+                    annotation_name=annotation_name,
+                    validate=validate,
+                    validate_visionai=validate,
+                    workers=workers,
+                )
+            )
+        logger.info(f"[vai_to_bdd] {writer.n_frames} frames saved to {bdd_dest_file}")
     except Exception as e:
         logger.error("Convert vai to bdd format failed : " + str(e))
 
@@ -68,6 +83,17 @@ if __name__ == "__main__":
         default="groundtruth",
         help="annotation folder name in VAI",
     )
+    parser.add_argument(
+        "-skip_validation",
+        action="store_true",
+        help="Skip the validation of VisionAI sequences and BDD+ frames",
+    )
+    parser.add_argument(
+        "-workers",
+        type=int,
+        default=1,
+        help="Number of processes converting sequences",
+    )
 
     FORMAT = "%(asctime)s[%(process)d][%(levelname)s] %(name)-16s : %(message)s"
     DATEFMT = "[%d-%m-%Y %H:%M:%S]"
@@ -87,4 +113,6 @@ if __name__ == "__main__":
         args.storage_name,
         args.container_name,
         args.annotation_name,
+        validate=not args.skip_validation,
+        workers=args.workers,
     )
@@ -0,0 +1,321 @@
+import argparse
+import json
+import logging
+import os
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from visionai_data_format.exceptions import VisionAIErrorCode
+from visionai_data_format.schemas.ontology import Ontology
+from visionai_data_format.schemas.utils.compiled_ontology import (
+    CompiledOntology,
+    compile_ontology,
+)
+from visionai_data_format.utils.common import VISIONAI_JSON
+from visionai_data_format.utils.validator import validate_vai_json
+
+__all__ = [
+    "discover_sequences",
+    "validate_sequence",
+    "iter_validate_dataset",
+    "validate_dataset",
+]
+
+logger = logging.getLogger(__name__)
+
+# ontology of the worker processes, compiled once by `_init_worker`
+_WORKER_ONTOLOGY: Optional[CompiledOntology] = None
+
+
+def discover_sequences(
+    root: str, annotation_name: str = "groundtruth"
+) -> List[Tuple[str, str]]:
+    """Find the sequences of a VisionAI dataset folder
+
+    Parameters
+    ----------
+    root : str
+        dataset root folder, containing a folder per sequence
+    annotation_name : str, optional
+        annotation folder name, by default "groundtruth"
+
+    Returns
+    -------
+    List[Tuple[str, str]]
+        sorted list of (sequence name, annotation path), sequence folders without
+        annotation file are skipped
+    """
+    sequences = []
+    for sequence_name in sorted(os.listdir(root)):
+        annotation_path = os.path.join(
+            root, sequence_name, "annotations", annotation_name, VISIONAI_JSON
+        )
+        if os.path.isfile(annotation_path):
+            sequences.append((sequence_name, annotation_path))
+        elif os.path.isdir(os.path.join(root, sequence_name)):
+            logger.info(
+                f"[discover_sequences] skip {sequence_name}, {annotation_path} not found"
+            )
+    return sequences
+
+
+def _error_code_key(error_code: Union[VisionAIErrorCode, str]) -> str:
+    return error_code.value if isinstance(error_code, VisionAIErrorCode) else error_code
+
+
+def validate_sequence(
+    sequence_name: str,
+    annotation_path: str,
+    ontology: Union[Dict, CompiledOntology],
+    max_errors: Optional[int] = None,
+) -> Dict:
+    """Validate a sequence with the VisionAI schema and the given ontology
+
+    `max_errors` stops the ontology validation of the sequence once reached,
+    see `VisionAIModel.validate_with_ontology`
+
+    Returns
+    -------
+    Dict
+        result with `sequence`, `annotation_path`, `valid`, `seconds` and `errors`,
+        a mapping of error code (or pydantic error type) to error messages
+    """
+    start = time.perf_counter()
+    errors: Dict[str, List[str]] = defaultdict(list)
+    model, schema_errors = validate_vai_json(annotation_path, return_errors=True)
+    for error in schema_errors:
+        location = ".".join(str(loc) for loc in error["loc"])
+        message = f"{location}: {error['msg']}" if location else error["msg"]
+        errors[_error_code_key(error["type"])].append(message)
+    if model is not None:
+        for exc in model.validate_with_ontology(
+            ontology=ontology, max_errors=max_errors
+        ):
+            errors[_error_code_key(exc.error_code)].append(exc.error_message)
+    return {
+        "sequence": sequence_name,
+        "annotation_path": annotation_path,
+        "valid": not errors,
+        "errors": dict(errors),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def _init_worker(ontology: CompiledOntology) -> None:
+    global _WORKER_ONTOLOGY
+    _WORKER_ONTOLOGY = ontology
+
+
+def _validate_sequence_in_worker(
+    sequence_name: str, annotation_path: str, max_errors: Optional[int]
+) -> Dict:
+    return validate_sequence(
+        sequence_name, annotation_path, _WORKER_ONTOLOGY, max_errors=max_errors
+    )
+
+
+def iter_validate_dataset(
+    root: str,
+    ontology: Union[Dict, Ontology, CompiledOntology],
+    annotation_name: str = "groundtruth",
+    workers: int = 1,
+    max_errors: Optional[int] = None,
+) -> Iterator[Dict]:
+    """Validate every sequence of a dataset, yield results as they finish
+
+    Parameters
+    ----------
+    root : str
+        dataset root folder, containing a folder per sequence
+    ontology : Union[Dict, Ontology, CompiledOntology]
+        project ontology
+    annotation_name : str, optional
+        annotation folder name, by default "groundtruth"
+    workers : int, optional
+        number of worker processes, validate in the current process if 1,
+        by default 1
+    max_errors : Optional[int], optional
+        maximum number of ontology errors per sequence, by default None (all)
+
+    Yields
+    ------
+    Iterator[Dict]
+        result of each sequence, see `validate_sequence`, in completion order
+    """
+    compiled_ontology = compile_ontology(ontology)
+    sequences = discover_sequences(root, annotation_name)
+    if workers <= 1 or len(sequences) <= 1:
+        for sequence_name, annotation_path in sequences:
+            yield validate_sequence(
+                sequence_name, annotation_path, compiled_ontology, max_errors
+            )
+        return
+
+    # limit submitted sequences, so huge datasets don't queue every task upfront
+    max_pending = workers * 4
+    sequence_iter = iter(sequences)
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(compiled_ontology,),
+    ) as executor:
+        pending = set()
+        while True:
+            for sequence_name, annotation_path in sequence_iter:
+                pending.add(
+                    executor.submit(
+                        _validate_sequence_in_worker,
+                        sequence_name,
+                        annotation_path,
+                        max_errors,
+                    )
+                )
+                if len(pending) >= max_pending:
+                    break
+            if not pending:
+                break
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield future.result()
+
+
+def validate_dataset(
+    root: str,
+    ontology: Union[Dict, Ontology, CompiledOntology],
+    annotation_name: str = "groundtruth",
+    workers: int = 1,
+    callback: Optional[Callable[[Dict], None]] = None,
+    max_errors: Optional[int] = None,
+) -> Dict:
+    """Validate every sequence of a dataset folder with the given ontology
+
+    Parameters
+    ----------
+    root : str
+        dataset root folder, containing a folder per sequence
+    ontology : Union[Dict, Ontology, CompiledOntology]
+        project ontology
+    annotation_name : str, optional
+        annotation folder name, by default "groundtruth"
+    workers : int, optional
+        number of worker processes, by default 1
+    callback : Optional[Callable[[Dict], None]], optional
+        called with the result of each sequence as soon as it is validated,
+        by default None
+    max_errors : Optional[int], optional
+        maximum number of ontology errors per sequence, by default None (all)
+
+    Returns
+    -------
+    Dict
+        summary with the number of `sequences`, `valid` and `invalid` sequences,
+        `error_counts` per error code, sorted `invalid_sequences` and `seconds`
+    """
+    start = time.perf_counter()
+    error_counts: Counter = Counter()
+    invalid_sequences = []
+    n_sequences = 0
+    for result in iter_validate_dataset(
+        root,
+        ontology,
+        annotation_name=annotation_name,
+        workers=workers,
+        max_errors=max_errors,
+    ):
+        n_sequences += 1
+        if not result["valid"]:
+            invalid_sequences.append(result["sequence"])
+        for error_code, messages in result["errors"].items():
+            error_counts[error_code] += len(messages)
+        if callback:
+            callback(result)
+    summary = {
+        "root": root,
+        "sequences": n_sequences,
+        "valid": n_sequences - len(invalid_sequences),
+        "invalid": len(invalid_sequences),
+        "error_counts": dict(error_counts),
+        "invalid_sequences": sorted(invalid_sequences),
+        "seconds": time.perf_counter() - start,
+    }
+    logger.info(
+        f"[validate_dataset] {summary['invalid']}/{n_sequences} sequences are invalid"
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "-root",
+        type=str,
+        required=True,
+        help="VisionAI dataset root folder, containing a folder per sequence",
+    )
+    parser.add_argument(
+        "-ontology",
+        type=str,
+        required=True,
+        help="ontology json file path",
+    )
+    parser.add_argument(
+        "-annotation_name",
+        type=str,
+        default="groundtruth",
+        help="annotation folder name",
+    )
+    parser.add_argument(
+        "-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes",
+    )
+    parser.add_argument(
+        "-max_errors",
+        type=int,
+        default=None,
+        help="stop validating a sequence after this number of errors",
+    )
+    parser.add_argument(
+        "-output",
+        type=str,
+        default="",
+        help="write the result of each sequence to this json lines file",
+    )
+    FORMAT = "%(asctime)s[%(process)d][%(levelname)s] %(name)-16s : %(message)s"
+    DATEFMT = "[%d-%m-%Y %H:%M:%S]"
+
+    logging.basicConfig(
+        format=FORMAT,
+        level=logging.INFO,
+        datefmt=DATEFMT,
+    )
+
+    args = parser.parse_args()
+
+    with open(args.ontology) as f:
+        ontology = Ontology(**json.load(f)).model_dump(exclude_unset=True)
+
+    output_file = open(args.output, "w") if args.output else None
+
+    def write_result(result: Dict) -> None:
+        if not result["valid"]:
+            logger.info(f"{result['sequence']} : {sorted(result['errors'])}")
+        if output_file:
+            output_file.write(json.dumps(result) + "\n")
+
+    try:
+        summary = validate_dataset(
+            root=args.root,
+            ontology=ontology,
+            annotation_name=args.annotation_name,
+            workers=args.workers,
+            callback=write_result,
+            max_errors=args.max_errors,
+        )
+    finally:
+        if output_file:
+            output_file.close()
+    print(json.dumps(summary, indent=4))